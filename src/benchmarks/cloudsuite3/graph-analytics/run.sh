@@ -140,9 +140,15 @@ mkdir -p results
 
 run_setup
 
+# Record what the kernel promoted/demoted/migrated while the container runs
+python3 ../../../container-runtime/utils/cms_vmstat.py record results 5 &
+VMSTAT_PID=$!
+
 start_time=$(date +%s%N)
 docker run $PRIVILEGED $MAXMEM $MAXSWAP --ulimit nofile=90000:90000 $CPUSETS_CPU $CPUSETS_MEM --rm --volumes-from graph-data $CONTAINER $DMEM $EMEM > results/raw_results.txt
 end_time=$(date +%s%N)
+kill -TERM $VMSTAT_PID
+wait $VMSTAT_PID
 time_taken=$(echo "scale=9; ($end_time - $start_time)/1000000000" | bc)
 
 echo "graph-analytics,\"$NOTE\",$time_taken," `grep time results/raw_results.txt | sed 's/Running time = //'` >> $RESULTS
@@ -2,9 +2,30 @@
 
 import os
 import argparse
+import json
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
+from hdr_histogram import ALL_COMMANDS, LatencyHistogram, read_directory_histograms
+from memtier_timeline import read_dstat, read_directory_timelines, steady_state
+
+# Percentiles computed from the merged HDR histograms, 100 is the max
+HDR_PERCENTILES = [99.0, 99.9, 99.99, 100.0]
+
+# Seconds at the start of every run left out of its steady state
+WARMUP_SECONDS = 30
+
+# Sweep parameters that only change how hard memtier pushes, the throughput-latency
+# curve of a workload runs along them
+CONCURRENCY_PARAMETERS = ['pipeline', 'clients', 'threads']
+
 
 def dir_path(path: str) -> str:
     if os.path.isdir(path):
@@ -19,41 +40,77 @@ def sanitize_name(in_name: str) -> str:
     return name
 
 
+SIZE_MULTIPLIERS = {'': 1, 'k': 1000, 'm': 1000000, 'g': 1000000000}
+
+
+def size_key(sizes: pd.Series) -> pd.Series:
+    """Numeric value of sizes such as "4k", "1M" or "512" to sort by, anything else sorts last."""
+    parts = sizes.astype(str).str.extract(r'^\s*(\d+(?:\.\d+)?)\s*([kKmMgG]?)\s*$')
+    multiplier = parts[1].str.lower().map(SIZE_MULTIPLIERS)
+    return (pd.to_numeric(parts[0]) * multiplier).fillna(float('inf'))
+
+
+# "99.99" or "max"
+def percentile_spec(value: str) -> float:
+    if value == 'max':
+        return 100.0
+    try:
+        p = float(value)
+    except ValueError:
+        p = -1.0
+    if not 0 < p <= 100:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a percentile in (0, 100] or 'max'")
+    return p
+
+
+def percentile_label(p: float) -> str:
+    return 'max' if p >= 100 else f"p{p:g}"
+
+
 def sort_dataframe_column_with_kmg(df: pd.DataFrame, column_name: str) -> pd.DataFrame:
     """Sorts a DataFrame column with strings ending with K/k, M/m, G/g in ascending order."""
+    return df.sort_values(by=column_name, key=size_key, kind='stable')
+
+
+def records_to_frame(records: list[dict], df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build the frame of a directory in one shot from the records of its files, with
+    the columns of df first, indexed and sorted by data size.
+    """
+    frame = pd.DataFrame.from_records(records)
+    columns = [*df.columns, *(c for c in frame.columns if c not in df.columns)]
+    frame = sort_dataframe_column_with_kmg(frame.reindex(columns=columns), 'Data size (bytes)')
+    return frame.set_index('Data size (bytes)')
 
-    def key_function(s: str) -> float:
-        """Key function for sorting."""
-        if isinstance(s, str):
-            if s.endswith('k') or s.endswith('K'):
-                return float(s[:-1]) * 1000
-            elif s.endswith('m') or s.endswith('M'):
-                return float(s[:-1]) * 1000000
-            elif s.endswith('g') or s.endswith('G'):
-                return float(s[:-1]) * 1000000000
-            else:
-                try:
-                    # Handles cases where the string is just a number
-                    return float(s)
-                except ValueError:
-                    # pushes non-numeric or oddly formatted strings to the end.
-                    return float('inf')
-        else:
-            # handles cases where the cell is not a string
-            try:
-                return float(s)
-            except (TypeError, ValueError):
-                # pushes non-numeric or oddly formatted cells to the end.
-                return float('inf')
-
-    df_sorted = df.sort_values(by=column_name, key=lambda col: col.apply(key_function))
-    return df_sorted
+
+def result_files(directory: str, suffix: str) -> list[str]:
+    return [entry.path for entry in os.scandir(directory) if entry.is_file() and entry.name.endswith(suffix)]
+
+
+def sweep_points(directory: str) -> list[tuple[str, str]]:
+    """
+    The name and path of every sweep point of a results directory, i.e. its
+    sub-directories with a parameters.json. A run without a sweep is a single
+    unnamed point, the directory itself.
+    """
+    points = sorted((entry.name, entry.path) for entry in os.scandir(directory)
+                    if entry.is_dir() and os.path.isfile(os.path.join(entry.path, 'parameters.json')))
+    return points or [('', directory)]
+
+
+def read_parameters(directory: str) -> dict:
+    """The memtier parameters a sweep point ran with, empty for older runs."""
+    filepath = os.path.join(directory, 'parameters.json')
+    if not os.path.isfile(filepath):
+        return {}
+    with open(filepath, "r") as file:
+        return json.load(file)
 
 
 def process_memtier_results(filename: str) -> pd.DataFrame:
     result = {}
-    file = open(filename, "r")
-    Lines = file.readlines()
+    with open(filename, "r") as file:
+        Lines = file.readlines()
 
     result["Data size (bytes)"] = os.path.basename(filename).split("_")[0]
 
@@ -77,57 +134,51 @@ def process_memtier_results(filename: str) -> pd.DataFrame:
     return result
 
 
+# Metrics of several instances that simply add up
+THROUGHPUT_METRICS = ['ops/sec', 'hits/sec', 'miss/sec', 'kb/s']
+
+
+def combine_instances(records: list[dict]) -> list[dict]:
+    """
+    One record per data size out of the records of every instance that ran it. The
+    throughputs are summed and the average latency weighted by the operations. The
+    Totals percentiles can't be merged, so those are the worst instance's; the exact
+    percentiles of all the instances together are the hdr_* metrics.
+    """
+    frame = pd.DataFrame.from_records(records)
+    # No Totals line in any of the logs
+    if 'ops/sec' not in frame.columns:
+        return records
+
+    grouped = frame.assign(weighted=frame['avg_latency'] * frame['ops/sec']).groupby('Data size (bytes)', sort=False)
+    latencies = [col for col in frame.columns if col.endswith('_latency') and col != 'avg_latency']
+
+    combined = grouped[THROUGHPUT_METRICS].sum(min_count=1)
+    combined['avg_latency'] = grouped['weighted'].sum(min_count=1) / combined['ops/sec']
+    combined[latencies] = grouped[latencies].max()
+    combined['instances'] = grouped.size()
+    return combined.reset_index().to_dict('records')
+
+
 def process_numastat_results(filename) -> pd.DataFrame:
     result = {}
     df = pd.read_csv(filename)
 
-    node_columns_count = sum(1 for col in df.columns if col.startswith("Node"))
     result["Data size (bytes)"] = os.path.basename(filename).split("_")[0]
 
-    for i in range(node_columns_count):
-        columnname = 'Node'+str(i)
+    # Node ids come from sysfs and need not be contiguous
+    for columnname in (col for col in df.columns if col.startswith("Node")):
         result[columnname+'_Memory_avg'] = round(df[columnname].div(1024).mean(), 2)
         result[columnname+'_Memory_P95'] = round(df[columnname].div(1024*1024).quantile(0.95), 2)
     return result
 
 
-def process_directory_numastat(directory: str, df: pd.DataFrame) -> pd.DataFrame:
-    result_df = df.copy()
-    for filename in os.listdir(directory):
-        filepath = os.path.join(directory, filename)
-        # Process only the files
-        if not os.path.isfile(filepath):
-            continue
-        # Process only those files that end with _bench.log
-        if filename.endswith("_numastat.csv"):
-            print(f"    Processing: {filepath}")
-            rdict = process_numastat_results(filepath)
-            result_df.loc[len(result_df)] = rdict
-        result_df = sort_dataframe_column_with_kmg(result_df, 'Data size (bytes)')
-    return result_df
-
-
 def process_dstat_results(filename) -> pd.DataFrame:
     result = {}
-    df = pd.read_csv(filename, skiprows=4)
-    # The columns are actually loaded in directly as the first data row, so set them in the dataframe
-    df.columns = df.iloc[0]
-    # Ignore the first data row, as it may be incomplete.  This is a known problem wiht dstat reported data
-    data = df[2:]
-    data = data.apply(pd.to_numeric)
-
-    # Check the headers to identify the actual name generared by dstat
-    # dstat generated different headers for different versions of the tool and OS combinations
-    if 'idl' in df.columns:
-        cpu_idle = 'idl'
-        cpu_wait = 'wai'
-        mem_used = 'used'
-    elif 'total usage:idl' in df.columns:
-        cpu_idle = 'total usage:idl'
-        cpu_wait = 'total usage:wai'
-        mem_used = 'used'
-    else:
+    data, columns = read_dstat(filename)
+    if not columns:
         return result
+    cpu_idle, cpu_wait, mem_used = columns['idle'], columns['wait'], columns['used']
 
     result['CPU_Utilization'] = round((100.0 - data[cpu_idle].mean()), 2)
     result['CPU_Wait'] = round(data[cpu_wait].mean(), 2)
@@ -144,10 +195,11 @@ def plot_the_df(output_name: str, title: str, df: pd.DataFrame) -> None:
     if  df.shape[1] == 2:
         ax.legend(loc='lower center', bbox_to_anchor=(0.5, -0.2), ncol=2)
     else:
-        ax.legend(loc='right', bbox_to_anchor=(0.5, -0.2), ncol=2)
+        ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.1), ncol=min(df.shape[1], 4))
     fig = ax.get_figure()
     #fig.savefig(output_name+'.png', bbox_inches='tight')
     fig.savefig(output_name+'.png', bbox_inches='tight')
+    plt.close(fig)
 
 
 def get_experiment_prefix(input_string: str) -> str:
@@ -158,72 +210,311 @@ def get_experiment_prefix(input_string: str) -> str:
         return input_string
 
 
-def plot_charts(left_df: pd.DataFrame, right_df: pd.DataFrame, args: argparse.Namespace) -> None:
-    left_name = get_experiment_prefix(os.path.basename(os.path.normpath(args.left)))
-    right_name = get_experiment_prefix(os.path.basename(os.path.normpath(args.right)))
+def experiment_names(directories: list[str]) -> list[str]:
+    names = [get_experiment_prefix(os.path.basename(os.path.normpath(d))) for d in directories]
 
     # Consider the case when the same output prefix is used for different experiments
-    if left_name == right_name:
-        left_name += "_left"
-        right_name += "_right"
-
-    merged_df = left_df.merge(right_df,
-                              on=['Data size (bytes)'],
-                              how='left',
-                              suffixes=('_'+left_name, '_'+right_name)).set_index('Data size (bytes)')
-    merged_df.to_excel(args.output + ".xlsx", index=False)
-   
-    # Metrics and their readable names
-    # The first element is the title of the chart, 
-    # the second element tells us if the plot should be absolute or relative
-    plots_to_generate = { "ops/sec" : ( "Redis-Memtier Operations/s (Relative)", False),
-                          "hits/sec": ("Redis-Memtier Hits/s (Relative)", False),
-                          "miss/sec": ("Redis-Memtier Miss/s (Relative)", False),
-                          "avg_latency": ("Redis-Memtier Average Latency (Relative)", False),
-                          "p50_latency": ("Redis-Memtier P50 Latency (Relative)", False),
-                          "p95_latency": ("Redis-Memtier P95 Latency (Relative)", False),
-                          "p99_latency": ("Redis-Memtier P99 Latency (Relative)", False),
-                          "p99.9_latency": ("Redis-Memtier P99.9 Latency (Relative)", False),
-                          "kb/s": ("Redis-Memtier Throughput kb/s (Relative)", False),
-                          "CPU_Utilization": ( "Redis-Memtier Average System CPU Utilization (Cores)", True),
-                          "Memory_Utilization_avg": ("Redis-Memtier Average System Memory Utilization (GB)", True),
-                          "Memory_Utilization_p95": ("Redis-Memtier P95 System Memory Utilization (GB)", True)
-                        }
-
-
-    for plot, title in plots_to_generate.items():
-        o_left_name = plot+'_'+left_name
-        o_right_name = plot+'_'+right_name
-
-        columns_to_extract = [ o_left_name, o_right_name ]
-        extracted_df = merged_df[columns_to_extract]
-        extracted_df = extracted_df.rename(columns={o_left_name: left_name, o_right_name: right_name})
-        # Normalize Results to left values, i.e. Generate relative performance numbers
-        if title[1] == False:
-            extracted_df[right_name] = extracted_df[right_name] / extracted_df[left_name]
-            extracted_df[left_name] = extracted_df[left_name] / extracted_df[left_name]
+    return [f"{name}_{i}" if names.count(name) > 1 else name for i, name in enumerate(names)]
+
+
+# Metrics and their readable names
+# The first element is the title of the chart,
+# the second element tells us if the plot should be absolute or relative
+PLOTS_TO_GENERATE = { "ops/sec" : ( "Redis-Memtier Operations/s (Relative)", False),
+                      "hits/sec": ("Redis-Memtier Hits/s (Relative)", False),
+                      "miss/sec": ("Redis-Memtier Miss/s (Relative)", False),
+                      "avg_latency": ("Redis-Memtier Average Latency (Relative)", False),
+                      "p50_latency": ("Redis-Memtier P50 Latency (Relative)", False),
+                      "p95_latency": ("Redis-Memtier P95 Latency (Relative)", False),
+                      "p99_latency": ("Redis-Memtier P99 Latency (Relative)", False),
+                      "p99.9_latency": ("Redis-Memtier P99.9 Latency (Relative)", False),
+                      "kb/s": ("Redis-Memtier Throughput kb/s (Relative)", False),
+                      "steady_ops/sec": ("Redis-Memtier Steady-State Operations/s (Relative)", False),
+                      "steady_avg_latency": ("Redis-Memtier Steady-State Average Latency (Relative)", False),
+                      "steady_ops/sec_cv": ("Redis-Memtier Steady-State Operations/s Variation (CV)", True),
+                      "CPU_Utilization": ( "Redis-Memtier Average System CPU Utilization (Cores)", True),
+                      "Memory_Utilization_avg": ("Redis-Memtier Average System Memory Utilization (GB)", True),
+                      "Memory_Utilization_p95": ("Redis-Memtier P95 System Memory Utilization (GB)", True)
+                    }
+
+
+def long_format(stats: list[pd.DataFrame], names: list[str]) -> pd.DataFrame:
+    """
+    Stack the stats of every experiment into one Experiment/Data size/Metric/Value
+    table. Relative is each value divided by the baseline's (the first experiment)
+    for the same data size and metric.
+    """
+    long_df = pd.concat(
+        [df.melt(id_vars=['Data size (bytes)'], var_name='Metric', value_name='Value')
+           .assign(Experiment=name)
+         for df, name in zip(stats, names)],
+        ignore_index=True,
+    )
+    long_df['Value'] = pd.to_numeric(long_df['Value'], errors='coerce')
+    long_df['Experiment'] = pd.Categorical(long_df['Experiment'], categories=names, ordered=True)
+
+    baseline = long_df.loc[long_df['Experiment'] == names[0], ['Data size (bytes)', 'Metric', 'Value']]
+    long_df = long_df.merge(baseline, on=['Data size (bytes)', 'Metric'], how='left', suffixes=('', '_baseline'))
+    long_df['Relative'] = long_df['Value'] / long_df.pop('Value_baseline')
+
+    return long_df[['Experiment', 'Data size (bytes)', 'Metric', 'Value', 'Relative']]
+
+
+def grouped_bars(long_df: pd.DataFrame, metrics: list[str], value: str) -> pd.DataFrame:
+    """Data sizes as rows and one column per experiment (and metric, when there are several)."""
+    extracted_df = long_df[long_df['Metric'].isin(metrics)]
+    columns = 'Experiment' if len(metrics) == 1 else ['Experiment', 'Metric']
+    wide_df = extracted_df.pivot_table(index='Data size (bytes)', columns=columns, values=value, observed=True)
+
+    if len(metrics) > 1:
+        wide_df.columns = [f"{experiment} {metric}" for experiment, metric in wide_df.columns]
+
+    wide_df = sort_dataframe_column_with_kmg(wide_df.reset_index(), 'Data size (bytes)')
+    return wide_df.set_index('Data size (bytes)')
+
+
+def plot_charts(long_df: pd.DataFrame, args: argparse.Namespace) -> None:
+    long_df.to_excel(args.output + ".xlsx", index=False)
+
+    for plot, title in PLOTS_TO_GENERATE.items():
+        if not (long_df['Metric'] == plot).any():
+            continue
+
+        # Normalize Results to the baseline values, i.e. Generate relative performance numbers
+        extracted_df = grouped_bars(long_df, [plot], 'Value' if title[1] else 'Relative')
 
         output_name = args.output + "_" + sanitize_name(plot)
         plot_the_df(output_name, title[0], extracted_df)
 
-    numastat_df = merged_df[[col for col in merged_df.columns if col.startswith('Node')]]
-    plot_the_df(args.output + "_numa_utilization", "NUMA Node Memory Utilization (GB)", numastat_df)
+    for plot in (m for m in long_df['Metric'].unique() if m.startswith('hdr_')):
+        label = plot.removeprefix('hdr_').removesuffix('_latency').replace('_', ' ')
+        extracted_df = grouped_bars(long_df, [plot], 'Relative')
+        plot_the_df(args.output + "_" + sanitize_name(plot),
+                    f"Redis-Memtier {label} Latency from HDR Histograms (Relative)",
+                    extracted_df)
+
+    node_metrics = sorted(m for m in long_df['Metric'].unique() if m.startswith('Node') and m.endswith('_avg'))
+    if node_metrics:
+        numastat_df = grouped_bars(long_df, node_metrics, 'Value')
+        plot_the_df(args.output + "_numa_utilization", "NUMA Node Memory Utilization (GB)", numastat_df)
+
+
+def hdr_metric(command: str, p: float) -> str:
+    prefix = 'hdr_' if command == ALL_COMMANDS else f"hdr_{command}_"
+    return f"{prefix}{percentile_label(p)}_latency"
+
+
+def collate_hdr_stats(histograms: dict[tuple[str, str], LatencyHistogram], percentiles: list[float]) -> pd.DataFrame:
+    """Percentiles of every data size and command, read from the merged histograms."""
+    records: dict[str, dict] = {}
+    for (size, command), histogram in histograms.items():
+        record = records.setdefault(size, {'Data size (bytes)': size})
+        for p in percentiles:
+            record[hdr_metric(command, p)] = histogram.percentile(p)
+    return records_to_frame(list(records.values()), pd.DataFrame(columns=['Data size (bytes)']))
+
+
+def plot_cdfs(histograms: list[dict[tuple[str, str], LatencyHistogram]], names: list[str], args: argparse.Namespace) -> None:
+    """
+    One chart per data size and command, with the latency distribution of every
+    experiment overlaid. The x axis counts nines, so the tail is as wide as the body.
+    """
+    keys = sorted({key for experiment in histograms for key in experiment})
+
+    for size, command in keys:
+        fig, ax = plt.subplots(figsize=(10, 6))
+
+        for name, experiment in zip(names, histograms):
+            if (size, command) not in experiment:
+                continue
+            values, fractions = experiment[(size, command)].cdf()
+            # The last bucket holds every request, it has no finite number of nines
+            nines = -np.log10(np.clip(1 - np.array(fractions), 1e-7, None))
+            ax.step(nines, values, where='pre', label=name)
+
+        ticks = range(0, 8)
+        ax.set_xticks(ticks, labels=[f"{100 * (1 - 10 ** -t):.{max(t - 2, 0)}f}%" for t in ticks])
+        ax.set_yscale('log')
+        ax.set_xlabel('Percentile')
+        ax.set_ylabel('Latency (ms)')
+        ax.set_title(f"Redis-Memtier {command} Latency Distribution, {size} Data Size")
+        ax.grid(True, which='both', alpha=0.3)
+        ax.legend(loc='upper left', ncol=min(len(names), 4))
+
+        fig.savefig(f"{args.output}_cdf_{sanitize_name(size)}_{command.lower()}.png", bbox_inches='tight')
+        plt.close(fig)
+
+
+def plot_scaling(long_df: pd.DataFrame, series: dict[str, str], args: argparse.Namespace) -> None:
+    """
+    Operations/s against the number of instances, one chart per data size and one
+    line per series, the experiments that share an output prefix. Repeated runs of
+    the same series and instance count are averaged.
+    """
+    wide_df = long_df.pivot_table(index=['Experiment', 'Data size (bytes)'], columns='Metric',
+                                  values='Value', observed=True).reset_index()
+    if 'instances' not in wide_df.columns or wide_df['instances'].nunique() < 2:
+        return
+
+    wide_df['Series'] = wide_df['Experiment'].astype(str).map(series)
+    scaling_df = wide_df.pivot_table(index=['Data size (bytes)', 'instances'], columns='Series',
+                                     values='ops/sec', sort=False)
+    scaling_df = sort_dataframe_column_with_kmg(scaling_df.reset_index(), 'Data size (bytes)')
+    scaling_df['instances'] = scaling_df['instances'].astype(int)
+    scaling_df.to_csv(args.output + "_scaling.csv", index=False)
+
+    for size, size_df in scaling_df.groupby('Data size (bytes)', sort=False):
+        size_df = size_df.sort_values('instances')
+        fig, ax = plt.subplots(figsize=(10, 6))
+
+        for name in (col for col in size_df.columns if col not in ('Data size (bytes)', 'instances')):
+            points = size_df[['instances', name]].dropna()
+            ax.plot(points['instances'], points[name], marker='o', label=name)
+
+        ax.set_xticks(sorted(size_df['instances'].unique()))
+        ax.set_xlabel('Redis and Memtier Instances')
+        ax.set_ylabel('Operations/s (all instances)')
+        ax.set_title(f"Redis-Memtier Operations/s Scaling, {size} Data Size")
+        ax.grid(True, alpha=0.3)
+        ax.legend(loc='upper left')
+
+        fig.savefig(f"{args.output}_scaling_{sanitize_name(size)}.png", bbox_inches='tight')
+        plt.close(fig)
+
+
+def plot_sweep(sweep_df: pd.DataFrame, parameters: list[str], args: argparse.Namespace) -> None:
+    """
+    Operations/s of every experiment relative to the baseline at each sweep point,
+    one chart per data size, e.g. how the DRAM vs CXL gap changes with the key pattern.
+    The points are labelled with the parameters that differ between them.
+    """
+    sweep_df.to_csv(args.output + "_sweep.csv", index=False)
+
+    varying = [col for col in parameters if sweep_df[col].astype(str).nunique() > 1]
+    if varying:
+        labels = sweep_df[varying].astype(str).radd([f"{col}=" for col in varying]).agg('\n'.join, axis=1)
+        sweep_df = sweep_df.assign(Point=labels)
+
+    ops_df = sweep_df[sweep_df['Metric'] == 'ops/sec']
+    for size, size_df in ops_df.groupby('Data size (bytes)', sort=False):
+        points_df = size_df.pivot_table(index='Point', columns='Experiment', values='Relative',
+                                        observed=True, sort=False)
+        plot_the_df(f"{args.output}_sweep_{sanitize_name(size)}",
+                    f"Redis-Memtier Operations/s per Sweep Point (Relative), {size} Data Size",
+                    points_df)
+
+
+def slo_metric(long_df: pd.DataFrame, p: float) -> str:
+    """The metric of latency percentile p, from the HDR histograms when there are any."""
+    metric = hdr_metric(ALL_COMMANDS, p)
+    if (long_df['Metric'] == metric).any():
+        return metric
+    # The percentiles of the memtier Totals line
+    return f"{percentile_label(p)}_latency"
+
+
+def find_slo_knees(sweep_df: pd.DataFrame, parameters: list[str], args: argparse.Namespace) -> None:
+    """
+    The highest operations/s of every experiment, workload and data size whose latency
+    percentile stays within the SLO, out of the concurrency points of its sweep. Draws
+    the throughput-latency curve every knee is found on.
+    """
+    latency = slo_metric(sweep_df, args.slo_percentile)
+    label = percentile_label(args.slo_percentile)
+    workload = [col for col in parameters if col not in CONCURRENCY_PARAMETERS]
+    concurrency = [col for col in parameters if col in CONCURRENCY_PARAMETERS]
+    group = ['Experiment', *workload, 'Data size (bytes)']
+
+    # Missing parameters (null in parameters.json) would drop the rows from the pivot
+    curves = sweep_df.assign(**{col: sweep_df[col].fillna('').astype(str) for col in workload})
+    curves = curves[curves['Metric'].isin(['ops/sec', latency])].pivot_table(
+        index=[*group, 'Point', *concurrency], columns='Metric', values='Value', observed=True, sort=False
+    ).reset_index()
+    if latency not in curves.columns:
+        print(f"No {label} latency in the results, can't look for the SLO knees")
+        return
+
+    if concurrency:
+        curves['Outstanding requests'] = curves[concurrency].prod(axis=1)
+        curves = curves.sort_values([*group, 'Outstanding requests'], kind='stable')
+    else:
+        curves = curves.sort_values([*group, 'ops/sec'], kind='stable')
+
+    within = curves[(curves[latency] <= args.slo) & curves['ops/sec'].notna()]
+    knees = within.loc[within.groupby(group, sort=False)['ops/sec'].idxmax()]
+    # Keep the experiments that never met the SLO in the table, without a throughput
+    knees = curves[group].drop_duplicates().merge(knees, on=group, how='left')
+    throughput = f"max ops/sec with {label} <= {args.slo:g}ms"
+    knees = knees.rename(columns={'ops/sec': throughput})
+    knees.to_csv(args.output + "_slo.csv", index=False)
+
+    print(f"\nHighest throughput with {label} latency <= {args.slo:g}ms")
+    print(knees[[*group, *concurrency, throughput, latency]].to_string(index=False))
+
+    varying = [col for col in workload if curves[col].nunique() > 1]
+    for keys, curve_df in curves.groupby([*varying, 'Data size (bytes)'], sort=False):
+        fig, ax = plt.subplots(figsize=(10, 6))
+        for name, experiment_df in curve_df.groupby('Experiment', sort=False):
+            line = ax.plot(experiment_df['ops/sec'], experiment_df[latency], marker='o', label=name)[0]
+            knee = knees.merge(experiment_df[group].drop_duplicates(), on=group)
+            ax.plot(knee[throughput], knee[latency], marker='*',
+                    markersize=16, color=line.get_color(), linestyle='none')
+
+        ax.axhline(args.slo, color='grey', linestyle='--', label=f"SLO {args.slo:g}ms")
+        ax.set_yscale('log')
+        ax.set_xlabel('Operations/s')
+        ax.set_ylabel(f"{label} Latency (ms)")
+        workload_label = ", ".join(f"{col}={value}" for col, value in zip(varying, keys))
+        ax.set_title(f"Redis-Memtier Throughput vs {label} Latency, {keys[-1]} Data Size"
+                     + (f"\n{workload_label}" if workload_label else ""))
+        ax.grid(True, which='both', alpha=0.3)
+        ax.legend(loc='upper left')
+
+        fig.savefig(f"{args.output}_slo_{sanitize_name('_'.join(str(key) for key in keys[::-1]))}.png",
+                    bbox_inches='tight')
+        plt.close(fig)
+
+
+def plot_timelines(timeline_df: pd.DataFrame, args: argparse.Namespace) -> None:
+    """
+    Per data size, the operations/s of every experiment over the run and, when
+    numastat was sampled, the memory used on every NUMA node underneath.
+    """
+    node_columns = [col for col in timeline_df.columns if col.startswith('Node') and col.endswith('_Memory')]
+
+    for size, size_df in timeline_df.groupby('Data size (bytes)', sort=False):
+        rows = 2 if node_columns and size_df[node_columns].notna().any().any() else 1
+        fig, axes = plt.subplots(rows, 1, figsize=(12, 4 * rows), sharex=True, squeeze=False)
+
+        for name, experiment_df in size_df.groupby('Experiment', sort=False, observed=True):
+            line = axes[0][0].plot(experiment_df['Second'], experiment_df['ops/sec'], label=name)[0]
+            if rows == 2:
+                for node, style in zip(node_columns, ['-', '--', ':', '-.'] * len(node_columns)):
+                    axes[1][0].plot(experiment_df['Second'], experiment_df[node], style,
+                                    color=line.get_color(), label=f"{name} {node.removesuffix('_Memory')}")
+
+        for ax in axes[:, 0]:
+            ax.axvline(args.warmup, color='grey', linestyle=':')
+            ax.grid(True, alpha=0.3)
+            ax.legend(loc='upper left', bbox_to_anchor=(1.0, 1.0), fontsize=8)
+
+        axes[0][0].set_title(f"Redis-Memtier Operations/s over Time, {size} Data Size")
+        axes[0][0].set_ylabel('Operations/s')
+        if rows == 2:
+            axes[1][0].set_ylabel('NUMA Node Memory Used (GB)')
+        axes[-1][0].set_xlabel('Seconds')
+
+        fig.savefig(f"{args.output}_timeline_{sanitize_name(size)}.png", bbox_inches='tight')
+        plt.close(fig)
 
 
 def process_directory_app(directory: str, df: pd.DataFrame) -> pd.DataFrame:
-    result_df = df.copy()
-    # Parse only files with pattern *_bench.log
-    for filename in os.listdir(directory):
-        filepath = os.path.join(directory, filename)
-        # Process only the files
-        if not os.path.isfile(filepath):
-            continue
-        # Process only those files that end with _bench.log
-        if filename.endswith("_bench.log"):
-            print(f"    Processing: {filepath}")
-            result_df.loc[len(result_df)] = process_memtier_results(filepath)
-        result_df = sort_dataframe_column_with_kmg(result_df, 'Data size (bytes)')
-    return result_df
+    # Parse only files with pattern *_bench.log, or *_i<n>_bench.log for every instance
+    records = []
+    for filepath in result_files(directory, "_bench.log"):
+        print(f"    Processing: {filepath}")
+        records.append(process_memtier_results(filepath))
+    return records_to_frame(combine_instances(records), df)
 
 
 def collate_app_stats(directory: str) -> pd.DataFrame:
@@ -239,30 +530,23 @@ def collate_app_stats(directory: str) -> pd.DataFrame:
             "p99_latency",
             "p99.9_latency",
             "kb/s",
+            "instances",
         ]
     )
     return process_directory_app(directory, app_df)
 
 
 def process_directory_dstat(directory: str, df: pd.DataFrame) -> pd.DataFrame:
-    result_df = df.copy()
     # Parse only files with pattern *_dstat.csv
-    valid_dstat = True
-    for filename in os.listdir(directory):
-        filepath = os.path.join(directory, filename)
-        # Process only the files
-        if not os.path.isfile(filepath):
-            continue
-        # Process only those files that end with _bench.log
-        if filename.endswith("_dstat.csv"):
-            print(f"    Processing: {filepath}")
-            rdict = process_dstat_results(filepath)
-            if not rdict:
-                valid_dstat = False
-                return pd.DataFrame()
-            result_df.loc[len(result_df)] = rdict
-        result_df = sort_dataframe_column_with_kmg(result_df, 'Data size (bytes)')
-    return result_df
+    records = []
+    for filepath in result_files(directory, "_dstat.csv"):
+        print(f"    Processing: {filepath}")
+        rdict = process_dstat_results(filepath)
+        # Headers of an unknown dstat version, skip dstat for the whole directory
+        if not rdict:
+            return pd.DataFrame()
+        records.append(rdict)
+    return records_to_frame(records, df)
 
 
 def collate_dstat_stats(directory: str) -> pd.DataFrame:
@@ -279,64 +563,57 @@ def collate_dstat_stats(directory: str) -> pd.DataFrame:
 
 
 def process_directory_numastat(directory: str, df: pd.DataFrame) -> pd.DataFrame:
-    result_df = df.copy()
-    for filename in os.listdir(directory):
-        filepath = os.path.join(directory, filename)
-        # Process only the files
-        if not os.path.isfile(filepath):
-            continue
-        # Process only those files that end with _bench.log
-        if filename.endswith("_numastat.csv"):
-            print(f"    Processing: {filepath}")
-            rdict = process_numastat_results(filepath)
-            result_df.loc[len(result_df)] = rdict
-        result_df = sort_dataframe_column_with_kmg(result_df, 'Data size (bytes)')
-    return result_df
+    # Parse only files with pattern *_numastat.csv
+    records = []
+    for filepath in result_files(directory, "_numastat.csv"):
+        print(f"    Processing: {filepath}")
+        records.append(process_numastat_results(filepath))
+    return records_to_frame(records, df)
 
 
 def collate_numastat_stats(directory: str) -> pd.DataFrame:
-    # The numastat collection is dynamic and based on the number
-    # of NUMA nodes on the system.
-    # Create the base dataframe to account for the numebr of nodes.
+    # One Node<id> column pair per node collect_numastat.py found in sysfs, the
+    # ids need not be contiguous (e.g. nodes 0 and 2)
     numastat_df = pd.DataFrame(columns=['Data size (bytes)'])
-    
-    # Find the number of NUMA nodes in the system under test
-    filepath = os.path.join(directory, 'lscpu.log')
-    file = open(filepath, "r")
-    Lines = file.readlines()
-    for line in Lines:
-        # print(line)
-        line = line.strip(" ").strip("\n")
-        if line.startswith("NUMA node(s):"):
-            line1 = re.sub(" +", "", line)
-            res_array = line1.split(":")
-            num_numa_nodes = int(res_array[1])
-            break
-
-    # Populate the base dataframe
-    for i in range(num_numa_nodes):
-        columnname = 'Node'+str(i)
-        numastat_df[columnname+'_Memory_avg'] = None 
-        numastat_df[columnname+'_Memory_P95'] = None 
-
     return process_directory_numastat(directory, numastat_df)
 
 
-# Collect all the possible stats into a single dataframe
-def generate_combined_stats(directory: str) -> pd.DataFrame:
+# Collect all the possible stats into a single dataframe, along with the
+# directory's latency histograms and per second timelines
+def generate_combined_stats(directory: str,
+                            percentiles: list[float] = HDR_PERCENTILES,
+                            warmup: float = WARMUP_SECONDS) -> tuple[pd.DataFrame, dict, pd.DataFrame]:
     print(f"Processing the results in {directory}")
-    app_df = collate_app_stats(directory)
-    dstat_df = collate_dstat_stats(directory)
-    if not dstat_df.empty:
-        app_df = app_df.merge(dstat_df, 
-                              on=['Data size (bytes)'],
-                              how='inner')
-    numastat_df = collate_numastat_stats(directory)
-    if not numastat_df.empty:
-        app_df = app_df.merge(numastat_df, 
-                              on=['Data size (bytes)'],
-                              how='inner')
-    return app_df
+    histograms = read_directory_histograms(directory)
+    timeline = read_directory_timelines(directory)
+    frames = [collate_app_stats(directory)]
+    for stats_df in (collate_dstat_stats(directory), collate_numastat_stats(directory),
+                     collate_hdr_stats(histograms, percentiles),
+                     steady_state(timeline, warmup) if not timeline.empty else timeline):
+        if not stats_df.empty:
+            frames.append(stats_df)
+    # All frames are indexed by data size, so they line up without merging on a column
+    return pd.concat(frames, axis=1, join='inner').reset_index(), histograms, timeline
+
+
+def plot_experiments(names: list[str], stats: list[pd.DataFrame], histograms: list[dict],
+                     timelines: list[pd.DataFrame], series: dict[str, str],
+                     args: argparse.Namespace) -> pd.DataFrame:
+    """All the charts comparing the experiments, returns their long table."""
+    long_df = long_format(stats, names)
+    plot_charts(long_df, args)
+    plot_cdfs(histograms, names, args)
+    plot_scaling(long_df, series, args)
+
+    # One long table of every experiment's per second samples
+    timelines = [timeline.assign(Experiment=name) for timeline, name in zip(timelines, names) if not timeline.empty]
+    if timelines:
+        timeline_df = pd.concat(timelines, ignore_index=True)
+        timeline_df['Experiment'] = pd.Categorical(timeline_df['Experiment'], categories=names, ordered=True)
+        timeline_df.to_csv(args.output + "_timeline.csv", index=False)
+        plot_timelines(timeline_df, args)
+
+    return long_df
 
 
 def main() -> None:
@@ -345,21 +622,90 @@ def main() -> None:
                         '--left',
                         required=True,
                         type=dir_path,
-                        help="directory path of the base results")
+                        help="directory path of the base results, every other run is normalized to it")
     parser.add_argument('-r',
                         '--right',
                         required=True,
                         type=dir_path,
-                        help="directory path of the experiment results")
+                        nargs='+',
+                        help="directory path(s) of the experiment results")
     parser.add_argument('-o',
                         '--output',
                         required=False,
+                        default='comparison',
                         help='The prefix for generating the charts')
+    parser.add_argument('-j',
+                        '--jobs',
+                        required=False,
+                        type=int,
+                        default=os.cpu_count(),
+                        help='How many result directories are parsed in parallel')
+    parser.add_argument('-p',
+                        '--percentiles',
+                        required=False,
+                        type=percentile_spec,
+                        nargs='+',
+                        default=HDR_PERCENTILES,
+                        help="Latency percentiles read from the HDR histograms, e.g. 99.99 or max")
+    parser.add_argument('-w',
+                        '--warmup',
+                        required=False,
+                        type=float,
+                        default=WARMUP_SECONDS,
+                        help="Seconds at the start of each run left out of the steady-state metrics")
+    parser.add_argument('-s',
+                        '--slo',
+                        required=False,
+                        type=float,
+                        help="Latency SLO in ms, reports the highest throughput of every experiment that meets it")
+    parser.add_argument('--slo-percentile',
+                        required=False,
+                        type=percentile_spec,
+                        default=99.0,
+                        help="The latency percentile the SLO applies to")
     args = parser.parse_args()
 
-    left_df = generate_combined_stats(args.left)
-    right_df = generate_combined_stats(args.right)
-    plot_charts(left_df, right_df, args)
+    if args.slo is not None and args.slo_percentile not in args.percentiles:
+        args.percentiles = [*args.percentiles, args.slo_percentile]
+
+    directories = [args.left, *args.right]
+    names = experiment_names(directories)
+
+    # Every sweep point of every experiment is parsed on its own
+    jobs = [(name, point, path) for name, directory in zip(names, directories)
+            for point, path in sweep_points(directory)]
+
+    with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(jobs)))) as pool:
+        results = list(pool.map(
+            partial(generate_combined_stats, percentiles=args.percentiles, warmup=args.warmup),
+            [path for _, _, path in jobs]))
+
+    # Runs with the same output prefix and different instance counts make up one series
+    series = {name: get_experiment_prefix(os.path.basename(os.path.normpath(d))) for name, d in zip(names, directories)}
+
+    # The experiments are compared point by point, each point with its own charts
+    sweep = []
+    parameters = {}
+    for point in dict.fromkeys(point for _, point, _ in jobs):
+        selected = [(name, path, result) for (name, job_point, path), result in zip(jobs, results) if job_point == point]
+        point_names = [name for name, _, _ in selected]
+        stats, histograms, timelines = zip(*(result for _, _, result in selected))
+
+        if point_names[0] != names[0]:
+            print(f"No baseline results for {point}, it is relative to {point_names[0]} instead")
+
+        point_args = argparse.Namespace(**{**vars(args), 'output': f"{args.output}_{point}" if point else args.output})
+        long_df = plot_experiments(point_names, list(stats), list(histograms), list(timelines), series, point_args)
+
+        point_parameters = read_parameters(selected[0][1])
+        parameters.update(dict.fromkeys(point_parameters))
+        sweep.append(long_df.assign(Point=point, **point_parameters))
+
+    sweep_df = pd.concat(sweep, ignore_index=True)
+    if len(sweep) > 1:
+        plot_sweep(sweep_df, list(parameters), args)
+    if args.slo is not None:
+        find_slo_knees(sweep_df, list(parameters), args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,153 @@
+# Latency histograms from the HDR histogram files memtier_benchmark writes with
+# --hdr-file-prefix: 4k_hdr_FULL_RUN_1.hgrm for all the commands of run 1 and
+# 4k_hdr_GET_command_run_1.hgrm / 4k_hdr_SET_command_run_1.hgrm per command, or
+# 4k_i2_hdr_... for the third of several instances.
+#
+# A .hgrm file is HdrHistogram's percentile distribution:
+#
+#        Value     Percentile TotalCount 1/(1-Percentile)
+#
+#        0.063 0.000000000000          1           1.00
+#        0.095 0.100000000000      12403           1.11
+#        ...
+#   #[Mean    =        0.471, StdDeviation   =        0.227]
+#   #[Max     =       14.079, Total count    =     12345678]
+#
+# The counts between two rows are re-binned into fixed log-spaced buckets, so
+# the histograms of several commands, runs or hosts can simply be added up and
+# any percentile read back from the merged counts.
+
+from dataclasses import dataclass, field
+import math
+import os
+import re
+
+# Every bucket is 2**(1/32), about 2.2%, wider than the previous one
+BUCKETS_PER_OCTAVE = 32
+
+HGRM_FILE = re.compile(
+    r"^(?P<size>[^_]+)(?:_i(?P<instance>\d+))?_hdr_(?:FULL_RUN|(?P<command>[A-Z]+)_command_run)_(?P<run>\d+)\.hgrm$"
+)
+HGRM_MAX = re.compile(r"#\[Max\s*=\s*([\d.]+)")
+
+# Histogram of every command of a run together
+ALL_COMMANDS = "ALL"
+
+
+def bucket_index(value: float) -> int:
+    return math.floor(math.log2(value) * BUCKETS_PER_OCTAVE) if value > 0 else -(2**31)
+
+
+def bucket_upper(index: int) -> float:
+    return 2 ** ((index + 1) / BUCKETS_PER_OCTAVE)
+
+
+@dataclass
+class LatencyHistogram:
+    # Number of requests per log bucket index, latencies in ms
+    counts: dict[int, int] = field(default_factory=dict)
+    max_ms: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def add(self, value: float, count: int) -> None:
+        if count > 0:
+            index = bucket_index(value)
+            self.counts[index] = self.counts.get(index, 0) + count
+            self.max_ms = max(self.max_ms, value)
+
+    def __add__(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        merged = LatencyHistogram(dict(self.counts), max(self.max_ms, other.max_ms))
+        for index, count in other.counts.items():
+            merged.counts[index] = merged.counts.get(index, 0) + count
+        return merged
+
+    def percentile(self, p: float) -> float:
+        """
+        Latency at percentile p (0-100), as the upper edge of the bucket it
+        falls in, so never more than one bucket width above the exact value.
+        """
+        total = self.total
+        if not total:
+            return math.nan
+        if p >= 100:
+            return self.max_ms
+
+        target = math.ceil(total * p / 100)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(bucket_upper(index), self.max_ms)
+        return self.max_ms
+
+    def cdf(self) -> tuple[list[float], list[float]]:
+        """Bucket upper edges and the fraction of requests at or below each."""
+        total = self.total
+        values, fractions = [], []
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            values.append(min(bucket_upper(index), self.max_ms))
+            fractions.append(seen / total)
+        return values, fractions
+
+
+def read_hgrm(filename: str) -> LatencyHistogram:
+    histogram = LatencyHistogram()
+    last_count = 0
+
+    with open(filename, "r") as file:
+        for line in file:
+            if match := HGRM_MAX.match(line.strip()):
+                histogram.max_ms = max(histogram.max_ms, float(match.group(1)))
+                continue
+
+            parts = line.split()
+            try:
+                value, total_count = float(parts[0]), int(parts[2])
+            except (IndexError, ValueError):
+                # Header, blank and summary lines
+                continue
+
+            histogram.add(value, total_count - last_count)
+            last_count = total_count
+
+    return histogram
+
+
+def _merge_into(histograms: dict, key: tuple[str, str], histogram: LatencyHistogram) -> None:
+    histograms[key] = histograms[key] + histogram if key in histograms else histogram
+
+
+def read_directory_histograms(directory: str) -> dict[tuple[str, str], LatencyHistogram]:
+    """
+    The histograms of every data size and command in a results directory, merged
+    across runs and instances, plus one of all the commands together per data size.
+    """
+    histograms: dict[tuple[str, str], LatencyHistogram] = {}
+    commands_total: dict[tuple[str, str], LatencyHistogram] = {}
+
+    for entry in os.scandir(directory):
+        if not entry.is_file() or not entry.name.endswith(".hgrm"):
+            continue
+        match = HGRM_FILE.match(entry.name)
+        if not match:
+            print(f"    Skipping {entry.path}: not a memtier HDR histogram file name")
+            continue
+
+        print(f"    Processing: {entry.path}")
+        histogram = read_hgrm(entry.path)
+        size, command = match.group("size"), (match.group("command") or ALL_COMMANDS).upper()
+
+        _merge_into(histograms, (size, command), histogram)
+        if command != ALL_COMMANDS:
+            _merge_into(commands_total, (size, ALL_COMMANDS), histogram)
+
+    # Only sum the commands up when memtier didn't write a histogram of them all
+    for key, histogram in commands_total.items():
+        histograms.setdefault(key, histogram)
+
+    return histograms
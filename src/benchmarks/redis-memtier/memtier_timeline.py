@@ -0,0 +1,179 @@
+# Per-second timelines of a redis-memtier run, lined up by timestamp:
+#   <size>_bench.json     memtier --json-out-file, per second ops and latency ("Time-Serie"),
+#                         or <size>_i<n>_bench.json per instance, added up second by second
+#   <size>_dstat.csv      dstat -T, CPU and memory use with an epoch column
+#   <size>_numastat.csv   utils/collect_numastat.py, MemUsed per NUMA node
+#
+# The steady state of a run is everything after its first `warmup` seconds,
+# when Redis has filled its memory and any spill to CXL or page migration
+# shows up as a throughput drop instead of being averaged into the Totals.
+
+import json
+import os
+
+import pandas as pd
+
+# Timestamps of two samples further apart than this are not matched up
+ALIGN_TOLERANCE_S = 1.0
+
+
+def read_dstat(filename: str) -> tuple[pd.DataFrame, dict[str, str]]:
+    """
+    The numeric samples of a dstat CSV, and which of its columns hold the CPU idle,
+    CPU wait, used memory and epoch. Empty when the headers are not recognized.
+    """
+    df = pd.read_csv(filename, skiprows=4)
+    # The columns are actually loaded in directly as the first data row, so set them in the dataframe
+    df.columns = df.iloc[0]
+    # Ignore the first data row, as it may be incomplete.  This is a known problem wiht dstat reported data
+    data = df[2:]
+    data = data.apply(pd.to_numeric)
+
+    # Check the headers to identify the actual name generared by dstat
+    # dstat generated different headers for different versions of the tool and OS combinations
+    if 'idl' in df.columns:
+        columns = {'idle': 'idl', 'wait': 'wai', 'used': 'used'}
+    elif 'total usage:idl' in df.columns:
+        columns = {'idle': 'total usage:idl', 'wait': 'total usage:wai', 'used': 'used'}
+    else:
+        return pd.DataFrame(), {}
+
+    # Only present when dstat ran with -T
+    epoch = [col for col in df.columns if isinstance(col, str) and 'epoch' in col]
+    if epoch:
+        columns['epoch'] = epoch[0]
+
+    return data, columns
+
+
+def read_memtier_timeline(filename: str) -> pd.DataFrame:
+    """Second, Timestamp, ops/sec and the latencies of every second of the run."""
+    with open(filename, "r") as file:
+        stats = json.load(file)["ALL STATS"]
+
+    series = stats.get("Totals", {}).get("Time-Serie", {})
+    # Milliseconds since the epoch
+    start = stats.get("Runtime", {}).get("Start time")
+
+    records = []
+    for second, sample in sorted(series.items(), key=lambda item: int(item[0])):
+        record = {
+            'Second': int(second),
+            'Timestamp': start / 1000 + int(second) if start else float('nan'),
+            'ops/sec': sample.get('Count', 0),
+            'avg_latency': sample.get('Average Latency'),
+            'max_latency': sample.get('Max Latency'),
+        }
+        # "p99.00", "p99.90", ... as asked for with --print-percentiles
+        for key, value in sample.items():
+            if key.startswith('p'):
+                try:
+                    record[f"p{float(key[1:]):g}_latency"] = value
+                except ValueError:
+                    pass
+        records.append(record)
+
+    return pd.DataFrame.from_records(records)
+
+
+def combine_instances(timelines: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    The seconds of instances started together, added up: the operations are summed,
+    the average latency weighted by them and the other latencies the worst instance's.
+    """
+    if len(timelines) == 1:
+        return timelines[0]
+
+    df = pd.concat(timelines, ignore_index=True)
+    grouped = df.assign(weighted=df['avg_latency'] * df['ops/sec']).groupby('Second')
+    latencies = [col for col in df.columns if col.endswith('_latency') and col != 'avg_latency']
+
+    combined = grouped[['ops/sec']].sum()
+    combined.insert(0, 'Timestamp', grouped['Timestamp'].min())
+    combined['avg_latency'] = grouped['weighted'].sum() / combined['ops/sec']
+    combined[latencies] = grouped[latencies].max()
+    return combined.reset_index()
+
+
+def read_dstat_timeline(filename: str) -> pd.DataFrame:
+    data, columns = read_dstat(filename)
+    if 'epoch' not in columns:
+        return pd.DataFrame()
+
+    return pd.DataFrame({
+        'Timestamp': data[columns['epoch']].astype(float),
+        'CPU_Utilization': 100.0 - data[columns['idle']],
+        'CPU_Wait': data[columns['wait']],
+        'Memory_Utilization': data[columns['used']].div(1024*1024),
+    }).reset_index(drop=True)
+
+
+def read_numastat_timeline(filename: str) -> pd.DataFrame:
+    df = pd.read_csv(filename)
+    nodes = [col for col in df.columns if col.startswith('Node')]
+    timeline = df[nodes].div(1024).add_suffix('_Memory')
+    timeline.insert(0, 'Timestamp', df['Time'].astype(float))
+    return timeline
+
+
+def align_timeline(memtier: pd.DataFrame, *samples: pd.DataFrame) -> pd.DataFrame:
+    """Each memtier second with the dstat/numastat samples nearest to it in time."""
+    timeline = memtier.sort_values('Timestamp')
+    if timeline['Timestamp'].isna().any():
+        return memtier
+
+    for sample in samples:
+        if sample.empty:
+            continue
+        timeline = pd.merge_asof(timeline, sample.sort_values('Timestamp'), on='Timestamp',
+                                 direction='nearest', tolerance=ALIGN_TOLERANCE_S)
+    return timeline
+
+
+def read_directory_timelines(directory: str) -> pd.DataFrame:
+    """The aligned timelines of every data size in a results directory, stacked."""
+    instances: dict[str, list[pd.DataFrame]] = {}
+
+    for entry in os.scandir(directory):
+        if not entry.is_file() or not entry.name.endswith("_bench.json"):
+            continue
+
+        print(f"    Processing: {entry.path}")
+        memtier = read_memtier_timeline(entry.path)
+        if not memtier.empty:
+            instances.setdefault(entry.name.split("_")[0], []).append(memtier)
+
+    timelines = []
+    for size, memtier in instances.items():
+        memtier = combine_instances(memtier)
+
+        samples = []
+        for suffix, reader in (("_dstat.csv", read_dstat_timeline), ("_numastat.csv", read_numastat_timeline)):
+            path = os.path.join(directory, size + suffix)
+            if os.path.isfile(path):
+                samples.append(reader(path))
+
+        timeline = align_timeline(memtier, *samples)
+        timeline.insert(0, 'Data size (bytes)', size)
+        timelines.append(timeline)
+
+    return pd.concat(timelines, ignore_index=True) if timelines else pd.DataFrame()
+
+
+def steady_state(timeline: pd.DataFrame, warmup: float) -> pd.DataFrame:
+    """
+    Per data size throughput and latency of the seconds after the warmup. The
+    latency is weighted by the operations of every second, the throughput's
+    coefficient of variation shows how steady the run really was.
+    """
+    steady = timeline[timeline['Second'] >= warmup]
+    weighted = steady['avg_latency'] * steady['ops/sec']
+    grouped = steady.assign(weighted=weighted).groupby('Data size (bytes)')
+
+    result = pd.DataFrame({
+        'steady_ops/sec': grouped['ops/sec'].mean(),
+        'steady_ops/sec_cv': grouped['ops/sec'].std() / grouped['ops/sec'].mean(),
+        'steady_avg_latency': grouped['weighted'].sum() / grouped['ops/sec'].sum(),
+    })
+    # Runs no longer than the warmup still get a (NaN) row
+    return result.reindex(timeline['Data size (bytes)'].unique()).round(4)
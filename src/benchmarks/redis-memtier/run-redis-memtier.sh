@@ -1,12 +1,13 @@
 #!/bin/bash
 # set -x
 #
-# This script uses docker to start 1 redis end 1 memtier container instances in a 1:1 relationship
+# This script uses docker to start N redis and N memtier container instances in a 1:1 relationship
 # The containers run on a dedicated virtual network to simplify hostname referencing
-# Each redis-server container will run on a dedicated host port, starting at 6279 and increasing
+# Each redis-server container will run on a dedicated host port, starting at 6379 and increasing
 # by one for each new instance.
 # Each memtier container will run redis-memtier benchmarks against a single redis
-# database instance.
+# database instance. The instances split the CPUs of their NUMA nodes between them, all
+# memtier containers are started together and their results are aggregated by the chart generator.
 # The goal of this script is to show multi-instance performance as we start
 # more DB instances.
 
@@ -25,7 +26,8 @@ DOCKER_NETWORK_NAME=myredis-network
 DOCKER_INSTANCES=1                  # Number of docker instances to start: Override by -i
 
 # === Redis Server Variables ===
-REDIS_START_PORT=6379
+REDIS_START_PORT=6379               # Host port of the first instance
+REDIS_PORT=6379                     # Port redis-server listens on inside its container
 REDIS_MAX_MEMORY=128
 REDIS_REPLACEMENT_POLICY="volatile-lru"
 REDIS_SERVER_NAME=redis_docker
@@ -41,6 +43,19 @@ MEMTIER_DOCKER_IMAGE=redislabs/memtier_benchmark
 # === Run options ===
 WARM_DB_RUN_TIME=300
 TEST_RUN_TIME=300
+NUMASTAT_INTERVAL=1                 # Seconds between NUMA MemUsed samples: Override by -n
+
+# === Sweep options ===
+# Every combination is benchmarked. When there is more than one, each gets its own
+# sub-directory of the output directory, named after its parameters.
+KEY_PATTERNS="R:R"                  # memtier --key-pattern(s), comma separated: Override by -K
+KEY_MAXIMUMS="30000000"             # Key space size(s), comma separated: Override by -k
+SET_GET_RATIOS="1:10"               # memtier --ratio(s), comma separated: Override by -g
+KEY_STDDEV=                         # --key-stddev of Gaussian patterns, memtier defaults to a sixth of the key range: Override by -D
+KEY_ZIPF_EXP=0.99                   # --key-zipf-exp of Zipf patterns: Override by -Z
+PIPELINES="64"                      # memtier --pipeline depth(s), comma separated: Override by -P
+CLIENTS="50"                        # memtier --clients per thread, comma separated: Override by -c
+THREADS="4"                         # memtier --threads, comma separated: Override by -t
 
 #SIZE_ARRAY=(1024 4096 8192 16384 32769 65536  131072 262144 524288 1048676 2097152 4194304 )
 NAME_ARRAY=("1k" "4k" "8k" "16k" "32k" "64k" "128k" "256k" "512k" "1M" "2M" "4M")
@@ -54,8 +69,8 @@ NAME_ARRAY=("1k" "4k" "8k" "16k" "32k" "64k" "128k" "256k" "512k" "1M" "2M" "4M"
 function ctrl_c()
 {
   info_msg "Received CTRL+C - aborting"
-  stop_containers
-  remove_containers
+  stop_clients
+  stop_servers
   delete_network
   display_end_info
   exit 1
@@ -78,7 +93,7 @@ function verify_cmds()
 {
     local err_state=false
 
-    for CMD in numactl lscpu lspci grep cut sed awk docker dstat; do
+    for CMD in numactl lscpu lspci grep cut sed awk docker dstat python3; do
         CMD_PATH=($(command -v ${CMD}))
         if [ ! -x "${CMD_PATH}" ]; then
             error_msg "${CMD} command not found! Please install the ${CMD} package."
@@ -109,11 +124,26 @@ function print_usage()
     echo "      -s <max_memory>                             : MaxMemory in GB for each Redis Server: Default ${REDIS_MAX_MEMORY}gb"
     echo "      -p allkeys-lru|allkeys-lru|allkeys-random|  : Redis MaxMemory Replacement Policy: Default ${REDIS_REPLACEMENT_POLICY}"
     echo "         volatile-lru|volatile-lfu|volatile-random"
+    echo "      -n <interval>                               : Seconds between NUMA MemUsed samples, down to 0.1: Default ${NUMASTAT_INTERVAL}"
+    echo "      -i <instances>                              : Number of Redis and Memtier container pairs: Default ${DOCKER_INSTANCES}"
+
+    echo " [Sweep options, every combination is benchmarked]"
+    echo "      -K <pattern,..>                             : Memtier key patterns, R:R uniform, G:G Gaussian, S:S sequential,"
+    echo "                                                    Z:Z Zipf: Default ${KEY_PATTERNS}"
+    echo "      -k <keys,..>                                : Key space sizes (--key-maximum): Default ${KEY_MAXIMUMS}"
+    echo "      -g <set:get,..>                             : Set:Get ratios: Default ${SET_GET_RATIOS}"
+    echo "      -D <stddev>                                 : Key standard deviation of the Gaussian patterns: Default a sixth of the key space"
+    echo "      -Z <exponent>                               : Exponent of the Zipf patterns, between 0 and 5: Default ${KEY_ZIPF_EXP}"
+    echo "      -P <depth,..>                               : Memtier pipeline depths: Default ${PIPELINES}"
+    echo "      -c <clients,..>                             : Memtier clients per thread: Default ${CLIENTS}"
+    echo "      -t <threads,..>                             : Memtier threads of every instance: Default ${THREADS}"
 
     echo " [Machine confiuration options]"
     echo "      -C <numa_node>                              : [Required] CPU NUMA Node to run the Redis Server"
     echo "      -M <numa_node,..>                           : [Required] Memory NUMA Node(s) to run the Redis Server"
     echo "      -S <numa_node>                              : [Required] CPU NUMA Node to run the Memtier workers"
+    echo "      -m <numa_node,..>                           : Memory NUMA Node of each Redis Server in turn, repeated as needed."
+    echo "                                                    Default: every Redis Server uses -M"
 
     echo "      -h                                          : Print this message"
     echo " "
@@ -129,16 +159,117 @@ function print_usage()
     echo " "
     echo "    $ ./${SCRIPT_NAME} -e cxl -o cxl -C 0 -M 2 -S 1 -p allkeys-lfu -s 256 -w 600 -r 300"
     echo " "
+    echo "Example 3: Runs 4 Redis containers, each on a quarter of the cores of NUMA Node 0, two using DRAM"
+    echo "  on NUMA Node 0 and two using CXL memory on NUMA Node 2, with 4 Memtier containers on NUMA Node 1"
+    echo " "
+    echo "    $ ./${SCRIPT_NAME} -e cxl -o mixed -i 4 -C 0 -M 0 -m 0,2 -S 1 -s 32"
+    echo " "
+    echo "Example 4: Compares uniform, Gaussian and Zipf key access on CXL memory, for two key space sizes"
+    echo " "
+    echo "    $ ./${SCRIPT_NAME} -e cxl -o cxl -C 0 -M 2 -S 1 -K R:R,G:G,Z:Z -k 10000000,30000000"
+    echo " "
+    echo "Example 5: Walks the throughput-latency curve of DRAM by raising the pipeline depth and client count"
+    echo " "
+    echo "    $ ./${SCRIPT_NAME} -e dram -o dram -C 0 -M 0 -S 1 -P 1,4,16,64 -c 10,50 -t 4"
+    echo " "
 }
 
 
-# From the REDIS_CPU_NUMA_NODE (-C) and MEMTIER_NUMA_NODE (-S)  argument, determine what cpusets to use
+# Split the CPUs of a NUMA node into DOCKER_INSTANCES cpusets of whole cores, so
+# hyperthread siblings always end up in the same instance
+# args: numa node, instance number
+# return: 0=success, 1=the node has fewer cores than instances. The cpuset is written to STDOUT
+function instance_cpuset()
+{
+    local node=${1}
+    local instance=${2}
+
+    lscpu -p=CPU,CORE,NODE | grep -v '^#' | awk -F, -v node=${node} -v count=${DOCKER_INSTANCES} -v slot=${instance} '
+        $3 == node {
+            if (!($2 in cpus)) cores[n++] = $2
+            cpus[$2] = cpus[$2] "," $1
+        }
+        END {
+            per = int(n / count)
+            if (per == 0) exit 1
+            for (i = slot * per; i < (slot + 1) * per; i++) out = out cpus[cores[i]]
+            print substr(out, 2)
+        }'
+}
+
+# The file name prefix of an instance's results. A single instance keeps the plain
+# <size>_ prefix, so its results look like they always have.
+# args: data size, instance number
+function instance_prefix()
+{
+    if [ ${DOCKER_INSTANCES} -eq 1 ]; then
+        echo "${1}"
+    else
+        echo "${1}_i${2}"
+    fi
+}
+
+# The directory the results of one sweep point are written to, created if needed
+# args: key maximum, key pattern, set:get ratio, pipeline depth, clients, threads
+# return: the absolute path on STDOUT
+function sweep_point_path()
+{
+    local path=${OUTPUT_PATH}
+
+    if [ ${SWEEP_POINTS} -gt 1 ]; then
+        path+="/${2/:/-}_keys${1}_ratio${3/:/-}_pipeline${4}_clients${5}x${6}"
+    fi
+    mkdir -p ${path}
+    readlink -f ${path}
+}
+
+# Record the memtier parameters of a sweep point next to its results
+# args: results directory, key maximum, key pattern, set:get ratio, pipeline depth, clients, threads
+function write_sweep_parameters()
+{
+    cat > ${1}/parameters.json << EOF
+{
+    "key_pattern": "${3}",
+    "key_maximum": ${2},
+    "ratio": "${4}",
+    "key_stddev": ${KEY_STDDEV:-null},
+    "key_zipf_exp": ${KEY_ZIPF_EXP},
+    "pipeline": ${5},
+    "clients": ${6},
+    "threads": ${7}
+}
+EOF
+}
+
+# From the REDIS_CPU_NUMA_NODE (-C), MEMTIER_NUMA_NODE (-S) and memory node arguments,
+# determine what cpusets and memory nodes every instance uses
 # args: none
-# return: none
+# return: 0=success, 1=error
 function extract_cpu_and_mem_nodes()
 {
-    REDIS_SERVER_CPU=$( grep "^NUMA node${REDIS_CPU_NUMA_NODE}" ${OUTPUT_PATH}/lscpu.log | tr -d ' ' | cut -d ':' -f 2)
-    MEMTIER_CLIENT_CPU=$( grep "^NUMA node${MEMTIER_NUMA_NODE}" ${OUTPUT_PATH}/lscpu.log | tr -d ' ' | cut -d ':' -f 2)
+    local k
+    local mem_nodes=()
+
+    if [ -n "${INSTANCE_MEM_NUMA_NODES}" ]; then
+        IFS=',' read -ra mem_nodes <<< "${INSTANCE_MEM_NUMA_NODES}"
+    fi
+
+    for (( k=0; k<DOCKER_INSTANCES; k++ )); do
+        if ! REDIS_SERVER_CPUS[k]=$( instance_cpuset ${REDIS_CPU_NUMA_NODE} ${k} ) ||
+           ! MEMTIER_CLIENT_CPUS[k]=$( instance_cpuset ${MEMTIER_NUMA_NODE} ${k} ); then
+            error_msg "NUMA nodes ${REDIS_CPU_NUMA_NODE} and ${MEMTIER_NUMA_NODE} need at least ${DOCKER_INSTANCES} cores each"
+            return 1
+        fi
+
+        if [ ${#mem_nodes[@]} -gt 0 ]; then
+            REDIS_MEM_NODES[k]=${mem_nodes[$(( k % ${#mem_nodes[@]} ))]}
+        else
+            REDIS_MEM_NODES[k]=${REDIS_MEM_NUMA_NODE}
+        fi
+
+        info_msg "Instance ${k}: redis-server CPUs ${REDIS_SERVER_CPUS[k]}, memory node(s) ${REDIS_MEM_NODES[k]}, memtier CPUs ${MEMTIER_CLIENT_CPUS[k]}"
+    done
+    return 0
 }
 
 # Create the docker network
@@ -174,49 +305,81 @@ function delete_network()
 
 function start_servers()
 {
-    info_msg "Start redis server instance"
-
-    docker run -d --rm --network ${DOCKER_NETWORK_NAME}           \
-               --cpuset-cpus=${REDIS_SERVER_CPU}                  \
-               --cpuset-mems=${REDIS_MEM_NUMA_NODE}               \
-               -p 6379:${REDIS_START_PORT}                        \
-               --name  ${REDIS_SERVER_NAME}                       \
-               ${REDIS_DOCKER_IMAGE}                              \
-                 redis-server                                     \
-                   --maxmemory ${REDIS_MAX_MEMORY}gb              \
-                   --maxmemory-policy ${REDIS_REPLACEMENT_POLICY} \
-                   --save ""
+    local k
+    local retcode=0
+    info_msg "Start ${DOCKER_INSTANCES} redis server instance(s)"
+
+    for (( k=0; k<DOCKER_INSTANCES; k++ )); do
+        docker run -d --rm --network ${DOCKER_NETWORK_NAME}           \
+                   --cpuset-cpus=${REDIS_SERVER_CPUS[k]}              \
+                   --cpuset-mems=${REDIS_MEM_NODES[k]}                \
+                   -p $(( REDIS_START_PORT + k )):${REDIS_PORT}       \
+                   --name  ${REDIS_SERVER_NAME}_${k}                  \
+                   ${REDIS_DOCKER_IMAGE}                              \
+                     redis-server                                     \
+                       --maxmemory ${REDIS_MAX_MEMORY}gb              \
+                       --maxmemory-policy ${REDIS_REPLACEMENT_POLICY} \
+                       --save "" > /dev/null
+
+        if [ $? -ne 0 ]; then
+            error_msg "Failed to start redis-server instance ${k}"
+            retcode=1
+        fi
+    done
 
-    local retcode=$?
     info_msg "Wait 5 seconds for all the instances to spin up"
     sleep 5
 
-    if [ ${retcode} -ne 0 ]; then
-        error_msg "Failed to start redis-server"
-    else
-        info_msg "Done starting server instance"
+    if [ ${retcode} -eq 0 ]; then
+        info_msg "Done starting server instance(s)"
     fi
     return ${retcode}
 }
 
 function stop_servers()
 {
-    info_msg "Stopping server instance"
+    local k
+    local retcode=0
+    info_msg "Stopping server instance(s)"
+
+    for (( k=0; k<DOCKER_INSTANCES; k++ )); do
+        if ! docker stop ${REDIS_SERVER_NAME}_${k} > /dev/null 2>&1; then
+            error_msg "Failed to stop redis-server instance ${k}"
+            retcode=1
+        fi
+    done
 
-    docker stop ${REDIS_SERVER_NAME} > /dev/null 2>&1
-    if [ $? -ne 0 ]; then
-        error_msg "Failed to stop the redis-server"
-        return 1
-    else
+    if [ ${retcode} -eq 0 ]; then
         sleep 5
-        info_msg "Done stopping server instance"
+        info_msg "Done stopping server instance(s)"
     fi
-    # The memtier container is set up to exit on completion,
-    # Leaving the stop code here in case we decide to use a
-    # async exit model.
-    # docker stop ${MEMTIER_CLIENT_NAME} > /dev/null 2>&1
+    return ${retcode}
+}
 
-    return 0
+# The memtier containers exit on completion, this is only needed when aborting a run
+function stop_clients()
+{
+    local k
+
+    for (( k=0; k<DOCKER_INSTANCES; k++ )); do
+        docker stop ${MEMTIER_CLIENT_NAME}_${k} > /dev/null 2>&1
+    done
+}
+
+# Wait for every memtier container started in the background
+# args: the PIDs of the docker run commands
+# return: 0=all succeeded, 1=at least one failed
+function wait_clients()
+{
+    local pid
+    local retcode=0
+
+    for pid in "$@"; do
+        if ! wait ${pid}; then
+            retcode=1
+        fi
+    done
+    return ${retcode}
 }
 
 NUMASTAT_PID=
@@ -224,7 +387,7 @@ function start_numastat()
 {
     local outfile=${1}
     info_msg "Start numastat"
-    ${SCRIPTDIR}/utils/collect-numastat.sh ${1} &
+    python3 ${SCRIPTDIR}/utils/collect_numastat.py --interval ${NUMASTAT_INTERVAL} ${outfile} &
     NUMASTAT_PID=$!
     disown ${NUMASTAT_PID}
 }
@@ -232,7 +395,11 @@ function start_numastat()
 function stop_numastat()
 {
     info_msg "Stop numastat"
-    kill -9 ${NUMASTAT_PID}
+    # SIGTERM lets the collector flush its last samples
+    kill ${NUMASTAT_PID} > /dev/null 2>&1
+    while kill -0 ${NUMASTAT_PID} > /dev/null 2>&1; do
+        sleep 0.1
+    done
 }
 
 function set_output_path()
@@ -260,30 +427,41 @@ function warmup_database()
 
     local data_size=${1}
     local data_size_in_digits=$( convert_to_number ${data_size} )
-    info_msg "Start database warmup for data size '${data_size}"
-    REDIS_PORT=${REDIS_START_PORT}
-
-    docker run --rm  --network ${DOCKER_NETWORK_NAME}  \
-               --cpuset-cpus=${MEMTIER_CLIENT_CPU}     \
-               --name ${MEMTIER_CLIENT_NAME}           \
-               ${MEMTIER_DOCKER_IMAGE}                 \
-      memtier_benchmark                                \
-          --test-time=${WARM_DB_RUN_TIME}              \
-          --select-db=0                                \
-          -n allkeys                                   \
-          --key-maximum=30000000                       \
-          --data-size=${data_size_in_digits}           \
-          --key-pattern=R:R                            \
-          --ratio=1:0                                  \
-          --pipeline=64                                \
-          --random-data                                \
-          --distinct-client-seed                       \
-          --randomize                                  \
-          --expiry-range=10-100                        \
-          --print-percentiles "50,95,99,99.9"          \
-          --port  ${REDIS_PORT}                        \
-          --server ${REDIS_SERVER_NAME} > ${OUTPUT_PATH}/${data_size}_warmup.log
+    local key_maximum=${2}
+    local k
+    local prefix
+    local pids=()
+    info_msg "Start database warmup for data size '${data_size}' and ${key_maximum} keys"
+
+    for (( k=0; k<DOCKER_INSTANCES; k++ )); do
+        prefix=$( instance_prefix ${data_size} ${k} )
+        if [ ${#KEY_MAXIMUM_ARRAY[@]} -gt 1 ]; then
+            prefix+="_keys${key_maximum}"
+        fi
+        docker run --rm  --network ${DOCKER_NETWORK_NAME}  \
+                   --cpuset-cpus=${MEMTIER_CLIENT_CPUS[k]} \
+                   --name ${MEMTIER_CLIENT_NAME}_${k}      \
+                   ${MEMTIER_DOCKER_IMAGE}                 \
+          memtier_benchmark                                \
+              --test-time=${WARM_DB_RUN_TIME}              \
+              --select-db=0                                \
+              -n allkeys                                   \
+              --key-maximum=${key_maximum}                 \
+              --data-size=${data_size_in_digits}           \
+              --key-pattern=R:R                            \
+              --ratio=1:0                                  \
+              --pipeline=64                                \
+              --random-data                                \
+              --distinct-client-seed                       \
+              --randomize                                  \
+              --expiry-range=10-100                        \
+              --print-percentiles "50,95,99,99.9"          \
+              --port  ${REDIS_PORT}                        \
+              --server ${REDIS_SERVER_NAME}_${k} > ${OUTPUT_PATH}/${prefix}_warmup.log &
+        pids+=($!)
+    done
 
+    wait_clients "${pids[@]}"
     local retcode=$?
     if [ ${retcode} -ne 0 ]; then
         error_msg "Failed database warmup for data size '${data_size}'"
@@ -297,39 +475,71 @@ function run_benchmark()
 {
     local data_size=${1}
     local data_size_in_digits=$( convert_to_number ${data_size} )
-    info_msg "Start benchmark run for data size '${data_size}'"
-    REDIS_PORT=${REDIS_START_PORT}
+    local key_maximum=${2}
+    local key_pattern=${3}
+    local ratio=${4}
+    local pipeline=${5}
+    local clients=${6}
+    local threads=${7}
+    local k
+    local prefix
+    local pids=()
+    local pattern_opts=()
+    local results_path=$( sweep_point_path ${key_maximum} ${key_pattern} ${ratio} ${pipeline} ${clients} ${threads} )
+    info_msg "Start benchmark run for data size '${data_size}', key pattern ${key_pattern}, ${key_maximum} keys and set:get ${ratio}"
+    info_msg "  pipeline ${pipeline}, ${clients} clients x ${threads} threads"
+
+    write_sweep_parameters ${results_path} ${key_maximum} ${key_pattern} ${ratio} ${pipeline} ${clients} ${threads}
+    if [[ ${key_pattern} == *G* && -n ${KEY_STDDEV} ]]; then
+        pattern_opts+=(--key-stddev=${KEY_STDDEV})
+    fi
+    if [[ ${key_pattern} == *Z* ]]; then
+        pattern_opts+=(--key-zipf-exp=${KEY_ZIPF_EXP})
+    fi
 
     # Start the performance monitors
-    DSTATFILE=${OUTPUT_PATH}/${data_size}_dstat.csv
-    dstat -c -m --io --output ${DSTATFILE} &> /dev/null &
+    DSTATFILE=${results_path}/${data_size}_dstat.csv
+    dstat -T -c -m --io --output ${DSTATFILE} &> /dev/null &
     DSTAT_PID=$!
-    NUMASTATFILE=${OUTPUT_PATH}/${data_size}_numastat.csv
+    NUMASTATFILE=${results_path}/${data_size}_numastat.csv
     start_numastat ${NUMASTATFILE}
 
-    docker run --rm --network ${DOCKER_NETWORK_NAME} \
-               --cpuset-cpus=${MEMTIER_CLIENT_CPU}   \
-               --name ${MEMTIER_CLIENT_NAME}         \
-               ${MEMTIER_DOCKER_IMAGE}               \
-                memtier_benchmark                    \
-                 --test-time=${TEST_RUN_TIME}        \
-                 --select-db=0                       \
-                 -n allkeys                          \
-                 --key-maximum=30000000              \
-                 --data-size=${data_size_in_digits}  \
-                 --key-pattern=R:R                   \
-                 --ratio=1:10                        \
-                 --wait-ratio=10:1                   \
-                 --pipeline=64                       \
-                 --random-data                       \
-                 --distinct-client-seed              \
-                 --randomize                         \
-                 --expiry-range=10-100               \
-                 --print-percentiles "50,95,99,99.9" \
-                 --port  ${REDIS_PORT}               \
-                 --server ${REDIS_SERVER_NAME} > ${OUTPUT_PATH}/${data_size}_bench.log
-
+    # The HDR histograms are written to the results directory, mounted at /results.
+    # All the instances are started together, so they load the host at the same time.
+    for (( k=0; k<DOCKER_INSTANCES; k++ )); do
+        prefix=$( instance_prefix ${data_size} ${k} )
+        docker run --rm --network ${DOCKER_NETWORK_NAME} \
+                   --cpuset-cpus=${MEMTIER_CLIENT_CPUS[k]} \
+                   --name ${MEMTIER_CLIENT_NAME}_${k}    \
+                   --user $(id -u):$(id -g)              \
+                   -v ${results_path}:/results           \
+                   ${MEMTIER_DOCKER_IMAGE}               \
+                    memtier_benchmark                    \
+                     --test-time=${TEST_RUN_TIME}        \
+                     --select-db=0                       \
+                     -n allkeys                          \
+                     --key-maximum=${key_maximum}        \
+                     --data-size=${data_size_in_digits}  \
+                     --key-pattern=${key_pattern}        \
+                     "${pattern_opts[@]}"                \
+                     --ratio=${ratio}                    \
+                     --wait-ratio=10:1                   \
+                     --pipeline=${pipeline}              \
+                     --clients=${clients}                \
+                     --threads=${threads}                \
+                     --random-data                       \
+                     --distinct-client-seed              \
+                     --randomize                         \
+                     --expiry-range=10-100               \
+                     --print-percentiles "50,95,99,99.9" \
+                     --hdr-file-prefix=/results/${prefix}_hdr \
+                     --json-out-file=/results/${prefix}_bench.json \
+                     --port  ${REDIS_PORT}               \
+                     --server ${REDIS_SERVER_NAME}_${k} > ${results_path}/${prefix}_bench.log &
+        pids+=($!)
+    done
 
+    wait_clients "${pids[@]}"
     local retcode=$?
     if [ ${retcode} -ne 0 ]; then
         error_msg "Failed benchmark run for data size '${data_size}'"
@@ -358,7 +568,7 @@ fi
 auto_detect_terminal_colors
 
 # Process the command line arguments
-while getopts 'C:e:?hi:M:o:p:r:s:S:w:' opt; do
+while getopts 'c:C:D:e:g:?hi:k:K:m:M:n:o:p:P:r:s:S:t:w:Z:' opt; do
     case "$opt" in
         ## Experiment Options
         e)
@@ -383,6 +593,34 @@ while getopts 'C:e:?hi:M:o:p:r:s:S:w:' opt; do
         p)
             REDIS_REPLACEMENT_POLICY=${OPTARG}
             ;;
+        n)
+            NUMASTAT_INTERVAL=${OPTARG}
+            ;;
+        ## Sweep Options
+        K)
+            KEY_PATTERNS=${OPTARG}
+            ;;
+        k)
+            KEY_MAXIMUMS=${OPTARG}
+            ;;
+        g)
+            SET_GET_RATIOS=${OPTARG}
+            ;;
+        D)
+            KEY_STDDEV=${OPTARG}
+            ;;
+        Z)
+            KEY_ZIPF_EXP=${OPTARG}
+            ;;
+        P)
+            PIPELINES=${OPTARG}
+            ;;
+        c)
+            CLIENTS=${OPTARG}
+            ;;
+        t)
+            THREADS=${OPTARG}
+            ;;
         ## Machine Configuration Options
         C)
             REDIS_CPU_NUMA_NODE=${OPTARG}
@@ -390,6 +628,9 @@ while getopts 'C:e:?hi:M:o:p:r:s:S:w:' opt; do
         M)
             REDIS_MEM_NUMA_NODE=${OPTARG}
             ;;
+        m)
+            INSTANCE_MEM_NUMA_NODES=${OPTARG}
+            ;;
         S)
             MEMTIER_NUMA_NODE=${OPTARG}
             ;;
@@ -446,6 +687,38 @@ then
     exit 1
 fi
 
+if ! [[ "${DOCKER_INSTANCES}" =~ ^[1-9][0-9]*$ ]];
+then
+    error_msg "The number of instances (-i) must be a positive integer"
+    print_usage
+    exit 1
+fi
+
+IFS=',' read -ra KEY_PATTERN_ARRAY <<< "${KEY_PATTERNS}"
+IFS=',' read -ra KEY_MAXIMUM_ARRAY <<< "${KEY_MAXIMUMS}"
+IFS=',' read -ra RATIO_ARRAY <<< "${SET_GET_RATIOS}"
+IFS=',' read -ra PIPELINE_ARRAY <<< "${PIPELINES}"
+IFS=',' read -ra CLIENTS_ARRAY <<< "${CLIENTS}"
+IFS=',' read -ra THREADS_ARRAY <<< "${THREADS}"
+SWEEP_POINTS=$(( ${#KEY_PATTERN_ARRAY[@]} * ${#KEY_MAXIMUM_ARRAY[@]} * ${#RATIO_ARRAY[@]} *
+                 ${#PIPELINE_ARRAY[@]} * ${#CLIENTS_ARRAY[@]} * ${#THREADS_ARRAY[@]} ))
+
+for count in "${PIPELINE_ARRAY[@]}" "${CLIENTS_ARRAY[@]}" "${THREADS_ARRAY[@]}"; do
+    if ! [[ "${count}" =~ ^[1-9][0-9]*$ ]]; then
+        error_msg "Pipeline depths (-P), clients (-c) and threads (-t) must be positive integers, not '${count}'"
+        print_usage
+        exit 1
+    fi
+done
+
+for pattern in "${KEY_PATTERN_ARRAY[@]}"; do
+    if ! [[ "${pattern}" =~ ^[RGSPZ]:[RGSPZ]$ ]]; then
+        error_msg "Unknown key pattern '${pattern}' (-K), expected <set>:<get> of R, G, S, P or Z"
+        print_usage
+        exit 1
+    fi
+done
+
 if [[ ${TEST_RUN_TIME} -eq 0 &&  ${WARM_DB_RUN_TIME} -eq 0 ]];
 then
     error_msg "-w and -r are set to 0; Benchmark will not be run"
@@ -486,15 +759,32 @@ if [ $? -ne 0 ]; then
     exit 1
 fi
 
-extract_cpu_and_mem_nodes
+if ! extract_cpu_and_mem_nodes; then
+    delete_network
+    exit 1
+fi
 
 for i in $(seq 0 $((length - 1))); do
     info_msg "Start run for Data Size ${NAME_ARRAY[${i}]}"
 
-    start_servers
-    warmup_database ${NAME_ARRAY[${i}]}
-    run_benchmark ${NAME_ARRAY[${i}]}
-    stop_servers
+    # Every key space size starts from a freshly warmed database, the other sweep
+    # points of a key space size share it
+    for key_maximum in "${KEY_MAXIMUM_ARRAY[@]}"; do
+        start_servers
+        warmup_database ${NAME_ARRAY[${i}]} ${key_maximum}
+        for key_pattern in "${KEY_PATTERN_ARRAY[@]}"; do
+        for ratio in "${RATIO_ARRAY[@]}"; do
+        for pipeline in "${PIPELINE_ARRAY[@]}"; do
+        for clients in "${CLIENTS_ARRAY[@]}"; do
+        for threads in "${THREADS_ARRAY[@]}"; do
+            run_benchmark ${NAME_ARRAY[${i}]} ${key_maximum} ${key_pattern} ${ratio} ${pipeline} ${clients} ${threads}
+        done
+        done
+        done
+        done
+        done
+        stop_servers
+    done
 
     info_msg "End run for ${NAME_ARRAY[${i}]}"
 done
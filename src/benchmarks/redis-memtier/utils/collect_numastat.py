@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+#
+# Samples the MemUsed of every NUMA node into a CSV file until it receives
+# SIGTERM or SIGINT, the same numbers `numastat -m` reports in its MemUsed row.
+#
+# The node meminfo files are opened once and re-read with os.pread, so no
+# process is forked per sample and intervals down to 100ms are cheap.
+#
+# Output (MemUsed in MB, Time in seconds since the epoch):
+#   Time,Node0,Node1,...
+
+import argparse
+import os
+from pathlib import Path
+import re
+import signal
+import threading
+import time
+
+NODE_SYSFS = Path("/sys/devices/system/node")
+
+MEM_USED = re.compile(rb"MemUsed:\s+(\d+) kB")
+
+# A node meminfo is ~1.5 KiB
+READ_SIZE = 8192
+
+
+def open_nodes(root: Path = NODE_SYSFS) -> dict[int, int]:
+    """File descriptors of every node's meminfo, by node id."""
+    nodes = {}
+
+    for node_dir in root.glob("node[0-9]*"):
+        nodes[int(node_dir.name.removeprefix("node"))] = os.open(
+            node_dir / "meminfo", os.O_RDONLY
+        )
+
+    return dict(sorted(nodes.items()))
+
+
+def mem_used_mb(fd: int) -> float:
+    match = MEM_USED.search(os.pread(fd, READ_SIZE, 0))
+    return int(match.group(1)) / 1024 if match else 0.0
+
+
+def collect(output_file: str, interval: float) -> None:
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    nodes = open_nodes()
+
+    print(f"[INFO] Start monitoring MemUsed of {len(nodes)} NUMA node(s) every {interval}s")
+
+    # Flush about once a second rather than on every sample
+    flush_every = max(1, round(1 / interval))
+    samples = 0
+
+    with open(output_file, "w") as f:
+        f.write(",".join(["Time", *[f"Node{n}" for n in nodes]]) + "\n")
+
+        next_sample = time.monotonic()
+
+        while True:
+            values = [f"{mem_used_mb(fd):.2f}" for fd in nodes.values()]
+            f.write(",".join([f"{time.time():.3f}", *values]) + "\n")
+
+            samples += 1
+            if samples % flush_every == 0:
+                f.flush()
+
+            # Keep to the interval's grid instead of drifting by the sample time
+            next_sample += interval
+            if stop.wait(max(0.0, next_sample - time.monotonic())):
+                break
+
+    for fd in nodes.values():
+        os.close(fd)
+
+    print(f"[INFO] Stopped monitoring NUMA MemUsed after {samples} samples")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Record the MemUsed of every NUMA node until SIGTERM/SIGINT"
+    )
+
+    parser.add_argument("output_file", help="The CSV file to write")
+
+    parser.add_argument(
+        "-i",
+        "--interval",
+        type=float,
+        required=False,
+        default=1.0,
+        help="Seconds between two samples, down to 0.1",
+    )
+
+    args = parser.parse_args()
+
+    if args.interval < 0.1:
+        parser.error("the interval can't be below 0.1s")
+
+    collect(args.output_file, args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,52 +1,187 @@
-#!/usr/bin/python3
-
-f = open("results.txt","r");
-lines = f.readlines();
-f.close()
-
-header = ""
-
-wall = []
-results = {
-        "SET" : [],
-        "GET" : [],
-        "LPUSH" :  [],
-        "LPUSH_LRANGE" : [],
-        "LRANGE_100" : [],
-        }
-
-for line in lines:
-    if not line:
-        continue
-    sline = line.split(",")
-    if sline[0] == 'redis':
-        wall.append(line)
-    elif "test" in sline[0]:
-        header = line
-    elif "SET" in sline[0]:
-        results["SET"].append(wall[-1].split(",")[1]+","+line)
-    elif "GET" in sline[0]:
-        results["GET"].append(wall[-1].split(",")[1]+","+line)
-    elif "LPUSH" in sline[0]:
-        results["LPUSH"].append(wall[-1].split(",")[1]+","+line)
-    elif "benchmark" in sline[0]:
-        results["LPUSH_LRANGE"].append(wall[-1].split(",")[1]+","+line)
-    elif "LRANGE_100" in sline[0]:
-        results["LRANGE_100"].append(wall[-1].split(",")[1]+","+line)
-
-out = "program,settings,wall time\n"
-header = "settings,"+header
-
-for line in wall:
-    out += line
-
-for k in results:
-    out += header
-    for v in results[k]:
-        out += v
-
-f = open("results.csv", "w")
-f.write(out)
-f.flush()
-f.close()
+#!/usr/bin/env python3
+"""
+Redis Benchmark Results Parser (parse_results.py)
 
+Parses the results file run.sh appends every run to and normalizes it into:
+  - JSON (primary) — every run with its note, wall time and per test results
+  - CSV (secondary) — one row per run and test, for charting
+
+Results file format, repeated for every run.sh invocation:
+  redis,"<note>",<wall time in seconds>
+  "test","rps","avg_latency_ms","min_latency_ms","p50_latency_ms",...   (redis-benchmark >= 6)
+  "SET","86956.52","0.311","0.104","0.303",...
+  "LRANGE_100 (first 100 elements)","41493.78","0.655",...
+
+Older redis-benchmark versions print no header and only "<test>","<rps>". Any
+test name is accepted, so tests selected with -t or added by newer versions
+need no changes here. Raw redis-benchmark --csv output without the run.sh
+lines is parsed as a single unnamed run.
+
+Usage:
+    python3 parse_results.py [results.txt] [-o <output_dir>]
+
+JSON output:  results_redis.json
+CSV output:   results_redis.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+from datetime import datetime, timezone
+
+# redis-benchmark CSV columns and their CSV output labels, anything else is kept as is
+COLUMN_LABELS = {
+    "rps": "Requests/s",
+    "avg_latency_ms": "Avg Latency (ms)",
+    "min_latency_ms": "Min Latency (ms)",
+    "p50_latency_ms": "P50 Latency (ms)",
+    "p95_latency_ms": "P95 Latency (ms)",
+    "p99_latency_ms": "P99 Latency (ms)",
+    "max_latency_ms": "Max Latency (ms)",
+}
+
+# Columns of the pre-6 output, which has no header
+LEGACY_COLUMNS = ["test", "rps"]
+
+
+def log(msg):
+    print(f"[PARSER] {msg}")
+
+
+def _safe_float(val, default=None):
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return default
+
+
+# =============================================================================
+# Parse the results file
+# =============================================================================
+
+def parse_runs(lines, errors):
+    """
+    Yield every run of the results file as soon as it ends, so the file is read
+    line by line however many runs it holds.
+    """
+    run = None
+    columns = LEGACY_COLUMNS
+
+    for line_number, row in enumerate(csv.reader(lines), start=1):
+        if not row or not row[0].strip():
+            continue
+
+        # run.sh wall time line, the start of a new run
+        if row[0] == "redis":
+            if run:
+                yield run
+            run = {
+                "run": run["run"] + 1 if run else 1,
+                "note": row[1] if len(row) > 1 else "",
+                "wall_time_s": _safe_float(row[2]) if len(row) > 2 else None,
+                "tests": [],
+            }
+            columns = LEGACY_COLUMNS
+            continue
+
+        if row[0] == "test":
+            columns = [col.strip() for col in row]
+            continue
+
+        if run is None:
+            run = {"run": 1, "note": "", "wall_time_s": None, "tests": []}
+
+        values = [_safe_float(value) for value in row[1:]]
+        if len(row) != len(columns) or None in values:
+            errors.append({"line": line_number, "error": f"unexpected row: {','.join(row)}"})
+            continue
+
+        test = {"test": row[0], "command": row[0].split()[0]}
+        test.update(zip(columns[1:], values))
+        run["tests"].append(test)
+
+    if run:
+        yield run
+
+
+# =============================================================================
+# CSV writer
+# =============================================================================
+
+def write_results_csv(path, runs):
+    """One row per run and test, with every column any run reported."""
+    columns = list(dict.fromkeys(
+        key for run in runs for test in run["tests"] for key in test if key not in ("test", "command")
+    ))
+    fieldnames = ["Run", "Test Note", "Wall Time (s)", "Test", "Command",
+                  *(COLUMN_LABELS.get(col, col) for col in columns)]
+
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, restval="")
+        writer.writeheader()
+        for run in runs:
+            for test in run["tests"]:
+                row = {
+                    "Run": run["run"],
+                    "Test Note": run["note"],
+                    "Wall Time (s)": run["wall_time_s"] if run["wall_time_s"] is not None else "",
+                    "Test": test["test"],
+                    "Command": test["command"],
+                }
+                row.update((COLUMN_LABELS.get(col, col), test[col]) for col in columns if col in test)
+                writer.writerow(row)
+    log(f"Wrote CSV: {path}")
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse the redis-benchmark results of run.sh into JSON and CSV")
+    parser.add_argument("input", nargs="?", default="results.txt",
+                        help="The results file run.sh appended to: Default results.txt")
+    parser.add_argument("-o", "--output-dir",
+                        help="Where to write results_redis.json/.csv: Default next to the input")
+    args = parser.parse_args()
+
+    output_dir = args.output_dir or os.path.dirname(os.path.abspath(args.input))
+    os.makedirs(output_dir, exist_ok=True)
+    log(f"Parsing redis-benchmark results from: {args.input}")
+
+    errors = []
+    if os.path.isfile(args.input):
+        with open(args.input, newline="") as f:
+            runs = list(parse_runs(f, errors))
+    else:
+        log(f"WARNING: {args.input} not found")
+        errors.append({"error": f"{args.input} not found"})
+        runs = []
+
+    for error in errors:
+        log(f"WARNING: line {error.get('line', '-')}: {error['error']}")
+    log(f"Runs: {len(runs)}, tests: {sum(len(run['tests']) for run in runs)}")
+
+    # ----- Write JSON (primary output) -----
+    json_output = {
+        "benchmark": "redis",
+        "parser_version": "2.0.0",
+        "timestamp_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "source_file": os.path.basename(args.input),
+        "runs": runs,
+        "errors": errors if errors else None,
+    }
+
+    json_path = os.path.join(output_dir, "results_redis.json")
+    with open(json_path, "w") as f:
+        json.dump(json_output, f, indent=2)
+    log(f"Wrote JSON: {json_path}")
+
+    # ----- Write CSV (for charting) -----
+    if runs:
+        write_results_csv(os.path.join(output_dir, "results_redis.csv"), runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import ctypes
+import ctypes.util
+import os
+import sys
+import time
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from graph_scripts.utils import node_cpus
+
+# 3 arrays of 256 MiB, well past any last level cache
+ARRAY_SIZE = 2**25
+
+SCALAR = 3.0
+
+# Triad's c * SCALAR goes through a scratch block of this many elements
+# (256 KiB) that stays in cache, so only a, b and c move through memory
+TRIAD_BLOCK = 2**15
+
+# Bytes STREAM counts per element for every kernel
+KERNEL_BYTES = {"Copy": 2, "Scale": 2, "Add": 3, "Triad": 3}
+
+
+class NodeBuffers:
+    """
+    The a/b/c arrays of STREAM, allocated with libnuma directly on one node
+    so the probe doesn't depend on the memory policy it was started with.
+    """
+
+    def __init__(self, node: int, size: int):
+        libnuma = ctypes.util.find_library("numa")
+
+        if libnuma is None:
+            raise RuntimeError("libnuma was not found, install numactl-devel/libnuma-dev")
+
+        self._numa = ctypes.CDLL(libnuma)
+        self._numa.numa_alloc_onnode.restype = ctypes.c_void_p
+        self._numa.numa_alloc_onnode.argtypes = [ctypes.c_size_t, ctypes.c_int]
+        self._numa.numa_free.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+
+        if self._numa.numa_available() < 0:
+            raise RuntimeError("NUMA is not available on this system")
+
+        self._nbytes = size * np.dtype(np.float64).itemsize
+        self._pointers = []
+
+        self.a, self.b, self.c = (self._alloc(node, size) for _ in range(3))
+
+    def _alloc(self, node: int, size: int) -> np.ndarray:
+        pointer = self._numa.numa_alloc_onnode(self._nbytes, node)
+
+        if not pointer:
+            self.free()
+            raise MemoryError(f"Could not allocate {self._nbytes} bytes on node {node}")
+
+        self._pointers.append(pointer)
+        return np.ctypeslib.as_array((ctypes.c_double * size).from_address(pointer))
+
+    def free(self) -> None:
+        for pointer in self._pointers:
+            self._numa.numa_free(pointer, self._nbytes)
+        self._pointers.clear()
+
+
+def kernels(buffers: NodeBuffers) -> dict[str, Callable[[slice], None]]:
+    a, b, c = buffers.a, buffers.b, buffers.c
+
+    def triad(s: slice) -> None:
+        scratch = np.empty(TRIAD_BLOCK)
+
+        for lo in range(s.start, s.stop, TRIAD_BLOCK):
+            hi = min(lo + TRIAD_BLOCK, s.stop)
+            tmp = scratch[: hi - lo]
+            np.multiply(c[lo:hi], SCALAR, out=tmp)
+            np.add(b[lo:hi], tmp, out=a[lo:hi])
+
+    return {
+        "Copy": lambda s: np.copyto(c[s], a[s]),
+        "Scale": lambda s: np.multiply(c[s], SCALAR, out=b[s]),
+        "Add": lambda s: np.add(a[s], b[s], out=c[s]),
+        "Triad": triad,
+    }
+
+
+def probe_node(
+    node: int, threads: int, size: int = ARRAY_SIZE, ntimes: int = 5
+) -> dict[str, float]:
+    """
+    Best GB/s of every kernel on arrays placed on the node. NumPy releases the
+    GIL inside ufuncs, so each thread works on its own chunk of the arrays.
+    """
+    buffers = NodeBuffers(node, size)
+
+    try:
+        # Touch every page, STREAM does the same before timing
+        buffers.a.fill(1.0)
+        buffers.b.fill(2.0)
+        buffers.c.fill(0.0)
+
+        bounds = np.linspace(0, size, threads + 1, dtype=int)
+        chunks = [slice(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+        best: dict[str, float] = {}
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for _ in range(ntimes):
+                for name, kernel in kernels(buffers).items():
+                    start = time.perf_counter()
+                    list(pool.map(kernel, chunks))
+                    elapsed = time.perf_counter() - start
+
+                    rate = KERNEL_BYTES[name] * buffers.a.nbytes / elapsed / 1e9
+                    best[name] = max(best.get(name, 0.0), rate)
+
+        return best
+    finally:
+        buffers.free()
+
+
+def probe_nodes(
+    nodes: list[int], cpu: int, threads: int, size: int = ARRAY_SIZE, ntimes: int = 5
+) -> pd.DataFrame:
+    # Run from the CPUs of one node, like numactl --cpunodebind in the sweeps
+    affinity = os.sched_getaffinity(0)
+    os.sched_setaffinity(0, node_cpus(cpu))
+
+    try:
+        rows = [
+            {"Node": node, "Function": name, "GBs": round(rate, 2)}
+            for node in nodes
+            for name, rate in probe_node(node, threads, size, ntimes).items()
+        ]
+    finally:
+        os.sched_setaffinity(0, affinity)
+
+    return pd.DataFrame(rows)
+
+
+def probe_table(results: pd.DataFrame) -> str:
+    table = results.pivot(index="Function", columns="Node", values="GBs")
+    return table.reindex(list(KERNEL_BYTES)).to_string()
+
+
+# "0=200,2=60"
+def expected_bandwidth(value: str) -> dict[int, float]:
+    expected: dict[int, float] = {}
+
+    for pair in value.split(","):
+        node, sep, rate = pair.partition("=")
+
+        try:
+            expected[int(node)] = float(rate)
+        except ValueError:
+            sep = ""
+
+        if not sep:
+            raise argparse.ArgumentTypeError(f"'{pair}' is not of the form <node>=<GB/s>")
+
+    return expected
+
+
+def check_bandwidth(
+    results: pd.DataFrame,
+    expected: dict[int, float],
+    min_ratio: float,
+    function: str = "Triad",
+) -> list[str]:
+    """
+    One message for every node whose bandwidth is below min_ratio of what
+    it is expected to reach, empty when they all are fine.
+    """
+    rates = results[results["Function"] == function].set_index("Node")["GBs"]
+
+    return [
+        (
+            f"node {node}: {function} {rates[node]:.1f} GB/s is below "
+            f"{min_ratio:.0%} of the expected {rate:.1f} GB/s"
+        )
+        for node, rate in expected.items()
+        if node in rates and rates[node] < min_ratio * rate
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Quick STREAM-like bandwidth probe with NumPy, to check node "
+            "bindings and bandwidth before a long sweep"
+        )
+    )
+
+    parser.add_argument(
+        "-n",
+        "--numa-nodes",
+        type=int,
+        nargs="+",
+        required=True,
+        help="The nodes to allocate the arrays on, one probe per node",
+    )
+
+    parser.add_argument(
+        "--cpu",
+        type=int,
+        required=False,
+        default=0,
+        help="The node whose CPUs run the probe",
+    )
+
+    parser.add_argument(
+        "-t",
+        "--threads",
+        type=int,
+        required=False,
+        default=8,
+        help="Threads copying the array chunks",
+    )
+
+    parser.add_argument(
+        "-s",
+        "--array-size",
+        type=int,
+        required=False,
+        default=ARRAY_SIZE,
+        help="Elements per array",
+    )
+
+    parser.add_argument(
+        "-r",
+        "--ntimes",
+        type=int,
+        required=False,
+        default=5,
+        help="How many times every kernel runs, the best run is reported",
+    )
+
+    parser.add_argument(
+        "-e",
+        "--expected",
+        type=expected_bandwidth,
+        required=False,
+        help="Expected Triad GB/s per node, e.g. 0=200,2=60",
+    )
+
+    parser.add_argument(
+        "--min-ratio",
+        type=float,
+        required=False,
+        default=0.5,
+        help="Fail when a node reaches less than this share of its expected bandwidth",
+    )
+
+    args = parser.parse_args()
+
+    start = time.time()
+    results = probe_nodes(
+        args.numa_nodes, args.cpu, args.threads, args.array_size, args.ntimes
+    )
+
+    print(probe_table(results))
+    print(f"\nProbed in {round(time.time() - start, 3)}s")
+
+    if args.expected and (failures := check_bandwidth(results, args.expected, args.min_ratio)):
+        print("\n".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,8 @@
 import argparse
 
 import humanize
-import pandas as pd
 
-from graph_scripts.utils import file_exists, remove_direction_column
+from graph_scripts.utils import file_exists, remove_direction_column, read_results
 
 
 def main() -> None:
@@ -19,13 +18,16 @@ def main() -> None:
 
     args = parser.parse_args()
 
-    df = remove_direction_column(pd.read_excel(args.csv_file))
+    df = remove_direction_column(read_results(args.csv_file))
+
+    # Sweeps over OpenMP placements get a best result per placement
+    placement = ["Placement"] if "Placement" in df.columns else []
 
     # Group by Array size, threads, then function,
     # and average the best rate of the grouping due to pure memory types
     # having 2 results for the same group of attributes previously mentioned
     df = (
-        df.groupby(["ArraySize", "Threads", "Function"])["BestRateMBs"]
+        df.groupby(["ArraySize", "Threads", "Function", *placement])["BestRateMBs"]
         .mean()
         .reset_index()
     )
@@ -34,10 +36,10 @@ def main() -> None:
     # columns "ArraySize" and "Threads", with with their headers
     if df.columns[0] != "ArraySize":
         df["ArraySize"], df["Threads"] = df["Threads"], df["ArraySize"]
-        df.columns = ["Threads", "ArraySize", "Function", "BestRateMBs"]
+        df.columns = ["Threads", "ArraySize", "Function", *placement, "BestRateMBs"]
 
     # Get the max bandwidth for each array size group
-    idx = df.groupby(["ArraySize"])["BestRateMBs"].idxmax()
+    idx = df.groupby(["ArraySize", *placement])["BestRateMBs"].idxmax()
     df = df.loc[idx]
 
     # Make the numbers readable by humans
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+import argparse
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+from graph_scripts.utils import file_exists, read_results, export_results
+
+KEY_COLUMNS = ["Threads", "ArraySize", "Function", "Direction", "Placement"]
+
+
+def load(
+    path: Path, functions: list[str] | None, array_sizes: list[int] | None
+) -> pd.DataFrame:
+    df = read_results(path, functions=functions, array_sizes=array_sizes)
+
+    # STREAM reports the best of its repetitions, AvgTime/MinTime tell how far
+    # a typical repetition was from it, i.e. how noisy that run was
+    df["Noise"] = ((df["AvgTime"] - df["MinTime"]) / df["AvgTime"]).clip(lower=0)
+
+    return df
+
+
+def summarize(df: pd.DataFrame, keys: list[str]) -> pd.DataFrame:
+    return df.groupby(keys, dropna=False).agg(
+        RateMBs=("BestRateMBs", "mean"), Noise=("Noise", "max")
+    )
+
+
+def compare(
+    baseline: pd.DataFrame,
+    candidate: pd.DataFrame,
+    keys: list[str],
+    threshold: float,
+    sigmas: float,
+) -> pd.DataFrame:
+    """
+    Relative change of every key from baseline to candidate.
+
+    A change only counts as significant when it is larger than `sigmas` times
+    the combined noise of both runs, and as a regression when it is also a
+    drop of more than `threshold`.
+    """
+    joined = summarize(baseline, keys).join(
+        summarize(candidate, keys), lsuffix="Baseline", rsuffix="Candidate", how="inner"
+    )
+
+    delta = joined["RateMBsCandidate"] / joined["RateMBsBaseline"] - 1
+    noise = np.hypot(joined["NoiseBaseline"], joined["NoiseCandidate"])
+
+    out = pd.DataFrame(
+        {
+            "BaselineMBs": joined["RateMBsBaseline"].round(1),
+            "CandidateMBs": joined["RateMBsCandidate"].round(1),
+            "Delta": delta.round(4),
+            "Noise": noise.round(4),
+        }
+    )
+    out["Significant"] = delta.abs() > sigmas * noise
+    out["Regression"] = out["Significant"] & (delta < -threshold)
+
+    return out.reset_index().sort_values("Delta", kind="stable")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare STREAM sweeps against a baseline and fail when any "
+            "(threads, array size, function, direction) regresses"
+        )
+    )
+
+    parser.add_argument(
+        "-b",
+        "--baseline",
+        type=file_exists,
+        required=True,
+        help="The reference results file, e.g. from before a BIOS/kernel change",
+    )
+
+    parser.add_argument(
+        "-c",
+        "--candidates",
+        type=file_exists,
+        nargs="+",
+        required=True,
+        help="Results files compared to the baseline, one after another",
+    )
+
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        required=False,
+        default=0.05,
+        help="Drop in bandwidth, as a fraction, that counts as a regression",
+    )
+
+    parser.add_argument(
+        "-s",
+        "--sigmas",
+        type=float,
+        required=False,
+        default=2.0,
+        help="How many times the runs' noise a change must exceed to be significant",
+    )
+
+    parser.add_argument(
+        "-a",
+        "--array-sizes",
+        type=int,
+        nargs="+",
+        required=False,
+        help="Only compare these array sizes",
+    )
+
+    parser.add_argument(
+        "-f",
+        "--functions",
+        type=str,
+        nargs="+",
+        required=False,
+        help="Only compare these functions",
+    )
+
+    parser.add_argument(
+        "-n",
+        "--top",
+        type=int,
+        required=False,
+        default=20,
+        help="How many of the largest drops to print per candidate",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        required=False,
+        help="Write the full comparison to this .csv or .xlsx file",
+    )
+
+    args = parser.parse_args()
+
+    baseline = load(args.baseline, args.functions, args.array_sizes)
+    tables = []
+
+    for path in args.candidates:
+        candidate = load(path, args.functions, args.array_sizes)
+
+        # Files from older runners lack Direction/Placement, align on what both have
+        keys = [
+            c for c in KEY_COLUMNS if c in baseline.columns and c in candidate.columns
+        ]
+
+        table = compare(baseline, candidate, keys, args.threshold, args.sigmas)
+        table.insert(0, "Candidate", path.name)
+        tables.append(table)
+
+        regressions = table[table["Regression"]]
+        unmatched = len(summarize(candidate, keys)) - len(table)
+
+        print(f"{path.name} vs {args.baseline.name}: {len(table)} matched", end="")
+        print(f", {unmatched} only in {path.name}" if unmatched else "", end="")
+        print(f", {len(regressions)} regression(s)")
+        print(table.head(args.top).drop(columns="Candidate").to_string(index=False))
+        print()
+
+    result = pd.concat(tables, ignore_index=True)
+
+    if args.output:
+        export_results(result, args.output)
+
+    if count := int(result["Regression"].sum()):
+        sys.exit(
+            f"{count} result(s) dropped more than {args.threshold:.0%} "
+            f"beyond {args.sigmas:g}x noise"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,7 @@
 
 import argparse
 
-import pandas as pd
-
-from graph_scripts.utils import file_exists
+from graph_scripts.utils import file_exists, read_results
 
 
 def main() -> None:
@@ -26,7 +24,7 @@ def main() -> None:
 
     args = parser.parse_args()
 
-    df = pd.read_excel(args.xlsx_file)
+    df = read_results(args.xlsx_file)
 
     df.to_csv(args.output, index=False)
 
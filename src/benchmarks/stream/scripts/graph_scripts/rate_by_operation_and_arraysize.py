@@ -3,14 +3,15 @@
 import argparse
 import os
 
-import matplotlib.pyplot as plt
-from matplotlib.ticker import FuncFormatter
-import pandas as pd
-
-from utils import file_exists, smooth_line, int_to_human, remove_direction_column
-
-# Supressing a warning that appears when more than 20 figures are opened
-plt.rcParams["figure.max_open_warning"] = 0
+from utils import (
+    file_exists,
+    int_to_human,
+    remove_direction_column,
+    read_results,
+    Chart,
+    Line,
+    render_charts,
+)
 
 
 def main() -> None:
@@ -64,6 +65,15 @@ def main() -> None:
         help="The main title of the graph",
     )
 
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        required=False,
+        default=1,
+        help="Number of processes to render the graphs with",
+    )
+
     args = parser.parse_args()
 
     directory = args.output_dir
@@ -71,54 +81,27 @@ def main() -> None:
     if not os.path.isdir(directory):
         os.makedirs(directory)
 
-    df = remove_direction_column(pd.read_excel(args.csv_file))
+    df = remove_direction_column(
+        read_results(
+            args.csv_file, functions=args.functions, array_sizes=args.array_sizes
+        )
+    )
 
     array_sizes, functions = (
         args.array_sizes if args.array_sizes else df["ArraySize"].drop_duplicates(),
         args.functions if args.functions else df["Function"].drop_duplicates(),
     )
 
-    for func in functions:
-        filtered = df[df["Function"] == func]
+    # Average once for every graph, the groups are then looked up per line
+    rates = df.groupby(["Function", "ArraySize", "Threads"])["BestRateMBs"].mean()
 
-        fig = plt.figure(figsize=(10, 10))
-        ax = plt.subplot(111)
+    charts = {}
 
-        for array_size in array_sizes:
-            tmp_df: pd.DataFrame = (
-                filtered[filtered["ArraySize"] == array_size]
-                .drop(columns=["ArraySize"])
-                .groupby(["Threads"])["BestRateMBs"]
-                .mean()
-            )
-
-            x, y = smooth_line(tmp_df.index, tmp_df.values)
-
-            ax.plot(x, y, label=int_to_human(array_size))
-
-        box = ax.get_position()
-        ax.set_position(
-            [box.x0, box.y0 + box.height * 0.1, box.width, box.height * 0.9]
-        )
-        ax.legend(
-            loc="upper center",
-            bbox_to_anchor=(0.5, -0.125),
-            fancybox=True,
-            shadow=True,
-            ncol=5,
-            fontsize=10,
-        )
-
-        ax.yaxis.set_major_formatter(
-            FuncFormatter(
-                lambda x, _: int_to_human(x)
-                if x < 1_000_000
-                else int_to_human(x, fmt="%.1f")
-            )
-        )
-
-        ax.set_xlabel("Threads")
-        ax.set_ylabel("Best Rate (MB/s)")
+    for func in functions:
+        lines = [
+            Line(int_to_human(array_size), rates.loc[(func, array_size)])
+            for array_size in array_sizes
+        ]
 
         original_title = (
             f"Vendor Type: {args.vendor_type}, Operation: {func}"
@@ -127,16 +110,13 @@ def main() -> None:
         )
 
         if title := args.title:
-            ax.set_title(f"{title}\n{original_title}")
+            chart_title = f"{title}\n{original_title}"
         else:
-            ax.set_title(original_title)
+            chart_title = original_title
 
-        ax.grid(True, color="white", linewidth=1.2)
-        fig.gca().set_facecolor((0.9, 0.9, 0.9))
+        charts[directory + f"/{func}.png"] = Chart(chart_title, lines)
 
-        f = directory + f"/{func}.png"
-        fig.savefig(f)
-        fig.clf()
+    render_charts(charts, args.jobs)
 
 
 if __name__ == "__main__":
@@ -3,14 +3,20 @@
 import argparse
 import os
 
-import matplotlib.pyplot as plt
-from matplotlib.ticker import FuncFormatter
-import pandas as pd
-
-from utils import file_exists, int_to_human, smooth_line, remove_direction_column
-
-# Supressing a warning that appears when more than 20 figures are opened
-plt.rcParams["figure.max_open_warning"] = 0
+from utils import (
+    file_exists,
+    int_to_human,
+    remove_direction_column,
+    read_results,
+    node_types,
+    read_node_types,
+    resolve_node_types,
+    label_memory_types,
+    label_memory_types_by_position,
+    Chart,
+    Line,
+    render_charts,
+)
 
 
 def main() -> None:
@@ -42,6 +48,34 @@ def main() -> None:
         help="There are so many lines, this one needs an extra title",
     )
 
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        required=False,
+        default=1,
+        help="Number of processes to render the graphs with",
+    )
+
+    parser.add_argument(
+        "-n",
+        "--node-types",
+        type=node_types,
+        required=False,
+        help=(
+            "Memory type of each NUMA node, e.g. '0=DRAM,1=DRAM,2=CXL'. "
+            "Defaults to the types recorded in the results file, else (with a "
+            "warning) this host's topology: nodes with CPUs are DRAM, "
+            "CPU-less nodes are CXL"
+        ),
+    )
+
+    parser.add_argument(
+        "--per-node",
+        action="store_true",
+        help="Plot every NUMA node pair separately instead of per memory type",
+    )
+
     args = parser.parse_args()
 
     directory = args.output_dir
@@ -49,86 +83,61 @@ def main() -> None:
     if not os.path.isdir(directory):
         os.makedirs(directory)
 
-    df = remove_direction_column(pd.read_excel(args.csv_file))
-
-    array_sizes = df["ArraySize"].drop_duplicates()
-    functions = df["Function"].drop_duplicates()
+    df = read_results(args.csv_file)
 
-    # https://stackoverflow.com/a/67148732 (filtering via index)
-    dram_to_cxl_df, cxl_to_dram_df = (
-        df.copy()[df.index.map(lambda i: i % 8 in range(0, 4))],
-        df.copy()[df.index.map(lambda i: i % 8 in range(4, 8))],
-    )
+    if "Direction" in df.columns:
+        try:
+            memory_types = label_memory_types(
+                df["Direction"],
+                resolve_node_types(
+                    args.node_types, read_node_types(args.csv_file), args.csv_file
+                ),
+                per_node=args.per_node,
+            )
+        except ValueError as e:
+            parser.error(f"{e}, set them with --node-types")
+    else:
+        memory_types = label_memory_types_by_position(len(df), tuple(range(0, 4)))
 
-    dram_to_cxl_df["MemoryType"] = "DRAM to CXL"
-    cxl_to_dram_df["MemoryType"] = "CXL to DRAM"
+    df = remove_direction_column(df)
+    df["MemoryType"] = memory_types
 
-    df = pd.concat([dram_to_cxl_df, cxl_to_dram_df])
+    array_sizes = df["ArraySize"].drop_duplicates()
+    functions = df["Function"].drop_duplicates()
 
     memory_types = df["MemoryType"].drop_duplicates()
 
     colors = ["green", "orange", "blue", "red"]
 
-    for array_size in array_sizes:
-        filtered = df[df["ArraySize"] == array_size]
-
-        fig = plt.figure(figsize=(10, 10))
-        ax = plt.subplot(111)
-
-        for i, memory in enumerate(memory_types):
-            for j, func in enumerate(functions):
-                inner_filtered = filtered[filtered["Function"] == func]
-
-                tmp_df: pd.DataFrame = (
-                    inner_filtered[inner_filtered["MemoryType"].str.contains(memory)]
-                    .drop(columns=["MemoryType"])
-                    .groupby(["Threads"])["BestRateMBs"]
-                    .mean()
-                )
-
-                x, y = smooth_line(tmp_df.index, tmp_df.values)
-
-                ax.plot(
-                    x,
-                    y,
-                    label=f"{func}: {memory}",
-                    color=colors[j],
-                    linestyle="solid" if i % 2 == 0 else "dashed",
-                )
-
-        box = ax.get_position()
-        ax.set_position(
-            [box.x0, box.y0 + box.height * 0.1, box.width, box.height * 0.9]
-        )
-        ax.legend(
-            loc="upper center",
-            bbox_to_anchor=(0.5, -0.125),
-            fancybox=True,
-            shadow=True,
-            ncol=2,
-            fontsize=10,
-        )
+    # Average once for every graph, the groups are then looked up per line
+    rates = df.groupby(["ArraySize", "MemoryType", "Function", "Threads"])[
+        "BestRateMBs"
+    ].mean()
 
-        ax.yaxis.set_major_formatter(
-            FuncFormatter(
-                lambda x, _: int_to_human(x)
-                if x < 1_000_000
-                else int_to_human(x, fmt="%.1f")
+    charts = {}
+
+    for array_size in array_sizes:
+        lines = [
+            Line(
+                f"{func}: {memory}",
+                rates.loc[(array_size, memory, func)],
+                {
+                    "color": colors[j],
+                    "linestyle": "solid" if i % 2 == 0 else "dashed",
+                },
             )
-        )
+            for i, memory in enumerate(memory_types)
+            for j, func in enumerate(functions)
+        ]
 
         human_array_size = int_to_human(array_size, replace_long=False)
 
-        ax.set_xlabel("Threads")
-        ax.set_ylabel("Best Rate (MB/s)")
-        ax.set_title(f"{args.title}\nArray size: {human_array_size}")
-
-        ax.grid(True, color="white", linewidth=1.2)
-        fig.gca().set_facecolor((0.9, 0.9, 0.9))
-
         f = directory + f"/{human_array_size.replace(' ', '')}.png"
-        fig.savefig(f)
-        fig.clf()
+        charts[f] = Chart(
+            f"{args.title}\nArray size: {human_array_size}", lines, legend_columns=2
+        )
+
+    render_charts(charts, args.jobs)
 
 
 if __name__ == "__main__":
@@ -6,6 +6,30 @@ if __name__ == "graph_scripts.utils":
     )
     from graph_scripts.utils.smoothing import smooth_line
     from graph_scripts.utils.filtering import remove_direction_column
+    from graph_scripts.utils.topology import (
+        split_direction,
+        node_types,
+        node_types_from_sysfs,
+        resolve_node_types,
+        node_cpus,
+        label_memory_types,
+        label_memory_types_by_position,
+    )
+    from graph_scripts.utils.numa_pages import (
+        PagePlacement,
+        parse_numa_maps,
+        monitor_pages,
+        run_monitored,
+    )
+    from graph_scripts.utils.saturation import Saturation, fit_saturation
+    from graph_scripts.utils.plotting import Chart, Line, render_charts, draw_heatmap
+    from graph_scripts.utils.store import (
+        read_results,
+        write_results,
+        read_node_types,
+        export_results,
+        EXPORT_FORMATS,
+    )
 else:
     from utils.files import file_exists, dump_file_name
     from utils.human_readable import (
@@ -14,6 +38,30 @@ else:
     )
     from utils.smoothing import smooth_line
     from utils.filtering import remove_direction_column
+    from utils.topology import (
+        split_direction,
+        node_types,
+        node_types_from_sysfs,
+        resolve_node_types,
+        node_cpus,
+        label_memory_types,
+        label_memory_types_by_position,
+    )
+    from utils.numa_pages import (
+        PagePlacement,
+        parse_numa_maps,
+        monitor_pages,
+        run_monitored,
+    )
+    from utils.saturation import Saturation, fit_saturation
+    from utils.plotting import Chart, Line, render_charts, draw_heatmap
+    from utils.store import (
+        read_results,
+        write_results,
+        read_node_types,
+        export_results,
+        EXPORT_FORMATS,
+    )
 
 
 __all__ = (
@@ -23,4 +71,26 @@ __all__ = (
     scientific_notation,
     smooth_line,
     remove_direction_column,
+    read_results,
+    write_results,
+    read_node_types,
+    export_results,
+    EXPORT_FORMATS,
+    Chart,
+    Line,
+    render_charts,
+    draw_heatmap,
+    split_direction,
+    node_types,
+    node_types_from_sysfs,
+    resolve_node_types,
+    node_cpus,
+    label_memory_types,
+    label_memory_types_by_position,
+    Saturation,
+    fit_saturation,
+    PagePlacement,
+    parse_numa_maps,
+    monitor_pages,
+    run_monitored,
 )
@@ -1,10 +1,10 @@
 import pandas as pd
 
+# Columns the graph scripts work with, Placement only exists in placement sweeps
+KEPT_COLUMNS = ["Threads", "ArraySize", "Placement", "Function", "BestRateMBs"]
+
+
 # TODO: Have this eventually be a function that only filters out columns passed by arg
 def remove_direction_column(df: pd.DataFrame) -> pd.DataFrame:
-    if "Direction" in df.columns:
-        df = df.iloc[:, 0:5].drop(["Direction"], axis=1)
-    else:
-        df = df.iloc[:, 0:4]
-
-    return df
+    # Selected by name, so the column order of the file doesn't matter
+    return df[[c for c in KEPT_COLUMNS if c in df.columns]]
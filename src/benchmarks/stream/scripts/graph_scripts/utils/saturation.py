@@ -0,0 +1,85 @@
+from typing import NamedTuple
+
+import numpy as np
+
+# How many knee positions are tried between the smallest and largest thread count
+KNEE_CANDIDATES = 256
+
+
+class Saturation(NamedTuple):
+    knee_threads: float
+    # Highest bandwidth of the fitted curve over the measured thread counts
+    plateau: float
+    # Slope of the ramp before the knee, i.e. bandwidth added per thread
+    per_core: float
+    # Slope after the knee, close to 0 when the memory is saturated
+    plateau_slope: float
+    rmse: float
+    # RMSE relative to the mean measured bandwidth
+    relative_rmse: float
+    r_squared: float
+    points: int
+
+
+def _design(x: np.ndarray, knee: float) -> np.ndarray:
+    return np.column_stack(
+        (np.ones_like(x), np.minimum(x, knee), np.maximum(x - knee, 0.0))
+    )
+
+
+def fit_saturation(threads: np.ndarray, bandwidth: np.ndarray) -> Saturation:
+    """
+    Fit a continuous two-segment line to bandwidth vs threads:
+
+        bw(t) = base + per_core * min(t, knee) + plateau_slope * max(t - knee, 0)
+
+    For a fixed knee the model is linear, so every candidate knee is solved
+    with least squares and the one with the smallest error is kept. Repeated
+    thread counts are averaged first.
+    """
+    threads = np.asarray(threads, dtype=float)
+    bandwidth = np.asarray(bandwidth, dtype=float)
+
+    x, inverse = np.unique(threads, return_inverse=True)
+    y = np.bincount(inverse, weights=bandwidth) / np.bincount(inverse)
+
+    if len(x) < 3:
+        raise ValueError(f"Need at least 3 thread counts to fit, got {len(x)}")
+
+    # A knee must have at least two points on the ramp
+    knees = np.unique(
+        np.concatenate((x[1:], np.linspace(x[1], x[-1], KNEE_CANDIDATES)))
+    )
+
+    best_sse, best = np.inf, None
+
+    # Walk from the largest knee down and only move on a real improvement,
+    # so a ramp that never flattens reports its last thread count as the knee
+    for knee in knees[::-1]:
+        design = _design(x, knee)
+        coefficients, *_ = np.linalg.lstsq(design, y, rcond=None)
+        sse = float(np.sum((design @ coefficients - y) ** 2))
+
+        if sse < best_sse * (1 - 1e-9) - 1e-12:
+            best_sse, best = sse, (knee, coefficients)
+
+    knee, (base, per_core, plateau_slope) = best
+
+    # Nothing after the knee to estimate a slope from
+    if knee >= x[-1]:
+        plateau_slope = 0.0
+
+    fitted = _design(x, knee) @ np.array((base, per_core, plateau_slope))
+    rmse = float(np.sqrt(best_sse / len(x)))
+    total = float(np.sum((y - y.mean()) ** 2))
+
+    return Saturation(
+        knee_threads=float(knee),
+        plateau=float(fitted.max()),
+        per_core=float(per_core),
+        plateau_slope=float(plateau_slope),
+        rmse=rmse,
+        relative_rmse=rmse / float(y.mean()),
+        r_squared=1.0 - best_sse / total if total else 1.0,
+        points=len(x),
+    )
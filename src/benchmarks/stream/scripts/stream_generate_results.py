@@ -3,14 +3,31 @@
 import argparse
 from io import StringIO
 import os
+from pathlib import Path
 import re
 import subprocess
+import sys
 import time
 
 import psutil
 import pandas as pd
 
-from graph_scripts.utils import dump_file_name
+from bandwidth_probe import (
+    check_bandwidth,
+    expected_bandwidth,
+    probe_nodes,
+    probe_table,
+)
+from graph_scripts.utils import (
+    dump_file_name,
+    write_results,
+    export_results,
+    EXPORT_FORMATS,
+    node_cpus,
+    node_types_from_sysfs,
+    PagePlacement,
+    run_monitored,
+)
 
 ARRAY_SIZES: list[int] = [
     100_000_000,
@@ -20,6 +37,12 @@ ARRAY_SIZES: list[int] = [
     430_080_000,
 ]
 
+# OMP_PROC_BIND policies and abstract OMP_PLACES names that a placement may use
+PROC_BINDS = ("close", "spread", "master", "primary", "true", "false")
+PLACES = ("cores", "threads", "sockets", "ll_caches", "numa_domains", "cpus")
+
+# Leaves OMP_PLACES/OMP_PROC_BIND unset, i.e. what the runner always did before
+DEFAULT_PLACEMENT = "default"
 
 WHITESPACE_REPLACE = re.compile(r"\s+")
 
@@ -39,8 +62,43 @@ def core_count_per_socket() -> list[int]:
     return [1, *[x * 2 for x in range(1, (cores // 2) + 1)]]
 
 
+# "spread:cores", "close:cpus" or "default"
+def placement_spec(value: str) -> str:
+    if value == DEFAULT_PLACEMENT:
+        return value
+
+    bind, sep, places = value.partition(":")
+
+    if not sep or bind not in PROC_BINDS or places not in PLACES:
+        raise argparse.ArgumentTypeError(
+            f"'{value}' is not '{DEFAULT_PLACEMENT}' or <bind>:<places>, with "
+            f"<bind> one of {', '.join(PROC_BINDS)} and <places> one of {', '.join(PLACES)}"
+        )
+
+    return value
+
+
+def placement_env(value: str, cpus: list[int]) -> str:
+    """
+    The OpenMP variables for a placement, as exports to prepend to the command.
+
+    The "cpus" places are an explicit list of the CPUs on the bound node, one
+    place per CPU in the order the kernel lists them, instead of letting the
+    runtime build the places from an abstract name.
+    """
+    if value == DEFAULT_PLACEMENT:
+        return ""
+
+    bind, _, places = value.partition(":")
+
+    if places == "cpus":
+        places = ",".join(f"{{{cpu}}}" for cpu in cpus)
+
+    return f"export OMP_PROC_BIND={bind} OMP_PLACES='{places}' && "
+
+
 def format_stream_output(
-    s: str, thread_count: int, array_size: int
+    s: str, thread_count: int, array_size: int, placement: str = DEFAULT_PLACEMENT
 ) -> list[list[int | str]]:
     """
     Parsing the output of STREAM for all the numbers that are important to us.
@@ -105,17 +163,31 @@ def format_stream_output(
 
     lst: list[list[str]] = [WHITESPACE_REPLACE.split(x) for x in selected_output]
 
+    lst[0].insert(0, "Placement")
     lst[0].insert(0, "ArraySize")
     lst[0].insert(0, "Threads")
 
     for i in range(1, len(lst)):
         lst[i][0] = lst[i][0].removesuffix(":")
+        lst[i].insert(0, placement)
         lst[i].insert(0, array_size)
         lst[i].insert(0, thread_count)
 
     return lst
 
 
+def page_columns(
+    placement: PagePlacement, expected_nodes: set[int], threshold: float
+) -> dict[str, int | float | bool]:
+    share = placement.share_on(expected_nodes)
+
+    return {
+        **{f"Node{n}Pages": p for n, p in sorted(placement.pages.items())},
+        "ExpectedNodeShare": round(share, 4),
+        "PagePlacementOK": share >= threshold,
+    }
+
+
 # Run a command, capture its output, return said output
 def run_cmd(cmd: str) -> str:
     returned_output = subprocess.check_output(cmd, shell=True)
@@ -195,13 +267,81 @@ def main() -> None:
         help="The CPU socket which 'cpunodebind' is attached to",
     )
 
+    parser.add_argument(
+        "-P",
+        "--placements",
+        type=placement_spec,
+        required=False,
+        nargs="+",
+        default=[DEFAULT_PLACEMENT],
+        help=(
+            "OpenMP thread placements to sweep, as <bind>:<places> (e.g. "
+            "spread:cores, close:ll_caches, close:cpus) or 'default'"
+        ),
+    )
+
+    parser.add_argument(
+        "-m",
+        "--monitor-pages",
+        type=float,
+        required=False,
+        metavar="INTERVAL",
+        help=(
+            "Sample /proc/<pid>/numa_maps every INTERVAL seconds during each run "
+            "and add the resident pages per NUMA node to its rows"
+        ),
+    )
+
+    parser.add_argument(
+        "--page-threshold",
+        type=float,
+        required=False,
+        default=0.9,
+        help=(
+            "With --monitor-pages, flag runs with less than this share of their "
+            "pages on the --numa-nodes"
+        ),
+    )
+
+    parser.add_argument(
+        "--preflight",
+        type=expected_bandwidth,
+        required=False,
+        metavar="NODE=GBS,...",
+        help=(
+            "Probe these nodes with bandwidth_probe.py first and don't start the "
+            "sweep if one reaches less than --preflight-min-ratio of its Triad GB/s. "
+            "The probe runs at most 8 threads, so give the GB/s a known-good probe "
+            "reaches, not full-socket STREAM results"
+        ),
+    )
+
+    parser.add_argument(
+        "--preflight-min-ratio",
+        type=float,
+        required=False,
+        default=0.5,
+        help="Share of the expected bandwidth a node needs for the sweep to start",
+    )
+
+    parser.add_argument(
+        "-e",
+        "--export",
+        type=str,
+        required=False,
+        nargs="+",
+        choices=EXPORT_FORMATS,
+        default=[],
+        help="Also export the results next to the Parquet file in these formats",
+    )
+
     args = parser.parse_args()
 
     output_file = dump_file_name(args.numa_nodes.replace(",", ""))
     directory = args.output_dir
 
     if p := args.prefix:
-        relative_path = f"{directory}/{p}_{args.numa_nodes.replace(',', '')}.xlsx"
+        relative_path = f"{directory}/{p}_{args.numa_nodes.replace(',', '')}.parquet"
     else:
         relative_path = f"{directory}/{output_file}"
 
@@ -215,44 +355,92 @@ def main() -> None:
     print(f"Output file: {relative_path}")
     print(f"Array sizes: {', '.join(str(x) for x in args.array_sizes)}")
     print(f"Threads: {', '.join(str(x) for x in args.threads)}")
+    print(f"Placements: {', '.join(args.placements)}")
     print()
 
+    if args.preflight:
+        probe = probe_nodes(list(args.preflight), args.cpu, min(8, max(args.threads)))
+        print(probe_table(probe))
+
+        if failures := check_bandwidth(probe, args.preflight, args.preflight_min_ratio):
+            print("\n".join(failures))
+            sys.exit("Pre-flight bandwidth check failed, not starting the sweep")
+
+        print()
+
+    # Only needed for explicit CPU lists
+    cpus = node_cpus(args.cpu) if any(p.endswith(":cpus") for p in args.placements) else []
+
+    expected_nodes = {int(n) for n in args.numa_nodes.split(",")}
+
     lst = []
+    page_rows = []
 
-    final_calculations = len(args.threads) * len(args.array_sizes)
+    final_calculations = (
+        len(args.placements) * len(args.threads) * len(args.array_sizes)
+    )
     index = 1
 
     very_start = time.time()
 
-    for thread_count in args.threads:
-        for array_size in args.array_sizes:
-            print(
-                f"Started {thread_count} threads, {array_size} array size",
-                end="\r",
-            )
-
-            cmd = (
-                f"export OMP_NUM_THREADS={thread_count} && "
-                f"numactl --cpunodebind={args.cpu} "
-                f"./{args.binary_path} --ntimes {args.ntimes} "
-                f"--numa-nodes {args.numa_nodes} --array-size {array_size}"
-            )
+    for placement_name in args.placements:
+        env = placement_env(placement_name, cpus)
+
+        for thread_count in args.threads:
+            for array_size in args.array_sizes:
+                print(
+                    (
+                        f"Started {thread_count} threads, {array_size} array size, "
+                        f"{placement_name} placement"
+                    ),
+                    end="\r",
+                )
 
-            start = time.time()
-            cmd_stdout = run_cmd(cmd)
-            formatted = format_stream_output(cmd_stdout, thread_count, array_size)
-            lst.extend(formatted)
-            end = time.time()
-            elapsed = round(end - start, 3)
+                # exec so the sampled pid is STREAM's and not the shell's
+                cmd = (
+                    f"export OMP_NUM_THREADS={thread_count} && {env}"
+                    f"exec numactl --cpunodebind={args.cpu} "
+                    f"./{args.binary_path} --ntimes {args.ntimes} "
+                    f"--numa-nodes {args.numa_nodes} --array-size {array_size}"
+                )
 
-            print(
-                (
-                    f"Done in {elapsed}s ({index}/{final_calculations}) : "
-                    f"{thread_count} threads, {array_size} array size"
+                start = time.time()
+                if args.monitor_pages:
+                    cmd_stdout, pages = run_monitored(cmd, args.monitor_pages)
+                    columns = page_columns(pages, expected_nodes, args.page_threshold)
+                    page_rows.append(
+                        {
+                            "Threads": thread_count,
+                            "ArraySize": array_size,
+                            "Placement": placement_name,
+                            **columns,
+                        }
+                    )
+
+                    if not columns["PagePlacementOK"]:
+                        print(
+                            f"WARNING: only {columns['ExpectedNodeShare']:.1%} of the "
+                            f"pages are on node(s) {args.numa_nodes}, "
+                            f"pages per node: {pages.pages}"
+                        )
+                else:
+                    cmd_stdout = run_cmd(cmd)
+                formatted = format_stream_output(
+                    cmd_stdout, thread_count, array_size, placement_name
+                )
+                lst.extend(formatted)
+                end = time.time()
+                elapsed = round(end - start, 3)
+
+                print(
+                    (
+                        f"Done in {elapsed}s ({index}/{final_calculations}) : "
+                        f"{thread_count} threads, {array_size} array size, "
+                        f"{placement_name} placement"
+                    )
                 )
-            )
 
-            index += 1
+                index += 1
 
     header = lst[0]
     filtered = list(filter(lambda x: x != header, lst))
@@ -262,11 +450,37 @@ def main() -> None:
 
     df = pd.read_csv(StringIO(out))
 
-    df.to_excel(relative_path, index=False)
+    if page_rows:
+        df = df.merge(
+            pd.DataFrame(page_rows),
+            on=["Threads", "ArraySize", "Placement"],
+            how="left",
+        )
 
-    print(
-        f"{round(time.time() - very_start, 3)}s: Excel outputted to {relative_path}\n\n"
-    )
+        # A node that never held a page of a run has no count for it
+        node_columns = df.columns[df.columns.str.fullmatch(r"Node\d+Pages")]
+        df[node_columns] = df[node_columns].fillna(0).astype("int64")
+
+        flagged = df.drop_duplicates(["Threads", "ArraySize", "Placement"])
+        flagged = flagged[~flagged["PagePlacementOK"]]
+
+        if len(flagged):
+            print(f"{len(flagged)} run(s) had pages outside node(s) {args.numa_nodes}:")
+            print(
+                flagged[["Threads", "ArraySize", "Placement", "ExpectedNodeShare"]]
+                .to_string(index=False)
+            )
+
+    write_results(df, relative_path, node_types=node_types_from_sysfs())
+
+    print(f"{round(time.time() - very_start, 3)}s: Results outputted to {relative_path}")
+
+    for fmt in args.export:
+        export_path = str(Path(relative_path).with_suffix(f".{fmt}"))
+        export_results(df, export_path)
+        print(f"Exported to {export_path}")
+
+    print("\n")
 
 
 if __name__ == "__main__":
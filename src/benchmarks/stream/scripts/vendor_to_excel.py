@@ -6,7 +6,16 @@ import pandas as pd
 from openpyxl import load_workbook
 from openpyxl.worksheet.filters import FilterColumn, Filters
 
-from graph_scripts.utils import file_exists, remove_direction_column
+from graph_scripts.utils import (
+    file_exists,
+    remove_direction_column,
+    read_results,
+    node_types,
+    read_node_types,
+    resolve_node_types,
+    label_memory_types,
+    label_memory_types_by_position,
+)
 
 
 def main() -> None:
@@ -26,22 +35,52 @@ def main() -> None:
         help="Where and what the excel file should be named",
     )
 
+    parser.add_argument(
+        "-n",
+        "--node-types",
+        type=node_types,
+        required=False,
+        help=(
+            "Memory type of each NUMA node, e.g. '0=DRAM,1=DRAM,2=CXL'. "
+            "Defaults to the types recorded in the results file, else (with a "
+            "warning) this host's topology: nodes with CPUs are DRAM, "
+            "CPU-less nodes are CXL"
+        ),
+    )
+
     args = parser.parse_args()
 
-    df = remove_direction_column(pd.read_excel(args.csv_file))
+    df = read_results(args.csv_file)
+
+    if "Direction" in df.columns:
+        try:
+            memory_types = label_memory_types(
+                df["Direction"],
+                resolve_node_types(
+                    args.node_types, read_node_types(args.csv_file), args.csv_file
+                ),
+            )
+        except ValueError as e:
+            parser.error(f"{e}, set them with --node-types")
+    else:
+        memory_types = label_memory_types_by_position(len(df), tuple(range(0, 4)))
+
+    df = remove_direction_column(df)
+    df["MemoryType"] = memory_types
 
     array_sizes = df["ArraySize"].drop_duplicates()
     functions = df["Function"].drop_duplicates()
     threads = df["Threads"].drop_duplicates()
 
-    dram_to_cxl_df, cxl_to_dram_df = (
-        df.copy()[df.index.map(lambda i: i % 8 in range(0, 4))],
-        df.copy()[df.index.map(lambda i: i % 8 in range(4, 8))],
-    )
-
-    dram_to_cxl_df.rename(columns={"BestRateMBs": "DRAM to CXL"}, inplace=True)
-    dram_to_cxl_df["CXL to DRAM"] = cxl_to_dram_df.iloc[:, 3].values
-    combined_df = dram_to_cxl_df.copy()
+    # One column per memory type, e.g. "DRAM to CXL" and "CXL to DRAM"
+    combined_df = df.pivot_table(
+        index=["Threads", "ArraySize", "Function"],
+        columns="MemoryType",
+        values="BestRateMBs",
+        aggfunc="mean",
+        sort=False,
+    ).reset_index()
+    combined_df.columns.name = None
 
     with pd.ExcelWriter(args.output) as f:
         for array_size in array_sizes:
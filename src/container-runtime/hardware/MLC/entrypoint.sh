@@ -46,8 +46,12 @@ cms_collect_sysinfo ./sysinfo
 
 # --- 2. Run the MLC benchmark (passes all env vars through as CLI args) ---
 cms_log_info "Starting MLC benchmark..."
+cms_start_vmstat_sampler . "${VMSTAT_INTERVAL:-5}"
+cms_start_telemetry . "${TELEMETRY_INTERVAL:-0.5}"
 .././mlc.sh $CXL_NUMA_NODE $DRAM_NUMA_NODE $SOCKET $LOW_VERBOSITY $MID_VERBOSITY $HIGH_VERBOSITY $LOADED_LATENCY $SINGLE_THREADED $ENABLE_512_AVX
 mlc_exit=$?
+cms_stop_telemetry
+cms_stop_vmstat_sampler
 
 # --- 3. Parse results into standardized CSV ---
 # mlc.sh writes its own output directory (mlc.sh.<hostname>.<date>/) with .txt and .csv files.
@@ -57,6 +61,8 @@ MLC_OUTPUT_DIR=$(find . -maxdepth 1 -type d -name 'mlc.sh.*' -printf '%T@ %p\n'
 if [ -n "${MLC_OUTPUT_DIR}" ] && [ -d "${MLC_OUTPUT_DIR}" ]; then
     # Copy sysinfo into the MLC output directory so the report has it
     cp -r ./sysinfo "${MLC_OUTPUT_DIR}/sysinfo" 2>/dev/null || true
+    cp ./vmstat_* "${MLC_OUTPUT_DIR}/" 2>/dev/null || true
+    cp ./telemetry.csv "${MLC_OUTPUT_DIR}/" 2>/dev/null || true
 
     # Run the parser against the MLC output directory
     cms_log_info "Parsing MLC results into CSV..."
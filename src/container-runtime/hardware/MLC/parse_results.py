@@ -9,6 +9,9 @@ Parses MLC benchmark output files and normalizes into:
 Usage:
     python3 parse_results.py <mlc_output_dir>
 
+    Outside the ocp-cms-base image, put src/container-runtime/utils on
+    PYTHONPATH first, see utils/README.md.
+
 JSON output:  results_mlc.json  (single combined file)
 CSV output:   results_mlc_bandwidth.csv, results_mlc_bw_ramp.csv, etc.
 """
@@ -21,6 +24,8 @@ import re
 import sys
 from datetime import datetime, timezone
 
+from cms_vmstat import load_vmstat_delta
+
 
 def log(msg):
     print(f"[PARSER] {msg}")
@@ -309,7 +314,7 @@ def main():
     # ----- Write JSON (primary output) -----
     json_output = {
         "benchmark": "intel-mlc",
-        "parser_version": "1.0.0",
+        "parser_version": "1.1.0",
         "timestamp_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
         "source_dir": os.path.basename(output_dir),
         "idle_latency": idle_lat_data if idle_lat_data else None,
@@ -317,6 +322,7 @@ def main():
         "bw_ramp": ramp_data if ramp_data else None,
         "bw_ramp_interleave": interleave_data if interleave_data else None,
         "latency_matrix": latency_matrix,
+        "kernel_tiering": load_vmstat_delta(output_dir),
         "errors": all_errors if all_errors else None,
     }
 
@@ -43,6 +43,9 @@ cms_log_info "Collecting system information before benchmark..."
 cms_collect_sysinfo ./sysinfo
 
 # --- 2. Run the STREAM benchmark, capture output while preserving console ---
+cms_start_vmstat_sampler "${RESULTS_DIR}" "${VMSTAT_INTERVAL:-5}"
+cms_start_telemetry "${RESULTS_DIR}" "${TELEMETRY_INTERVAL:-0.5}"
+
 if [ "$BENCHMARK" = 'stream' ]; then
 	cms_log_info "Running STREAM benchmark..."
 	numactl $STREAM_CPU_NODE_BIND .././stream_c.exe $STREAM_NUMA_NODES $STREAM_NUM_LOOPS $STREAM_ARRAY_SIZE $STREAM_OFFSET $STREAM_MALLOC $STREAM_AUTO_ARRAY_SIZE 2>&1 | tee "${RAW_OUTPUT}"
@@ -58,6 +61,9 @@ else
 	bench_exit=1
 fi
 
+cms_stop_telemetry
+cms_stop_vmstat_sampler
+
 # --- 3. Parse results into standardized CSV ---
 if [ -f "${RAW_OUTPUT}" ]; then
 	cms_log_info "Parsing STREAM results into CSV..."
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+import argparse
+
+from graph_scripts.utils import file_exists, read_results, export_results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Export a STREAM results file to Excel or CSV"
+    )
+
+    parser.add_argument(
+        "-i",
+        "--input",
+        type=file_exists,
+        required=True,
+        help="Results file to export (Parquet, Excel or CSV)",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        required=True,
+        help="Where to put the exported file, the format is taken from its extension",
+    )
+
+    parser.add_argument(
+        "-a",
+        "--array-sizes",
+        type=int,
+        nargs="+",
+        required=False,
+        help="Only export these array sizes",
+    )
+
+    parser.add_argument(
+        "-f",
+        "--functions",
+        type=str,
+        nargs="+",
+        required=False,
+        help="Only export these functions",
+    )
+
+    parser.add_argument(
+        "-t",
+        "--threads",
+        type=int,
+        nargs="+",
+        required=False,
+        help="Only export these thread counts",
+    )
+
+    parser.add_argument(
+        "-P",
+        "--placements",
+        type=str,
+        nargs="+",
+        required=False,
+        help="Only export these OpenMP placements, e.g. spread:cores",
+    )
+
+    args = parser.parse_args()
+
+    df = read_results(
+        args.input,
+        functions=args.functions,
+        array_sizes=args.array_sizes,
+        threads=args.threads,
+        placements=args.placements,
+    )
+
+    export_results(df, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+import argparse
+from pathlib import Path
+import re
+
+import pandas as pd
+
+from graph_scripts.utils import (
+    file_exists,
+    read_results,
+    export_results,
+    fit_saturation,
+)
+
+STREAM_GROUP_COLUMNS = ["Direction", "Placement", "ArraySize", "Function"]
+
+# bw_ramp.results.* and bw_ramp_interleave.results.* files written by mlc.sh
+MLC_GROUP_COLUMNS = ["NUMA Node Tested", "DRAM:CXL Ratio", "IO Pattern", "Access Pattern"]
+MLC_THREADS, MLC_BANDWIDTH = "Num of Cores", "Bandwidth(MB/s)"
+
+
+def dir_path(path: str) -> Path:
+    if not Path(path).is_dir():
+        raise argparse.ArgumentTypeError(f"Directory '{path}' does not exist.")
+
+    return Path(path)
+
+
+def fit_groups(
+    df: pd.DataFrame, group_columns: list[str], threads: str, bandwidth: str
+) -> list[dict]:
+    group_columns = [c for c in group_columns if c in df.columns]
+    rows = []
+
+    for keys, group in df.groupby(group_columns, sort=False, dropna=False):
+        labels = dict(zip(group_columns, keys))
+
+        try:
+            fit = fit_saturation(group[threads], group[bandwidth])
+        except ValueError as e:
+            print(f"Skipping {labels}: {e}")
+            continue
+
+        rows.append(
+            {
+                **labels,
+                "KneeThreads": round(fit.knee_threads, 1),
+                "PlateauMBs": round(fit.plateau, 1),
+                "PerCoreMBs": round(fit.per_core, 1),
+                "PlateauSlopeMBs": round(fit.plateau_slope, 1),
+                "RMSE": round(fit.rmse, 1),
+                "RelativeRMSE": round(fit.relative_rmse, 4),
+                "R2": round(fit.r_squared, 4),
+                "Points": fit.points,
+            }
+        )
+
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Fit a saturation model (ramp, knee, plateau) to bandwidth vs threads "
+            "for STREAM results and MLC bandwidth ramps"
+        )
+    )
+
+    parser.add_argument(
+        "-c",
+        "--csv-files",
+        type=str,
+        action="append",
+        nargs=2,
+        default=[],
+        metavar=("FILE", "MEMTYPE"),
+        help="A STREAM results file and the memory type it was run against",
+    )
+
+    parser.add_argument(
+        "-m",
+        "--mlc-dirs",
+        type=dir_path,
+        action="append",
+        default=[],
+        help="An mlc.sh output directory containing bw_ramp*.csv files",
+    )
+
+    parser.add_argument(
+        "-a",
+        "--array-sizes",
+        type=int,
+        nargs="+",
+        required=False,
+        help="Only fit these STREAM array sizes",
+    )
+
+    parser.add_argument(
+        "-f",
+        "--functions",
+        type=str,
+        nargs="+",
+        required=False,
+        help="Only fit these STREAM functions",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        required=False,
+        help="Also write the table to this .csv or .xlsx file",
+    )
+
+    args = parser.parse_args()
+
+    if not args.csv_files and not args.mlc_dirs:
+        parser.error("at least one of -c/--csv-files or -m/--mlc-dirs is required")
+
+    rows = []
+
+    for f, memtype in args.csv_files:
+        df = read_results(
+            file_exists(f), functions=args.functions, array_sizes=args.array_sizes
+        )
+        df.insert(0, "MemoryType", memtype)
+
+        rows.extend(
+            fit_groups(
+                df, ["MemoryType", *STREAM_GROUP_COLUMNS], "Threads", "BestRateMBs"
+            )
+        )
+
+    for directory in args.mlc_dirs:
+        for ramp in sorted(directory.glob("bw_ramp*.csv")):
+            df = pd.read_csv(ramp)
+            nodes = "+".join(re.findall(r"node_(\d+)", ramp.name))
+            df.insert(0, "MemoryType", f"MLC node {nodes}")
+
+            rows.extend(
+                fit_groups(
+                    df, ["MemoryType", *MLC_GROUP_COLUMNS], MLC_THREADS, MLC_BANDWIDTH
+                )
+            )
+
+    table = pd.DataFrame(rows).convert_dtypes()
+
+    print(table.to_string(index=False))
+
+    if args.output:
+        export_results(table, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,22 @@
 import argparse
 import os
 
-import matplotlib.pyplot as plt
-from matplotlib.ticker import FuncFormatter
 import pandas as pd
 
-from utils import file_exists, int_to_human, smooth_line, remove_direction_column
-
-# Supressing a warning that appears when more than 20 figures are opened
-plt.rcParams["figure.max_open_warning"] = 0
+from utils import (
+    file_exists,
+    int_to_human,
+    remove_direction_column,
+    read_results,
+    node_types,
+    read_node_types,
+    resolve_node_types,
+    label_memory_types,
+    label_memory_types_by_position,
+    Chart,
+    Line,
+    render_charts,
+)
 
 
 def main() -> None:
@@ -76,6 +84,34 @@ def main() -> None:
         help="The main title of the graph",
     )
 
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        required=False,
+        default=1,
+        help="Number of processes to render the graphs with",
+    )
+
+    parser.add_argument(
+        "-n",
+        "--node-types",
+        type=node_types,
+        required=False,
+        help=(
+            "Memory type of each NUMA node, e.g. '0=DRAM,1=DRAM,2=CXL'. "
+            "Defaults to the types recorded in the results file, else (with a "
+            "warning) this host's topology: nodes with CPUs are DRAM, "
+            "CPU-less nodes are CXL"
+        ),
+    )
+
+    parser.add_argument(
+        "--per-node",
+        action="store_true",
+        help="Plot every NUMA node pair separately instead of per memory type",
+    )
+
     args = parser.parse_args()
 
     directory = args.output_dir
@@ -89,34 +125,39 @@ def main() -> None:
         args.dram_cxl_csv_file,
     )
 
-    dram_df, cxl_df, combined_df = (
-        remove_direction_column(pd.read_excel(dram_csv_file)),
-        remove_direction_column(pd.read_excel(cxl_csv_file)),
-        pd.read_excel(dram_cxl_csv_file),
+    filters = {"functions": args.functions, "array_sizes": args.array_sizes}
+
+    dram_df, cxl_df = (
+        remove_direction_column(read_results(dram_csv_file, **filters)),
+        remove_direction_column(read_results(cxl_csv_file, **filters)),
     )
 
-    direction_column_exists = "Direction" in combined_df.columns
+    # Not filtered, older files without a Direction column are split by row position
+    combined_df = read_results(dram_cxl_csv_file)
+
+    if "Direction" in combined_df.columns:
+        try:
+            memory_types = label_memory_types(
+                combined_df["Direction"],
+                resolve_node_types(
+                    args.node_types,
+                    read_node_types(dram_cxl_csv_file),
+                    dram_cxl_csv_file,
+                ),
+                per_node=args.per_node,
+            )
+        except ValueError as e:
+            parser.error(f"{e}, set them with --node-types")
+    else:
+        memory_types = label_memory_types_by_position(len(combined_df), (0, 2, 5, 7))
 
     combined_df = remove_direction_column(combined_df)
-
-    # https://stackoverflow.com/a/67148732 (filtering via index)
-    if direction_column_exists:
-        dram_cxl_df, cxl_dram_df = (
-            combined_df.copy()[combined_df.index.map(lambda i: i % 8 in range(0, 4))],
-            combined_df.copy()[combined_df.index.map(lambda i: i % 8 in range(4, 8))],
-        )
-    else:
-        dram_cxl_df, cxl_dram_df = (
-            combined_df.copy()[combined_df.index.map(lambda i: i % 8 in (0, 2, 5, 7))],
-            combined_df.copy()[combined_df.index.map(lambda i: i % 8 in (1, 3, 4, 6))],
-        )
+    combined_df["MemoryType"] = memory_types
 
     dram_df["MemoryType"] = "DRAM"
     cxl_df["MemoryType"] = "CXL"
-    dram_cxl_df["MemoryType"] = "DRAM to CXL"
-    cxl_dram_df["MemoryType"] = "CXL to DRAM"
 
-    df = pd.concat([dram_df, cxl_df, dram_cxl_df, cxl_dram_df])
+    df = pd.concat([dram_df, cxl_df, combined_df])
 
     memory_types = df["MemoryType"].drop_duplicates()
     functions = args.functions if args.functions else df["Function"].drop_duplicates()
@@ -124,66 +165,33 @@ def main() -> None:
         args.array_sizes if args.array_sizes else df["ArraySize"].drop_duplicates()
     )
 
-    for func in functions:
-        for array_size in array_sizes:
-            filtered = df[df["ArraySize"] == array_size]
-            filtered = filtered[filtered["Function"] == func]
-
-            fig = plt.figure(figsize=(10, 10))
-            ax = plt.subplot(111)
-
-            for memory in memory_types:
-                tmp_df: pd.DataFrame = (
-                    filtered[filtered["MemoryType"].str.contains(memory)]
-                    .drop(columns=["MemoryType"])
-                    .groupby(["Threads"])["BestRateMBs"]
-                    .mean()
-                )
-
-                x, y = smooth_line(tmp_df.index, tmp_df.values)
+    # Average once for every graph, the groups are then looked up per line
+    rates = df.groupby(["Function", "ArraySize", "MemoryType", "Threads"])[
+        "BestRateMBs"
+    ].mean()
 
-                ax.plot(x, y, label=memory)
-
-            # https://stackoverflow.com/a/4701285 (setting legend outside plot)
-            box = ax.get_position()
-            ax.set_position(
-                [box.x0, box.y0 + box.height * 0.1, box.width, box.height * 0.9]
-            )
-            ax.legend(
-                loc="upper center",
-                bbox_to_anchor=(0.5, -0.125),
-                fancybox=True,
-                shadow=True,
-                ncol=5,
-                fontsize=10,
-            )
+    charts = {}
 
-            ax.yaxis.set_major_formatter(
-                FuncFormatter(
-                    lambda x, _: int_to_human(x)
-                    if x < 1_000_000
-                    else int_to_human(x, fmt="%.1f")
-                )
-            )
+    for func in functions:
+        for array_size in array_sizes:
+            lines = [
+                Line(memory, rates.loc[(func, array_size, memory)])
+                for memory in memory_types
+            ]
 
             human_array_size = int_to_human(array_size, replace_long=False)
 
-            ax.set_xlabel("Threads")
-            ax.set_ylabel("Best Rate (MB/s)")
-
-            ax.grid(True, color="white", linewidth=1.2)
-            fig.gca().set_facecolor((0.9, 0.9, 0.9))
-
             if title := args.title:
-                ax.set_title(
+                chart_title = (
                     f"{title}\nFunction: {func}, Array size: {human_array_size}"
                 )
             else:
-                ax.set_title(f"Function: {func}, Array size: {human_array_size}")
+                chart_title = f"Function: {func}, Array size: {human_array_size}"
 
             f = directory + f"/{func}-{human_array_size.replace(' ', '')}.png"
-            fig.savefig(f)
-            fig.clf()
+            charts[f] = Chart(chart_title, lines)
+
+    render_charts(charts, args.jobs)
 
 
 if __name__ == "__main__":
@@ -4,14 +4,14 @@ import argparse
 import os
 from pathlib import Path
 
-import matplotlib.pyplot as plt
-import pandas as pd
-from matplotlib.ticker import FuncFormatter
-
-from utils import int_to_human, smooth_line, remove_direction_column
-
-# Suppressing a warning that appears when more than 20 figures are opened
-plt.rcParams["figure.max_open_warning"] = 0
+from utils import (
+    int_to_human,
+    remove_direction_column,
+    read_results,
+    Chart,
+    Line,
+    render_charts,
+)
 
 
 def main() -> None:
@@ -63,6 +63,15 @@ def main() -> None:
         help="The title that the graphs should have",
     )
 
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        required=False,
+        default=1,
+        help="Number of processes to render the graphs with",
+    )
+
     args = parser.parse_args()
 
     csv_files, directory, array_sizes, functions, title = (
@@ -77,7 +86,12 @@ def main() -> None:
         os.makedirs(directory)
 
     dfs = [
-        (remove_direction_column(pd.read_excel(f)), n)
+        (
+            remove_direction_column(
+                read_results(f, functions=functions, array_sizes=array_sizes)
+            ),
+            n,
+        )
         for (f, n) in csv_files
     ]
 
@@ -86,64 +100,31 @@ def main() -> None:
     if not functions:
         functions = dfs[0][0]["Function"].drop_duplicates()
 
+    # Average once per vendor, the groups are then looked up per line
+    rates = [
+        (df.groupby(["ArraySize", "Function", "Threads"])["BestRateMBs"].mean(), n)
+        for df, n in dfs
+    ]
+
+    charts = {}
+
     for array_size in array_sizes:
         for func in functions:
-            fig, ax = plt.figure(figsize=(10, 10)), plt.subplot(111)
-
-            for df, n in dfs:
-                # https://stackoverflow.com/a/27975230 (Filtering by row value)
-                filtered = df[df["ArraySize"] == array_size]
-                filtered = (
-                    filtered[filtered["Function"] == func]
-                    .drop(columns=["Function"])
-                    .groupby(["Threads"])["BestRateMBs"]
-                    .mean()
-                )
-
-                x, y = smooth_line(filtered.index, filtered.values)
-
-                ax.plot(x, y, label=n)
-
-            # https://stackoverflow.com/a/4701285 (setting legend outside plot)
-            box = ax.get_position()
-            ax.set_position(
-                [box.x0, box.y0 + box.height * 0.1, box.width, box.height * 0.9]
-            )
-            ax.legend(
-                loc="upper center",
-                bbox_to_anchor=(0.5, -0.125),
-                fancybox=True,
-                shadow=True,
-                ncol=2,
-                fontsize=10,
-            )
-
-            ax.yaxis.set_major_formatter(
-                FuncFormatter(
-                    lambda x, _: int_to_human(x)
-                    if x < 1_000_000
-                    else int_to_human(x, fmt="%.1f")
-                )
-            )
+            lines = [Line(n, r.loc[(array_size, func)]) for r, n in rates]
 
             human_array_size = int_to_human(array_size, replace_long=False)
 
-            ax.set_xlabel("Threads")
-            ax.set_ylabel("Best Rate (MB/s)")
-
-            ax.grid(True, color="white", linewidth=1.2)
-            fig.gca().set_facecolor((0.9, 0.9, 0.9))
-
             default_title = f"Function: {func}, Array size: {human_array_size}"
 
             if title := args.title:
-                ax.set_title(f"{title}\n{default_title}")
+                chart_title = f"{title}\n{default_title}"
             else:
-                ax.set_title(default_title)
+                chart_title = default_title
 
             f = directory + f"/{func}-{human_array_size.replace(' ', '')}.png"
-            fig.savefig(f)
-            fig.clf()
+            charts[f] = Chart(chart_title, lines, legend_columns=2)
+
+    render_charts(charts, args.jobs)
 
 
 if __name__ == "__main__":
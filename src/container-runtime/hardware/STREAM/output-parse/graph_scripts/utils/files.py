@@ -13,14 +13,14 @@ def file_exists(file: str) -> Path:
     return path
 
 
-# {uname}_stream_{NUMA}_{yyyymmdd}.csv
-# {uname}_stream_{yyyymmdd}.csv
+# {uname}_stream_{NUMA}_{yyyymmdd}.parquet
+# {uname}_stream_{yyyymmdd}.parquet
 def dump_file_name(numa_nodes: str | None = None) -> str:
     platform_name = platform.system()
     now = datetime.now().strftime(r"%Y%m%d")
 
     return (
-        f"{platform_name}_stream_{numa_nodes}_{now}.csv"
+        f"{platform_name}_stream_{numa_nodes}_{now}.parquet"
         if numa_nodes
-        else f"{platform_name}_stream_{now}.csv"
+        else f"{platform_name}_stream_{now}.parquet"
     )
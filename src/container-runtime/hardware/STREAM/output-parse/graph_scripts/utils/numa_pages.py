@@ -0,0 +1,135 @@
+from pathlib import Path
+import re
+import subprocess
+import threading
+import time
+from typing import NamedTuple
+
+NODE_SYSFS = Path("/sys/devices/system/node")
+
+# "N2=1024" in a numa_maps line
+NODE_PAGES = re.compile(r"\bN(\d+)=(\d+)")
+PAGE_SIZE = re.compile(r"\bkernelpagesize_kB=(\d+)")
+MEM_USED = re.compile(r"MemUsed:\s+(\d+) kB")
+
+# numa_maps counts are in the mapping's page size, they are converted to 4 KiB
+# pages so mappings backed by huge pages add up with the rest
+BASE_PAGE_KB = 4
+
+
+class PagePlacement(NamedTuple):
+    # Resident 4 KiB pages of the process per NUMA node
+    pages: dict[int, int]
+    # Growth of every node's MemUsed since the process started, in MB
+    mem_used_delta_mb: dict[int, float]
+    samples: int
+
+    def share_on(self, nodes: set[int]) -> float:
+        total = sum(self.pages.values())
+        return sum(self.pages.get(n, 0) for n in nodes) / total if total else 0.0
+
+
+def parse_numa_maps(text: str) -> dict[int, int]:
+    pages: dict[int, int] = {}
+
+    for line in text.splitlines():
+        size = PAGE_SIZE.search(line)
+        scale = int(size.group(1)) // BASE_PAGE_KB if size else 1
+
+        for node, count in NODE_PAGES.findall(line):
+            pages[int(node)] = pages.get(int(node), 0) + int(count) * scale
+
+    return pages
+
+
+def node_mem_used_kb(root: Path = NODE_SYSFS) -> dict[int, int]:
+    used: dict[int, int] = {}
+
+    for node_dir in sorted(root.glob("node[0-9]*")):
+        if match := MEM_USED.search((node_dir / "meminfo").read_text()):
+            used[int(node_dir.name.removeprefix("node"))] = int(match.group(1))
+
+    return used
+
+
+def sample_pages(pid: int) -> dict[int, int]:
+    """
+    The per node pages of a process, empty once it has exited.
+    """
+    try:
+        return parse_numa_maps(Path(f"/proc/{pid}/numa_maps").read_text())
+    except (FileNotFoundError, ProcessLookupError, PermissionError):
+        return {}
+
+
+def monitor_pages(
+    process: subprocess.Popen,
+    interval: float = 0.5,
+    baseline: dict[int, int] | None = None,
+) -> PagePlacement:
+    """
+    Sample a running process until it exits and keep the sample with the most
+    resident pages, i.e. when all the benchmark's arrays were populated.
+
+    Must run alongside whatever reads the process' output, see run_monitored.
+    baseline is the node MemUsed from before the process started.
+    """
+    baseline = baseline or node_mem_used_kb()
+    peak: dict[int, int] = {}
+    peak_used = baseline
+    samples = 0
+
+    while True:
+        pages = sample_pages(process.pid)
+
+        if pages:
+            samples += 1
+            if sum(pages.values()) >= sum(peak.values()):
+                peak, peak_used = pages, node_mem_used_kb()
+
+        if process.poll() is not None:
+            break
+
+        time.sleep(interval)
+
+    return PagePlacement(
+        pages=peak,
+        mem_used_delta_mb={
+            n: round((peak_used.get(n, 0) - kb) / 1024, 1) for n, kb in baseline.items()
+        },
+        samples=samples,
+    )
+
+
+def run_monitored(cmd: str, interval: float = 0.5) -> tuple[bytes, PagePlacement]:
+    """
+    Run a shell command like run_cmd while sampling its page placement.
+
+    The sampled pid is the shell's, so the command has to end by exec'ing the
+    benchmark (numactl execs its program too), e.g. "export X=1 && exec numactl ...".
+    """
+    baseline = node_mem_used_kb()
+    process = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE)
+    result: list[PagePlacement] = []
+    errors: list[BaseException] = []
+
+    def sample() -> None:
+        try:
+            result.append(monitor_pages(process, interval, baseline))
+        except BaseException as e:
+            errors.append(e)
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+
+    output, _ = process.communicate()
+    sampler.join()
+
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, cmd, output)
+
+    # Raise whatever stopped the sampler here instead of an IndexError below
+    if errors:
+        raise RuntimeError(f"Sampling the page placement of '{cmd}' failed") from errors[0]
+
+    return output, result[0]
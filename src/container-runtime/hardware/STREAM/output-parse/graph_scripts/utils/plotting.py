@@ -0,0 +1,142 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, NamedTuple
+
+import matplotlib
+import matplotlib.pyplot as plt
+from matplotlib.ticker import FuncFormatter
+import numpy as np
+import pandas as pd
+
+if __name__ == "graph_scripts.utils.plotting":
+    from graph_scripts.utils.human_readable import int_to_human
+    from graph_scripts.utils.smoothing import smooth_line
+else:
+    from utils.human_readable import int_to_human
+    from utils.smoothing import smooth_line
+
+
+class Line(NamedTuple):
+    label: str
+    # Mean BestRateMBs indexed by thread count
+    rates: pd.Series
+    # Extra keyword arguments for ax.plot, e.g. color/linestyle
+    style: dict[str, Any] | None = None
+
+
+class Chart(NamedTuple):
+    title: str
+    lines: list[Line]
+    legend_columns: int = 5
+
+
+def _format_rate(x: float, _) -> str:
+    return int_to_human(x) if x < 1_000_000 else int_to_human(x, fmt="%.1f")
+
+
+def draw_chart(chart: Chart, path: str) -> None:
+    fig = plt.figure(figsize=(10, 10))
+    ax = plt.subplot(111)
+
+    for line in chart.lines:
+        x, y = smooth_line(line.rates.index, line.rates.values)
+        ax.plot(x, y, label=line.label, **(line.style or {}))
+
+    # https://stackoverflow.com/a/4701285 (setting legend outside plot)
+    box = ax.get_position()
+    ax.set_position([box.x0, box.y0 + box.height * 0.1, box.width, box.height * 0.9])
+    ax.legend(
+        loc="upper center",
+        bbox_to_anchor=(0.5, -0.125),
+        fancybox=True,
+        shadow=True,
+        ncol=chart.legend_columns,
+        fontsize=10,
+    )
+
+    ax.yaxis.set_major_formatter(FuncFormatter(_format_rate))
+
+    ax.set_xlabel("Threads")
+    ax.set_ylabel("Best Rate (MB/s)")
+    ax.set_title(chart.title)
+
+    ax.grid(True, color="white", linewidth=1.2)
+    fig.gca().set_facecolor((0.9, 0.9, 0.9))
+
+    fig.savefig(path)
+    plt.close(fig)
+
+
+# The charts are handed to every worker once when the pool starts, the
+# tasks themselves only carry the output path
+_WORKER_CHARTS: dict[str, Chart] = {}
+
+
+def _init_worker(charts: dict[str, Chart]) -> None:
+    matplotlib.use("Agg")
+    _WORKER_CHARTS.update(charts)
+
+
+def _draw_worker_chart(path: str) -> str:
+    draw_chart(_WORKER_CHARTS[path], path)
+    return path
+
+
+def render_charts(charts: dict[str, Chart], jobs: int = 1) -> None:
+    """
+    Save every chart to the path it is keyed by.
+
+    Charts are only ever saved, so the non-interactive Agg backend is used.
+    With more than one job they are drawn by a process pool.
+    """
+    matplotlib.use("Agg")
+
+    if jobs <= 1 or len(charts) <= 1:
+        for path, chart in charts.items():
+            draw_chart(chart, path)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(charts)),
+        initializer=_init_worker,
+        initargs=(charts,),
+    ) as pool:
+        # Consume the iterator so worker exceptions are raised here
+        for _ in pool.map(_draw_worker_chart, charts):
+            pass
+
+
+def draw_heatmap(matrix: pd.DataFrame, title: str, path: str) -> None:
+    """
+    Save a source x destination node matrix of BestRateMBs, every cell
+    annotated with its rate in GB/s. Pairs that weren't measured are left
+    grey and marked "–".
+    """
+    matplotlib.use("Agg")
+
+    fig = plt.figure(figsize=(2 + 1.5 * len(matrix.columns), 1.5 + 1.5 * len(matrix)))
+    ax = plt.subplot(111)
+
+    rates = np.ma.masked_invalid(matrix.to_numpy(dtype=float))
+
+    cmap = plt.get_cmap("viridis").copy()
+    cmap.set_bad("lightgrey")
+
+    image = ax.imshow(rates, cmap=cmap)
+    fig.colorbar(image, ax=ax, format=FuncFormatter(_format_rate), label="Best Rate (MB/s)")
+
+    ax.set_xticks(range(len(matrix.columns)), labels=matrix.columns)
+    ax.set_yticks(range(len(matrix.index)), labels=matrix.index)
+
+    for (i, j), rate in np.ndenumerate(rates.filled(np.nan)):
+        if np.isnan(rate):
+            ax.text(j, i, "–", ha="center", va="center", color="black")
+        else:
+            ax.text(j, i, f"{rate / 1000:.1f}", ha="center", va="center", color="white")
+
+    ax.set_xlabel("Destination node")
+    ax.set_ylabel("Source node")
+    ax.set_title(title)
+
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
@@ -0,0 +1,145 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Columns produced by stream_generate_results.py and the types they are stored as.
+# Anything not listed here is written with whatever type pandas inferred.
+RESULT_SCHEMA: dict[str, pa.DataType] = {
+    "CpuNode": pa.int32(),
+    "Threads": pa.int32(),
+    "ArraySize": pa.int64(),
+    "Function": pa.string(),
+    "Direction": pa.string(),
+    "Placement": pa.string(),
+    "Ratio": pa.string(),
+    "DRAMShare": pa.float64(),
+    "BestRateMBs": pa.float64(),
+    "AvgTime": pa.float64(),
+    "MinTime": pa.float64(),
+    "MaxTime": pa.float64(),
+}
+
+# Small enough that one sweep spans several row groups, so the min/max
+# statistics on Threads/ArraySize can actually skip data when filtering
+ROW_GROUP_SIZE = 4096
+
+EXPORT_FORMATS = ("xlsx", "csv")
+
+# Parquet schema metadata key holding the memory type of every NUMA node of
+# the host the results were measured on, e.g. {"0": "DRAM", "2": "CXL"}
+NODE_TYPES_KEY = b"cms.node_types"
+
+
+def _schema_for(df: pd.DataFrame) -> pa.Schema:
+    fields = []
+
+    for column in df.columns:
+        if column in RESULT_SCHEMA:
+            fields.append(pa.field(column, RESULT_SCHEMA[column]))
+        else:
+            fields.append(pa.field(column, pa.Schema.from_pandas(df[[column]]).field(0).type))
+
+    return pa.schema(fields)
+
+
+def write_results(
+    df: pd.DataFrame, path: str | Path, node_types: dict[int, str] | None = None
+) -> None:
+    table = pa.Table.from_pandas(df, schema=_schema_for(df), preserve_index=False)
+
+    if node_types:
+        table = table.replace_schema_metadata(
+            {
+                **(table.schema.metadata or {}),
+                NODE_TYPES_KEY: json.dumps({str(n): t for n, t in node_types.items()}),
+            }
+        )
+
+    pq.write_table(
+        table,
+        path,
+        row_group_size=ROW_GROUP_SIZE,
+        write_statistics=True,
+        use_dictionary=["Function", "Direction", "Placement", "Ratio"],
+        compression="zstd",
+    )
+
+
+def export_results(df: pd.DataFrame, path: str | Path) -> None:
+    suffix = Path(path).suffix.lower().removeprefix(".")
+
+    if suffix == "xlsx":
+        df.to_excel(path, index=False)
+    elif suffix == "csv":
+        df.to_csv(path, index=False)
+    else:
+        raise ValueError(f"Cannot export to '{path}', expected one of {EXPORT_FORMATS}")
+
+
+def read_results(
+    path: str | Path,
+    functions: list[str] | None = None,
+    array_sizes: list[int] | None = None,
+    threads: list[int] | None = None,
+    placements: list[str] | None = None,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Load a STREAM results file, only keeping the rows that match the given
+    functions/array sizes/threads/placements.
+
+    Parquet files have the filters pushed down to the row groups, so unneeded
+    data is never decoded. Excel and CSV files are still accepted for older
+    sweeps, in which case the same filters are applied after loading.
+    """
+    path = Path(path)
+
+    predicates = [
+        (column, "in", list(values))
+        for column, values in (
+            ("Function", functions),
+            ("ArraySize", array_sizes),
+            ("Threads", threads),
+            ("Placement", placements),
+        )
+        if values is not None and len(values)
+    ]
+
+    if path.suffix.lower() == ".parquet":
+        return pd.read_parquet(
+            path,
+            engine="pyarrow",
+            columns=columns,
+            filters=predicates or None,
+        )
+
+    if path.suffix.lower() == ".csv":
+        df = pd.read_csv(path)
+    else:
+        df = pd.read_excel(path)
+
+    for column, _, values in predicates:
+        df = df[df[column].isin(values)]
+
+    if columns is not None:
+        df = df[columns]
+
+    return df.reset_index(drop=True)
+
+
+def read_node_types(path: str | Path) -> dict[int, str] | None:
+    """
+    The NUMA node memory types recorded by write_results, None for Excel/CSV
+    files and Parquet files written without them.
+    """
+    path = Path(path)
+
+    if path.suffix.lower() != ".parquet":
+        return None
+
+    stored = (pq.read_schema(path).metadata or {}).get(NODE_TYPES_KEY)
+
+    return {int(n): t for n, t in json.loads(stored).items()} if stored else None
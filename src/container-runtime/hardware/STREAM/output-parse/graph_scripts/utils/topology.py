@@ -0,0 +1,140 @@
+import argparse
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+NODE_SYSFS = Path("/sys/devices/system/node")
+
+DIRECTION_PATTERN = r"^(?P<SrcNode>\d+)->(?P<DstNode>\d+)$"
+
+
+def parse_cpulist(cpulist: str) -> list[int]:
+    """
+    Expand a kernel CPU list such as "0-3,8,10-11" into [0, 1, 2, 3, 8, 10, 11].
+    """
+    cpus: list[int] = []
+
+    for part in cpulist.strip().split(","):
+        if not part:
+            continue
+
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+
+    return cpus
+
+
+def node_cpus(node: int, root: Path = NODE_SYSFS) -> list[int]:
+    return parse_cpulist((root / f"node{node}" / "cpulist").read_text())
+
+
+def node_types_from_sysfs(root: Path = NODE_SYSFS) -> dict[int, str]:
+    """
+    NUMA nodes with CPUs are DRAM, nodes without any (CPU-less) are CXL.
+    """
+    types: dict[int, str] = {}
+
+    for node_dir in sorted(root.glob("node[0-9]*")):
+        cpulist = (node_dir / "cpulist").read_text().strip()
+        types[int(node_dir.name.removeprefix("node"))] = "DRAM" if cpulist else "CXL"
+
+    return types
+
+
+def resolve_node_types(
+    explicit: dict[int, str] | None, stored: dict[int, str] | None, source: str
+) -> dict[int, str]:
+    """
+    The node types given with --node-types, else the ones recorded with the
+    results in source. This host's sysfs is only a last resort, as it
+    describes the machine the graphs are drawn on, not the one measured.
+    """
+    if explicit:
+        return explicit
+
+    if stored:
+        return stored
+
+    print(
+        f"Warning: {source} has no NUMA node types recorded, using this host's "
+        "topology instead. Set them with --node-types if it was measured elsewhere",
+        file=sys.stderr,
+    )
+
+    return node_types_from_sysfs()
+
+
+# "0=DRAM,1=DRAM,2=CXL"
+def node_types(value: str) -> dict[int, str]:
+    types: dict[int, str] = {}
+
+    for pair in value.split(","):
+        node, sep, memory = pair.partition("=")
+
+        if not sep or not node.strip().isdigit() or not memory.strip():
+            raise argparse.ArgumentTypeError(
+                f"'{pair}' is not of the form <node>=<memory type>"
+            )
+
+        types[int(node)] = memory.strip()
+
+    return types
+
+
+def split_direction(directions: pd.Series) -> pd.DataFrame:
+    """
+    "0->2" becomes SrcNode 0 and DstNode 2. Directions that aren't a node
+    pair (e.g. "interleave") are left as missing values.
+    """
+    return directions.str.extract(DIRECTION_PATTERN).astype("Int64")
+
+
+def label_memory_types(
+    directions: pd.Series,
+    types: dict[int, str],
+    per_node: bool = False,
+) -> pd.Series:
+    """
+    Name every row after the memory types its direction moves between, e.g.
+    "0->2" is "DRAM to CXL" and "0->1" is "DRAM" when both nodes are DRAM.
+
+    With per_node the node numbers are kept, so "0->2" and "1->3" don't get
+    averaged into the same line on hosts with more than one node per type.
+    """
+    nodes = split_direction(directions)
+
+    src, dst = nodes["SrcNode"].map(types), nodes["DstNode"].map(types)
+
+    unknown = sorted(
+        set(nodes["SrcNode"][src.isna() & nodes["SrcNode"].notna()])
+        | set(nodes["DstNode"][dst.isna() & nodes["DstNode"].notna()])
+    )
+    if unknown:
+        raise ValueError(
+            f"No memory type known for NUMA node(s) {', '.join(map(str, unknown))}"
+        )
+
+    if per_node:
+        src = src + " (node " + nodes["SrcNode"].astype(str) + ")"
+        dst = dst + " (node " + nodes["DstNode"].astype(str) + ")"
+
+    labels = pd.Series(
+        np.where(src == dst, src, src + " to " + dst), index=directions.index
+    )
+
+    return labels.where(nodes["SrcNode"].notna(), directions)
+
+
+def label_memory_types_by_position(
+    length: int, dram_to_cxl_rows: tuple[int, ...]
+) -> np.ndarray:
+    """
+    Fallback for DRAM+CXL files written before STREAM printed a Direction
+    column. Their rows come in blocks of 8 per (threads, array size), and
+    which of those 8 are DRAM to CXL depends on the STREAM version used.
+    """
+    return np.where(
+        np.isin(np.arange(length) % 8, dram_to_cxl_rows), "DRAM to CXL", "CXL to DRAM"
+    )
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+import argparse
+from pathlib import Path
+import shlex
+import subprocess
+import sys
+
+import pandas as pd
+
+from graph_scripts.utils import run_monitored
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run a benchmark (e.g. MLC under numactl) and check which NUMA nodes "
+            "its pages actually landed on"
+        )
+    )
+
+    parser.add_argument(
+        "-n",
+        "--numa-nodes",
+        type=str,
+        required=True,
+        help="The node(s) the pages are expected on, e.g. 2 or 0,2",
+    )
+
+    parser.add_argument(
+        "-i",
+        "--interval",
+        type=float,
+        required=False,
+        default=0.5,
+        help="Seconds between two samples of /proc/<pid>/numa_maps",
+    )
+
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        required=False,
+        default=0.9,
+        help="Flag the run when less than this share of the pages is on --numa-nodes",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        required=False,
+        help="Append the result as a row to this CSV file",
+    )
+
+    parser.add_argument(
+        "command",
+        nargs=argparse.REMAINDER,
+        help="The command to run, after a '--'",
+    )
+
+    args = parser.parse_args()
+
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+
+    if not command:
+        parser.error("no command given to run")
+
+    expected_nodes = {int(n) for n in args.numa_nodes.split(",")}
+
+    try:
+        output, placement = run_monitored(f"exec {shlex.join(command)}", args.interval)
+        returncode = 0
+    except subprocess.CalledProcessError as e:
+        output, returncode = e.output, e.returncode
+        placement = None
+
+    sys.stdout.buffer.write(output)
+    sys.stdout.flush()
+
+    if placement is None:
+        print(f"Command exited with {returncode}, page placement not checked")
+        sys.exit(returncode)
+
+    share = placement.share_on(expected_nodes)
+    ok = share >= args.threshold
+
+    print(f"Samples: {placement.samples}")
+    print(f"Resident pages per node: {placement.pages}")
+    print(f"MemUsed growth per node (MB): {placement.mem_used_delta_mb}")
+    print(f"Share on node(s) {args.numa_nodes}: {share:.1%}")
+
+    if not ok:
+        print(f"WARNING: below the {args.threshold:.0%} threshold")
+
+    if args.output:
+        row = pd.DataFrame(
+            [
+                {
+                    "Command": shlex.join(command),
+                    "ExpectedNodes": args.numa_nodes,
+                    **{f"Node{n}Pages": p for n, p in sorted(placement.pages.items())},
+                    "ExpectedNodeShare": round(share, 4),
+                    "PagePlacementOK": ok,
+                }
+            ]
+        )
+
+        path = Path(args.output)
+
+        # Rows from earlier runs may have pages on other nodes
+        if path.is_file():
+            row = pd.concat([pd.read_csv(path), row], ignore_index=True)
+
+        row.to_csv(path, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+
+import argparse
+from io import StringIO
+from math import gcd
+import os
+from pathlib import Path
+import time
+
+import pandas as pd
+
+from graph_scripts.utils import write_results, export_results, EXPORT_FORMATS
+from stream_generate_results import (
+    ARRAY_SIZES,
+    core_count_per_socket,
+    format_stream_output,
+    run_cmd,
+)
+
+# Per node weights used by MPOL_WEIGHTED_INTERLEAVE (Linux 6.9+)
+WEIGHTS_SYSFS = Path("/sys/kernel/mm/mempolicy/weighted_interleave")
+
+# DRAM:CXL, 1:0 and 0:1 are plain --membind runs on one node
+RATIOS: list[tuple[int, int]] = [
+    (1, 0),
+    (9, 1),
+    (7, 1),
+    (5, 1),
+    (4, 1),
+    (3, 1),
+    (2, 1),
+    (1, 1),
+    (1, 2),
+    (0, 1),
+]
+
+# The function whose bandwidth the search maximizes
+OBJECTIVE = "Triad"
+
+
+# "3:1"
+def ratio(value: str) -> tuple[int, int]:
+    dram, sep, cxl = value.partition(":")
+
+    if not sep or not dram.isdigit() or not cxl.isdigit():
+        raise argparse.ArgumentTypeError(f"'{value}' is not of the form <dram>:<cxl>")
+
+    dram, cxl = int(dram), int(cxl)
+
+    if dram == cxl == 0:
+        raise argparse.ArgumentTypeError(f"'{value}' doesn't put memory on any node")
+
+    # Sysfs weights are a u8
+    if dram > 255 or cxl > 255:
+        raise argparse.ArgumentTypeError(f"'{value}' has a weight above 255")
+
+    return dram, cxl
+
+
+def format_ratio(r: tuple[int, int]) -> str:
+    return f"{r[0]}:{r[1]}"
+
+
+def candidate_ratios(max_weight: int) -> list[tuple[int, int]]:
+    """
+    Every reduced DRAM:CXL ratio with weights up to max_weight, plus the
+    DRAM-only and CXL-only ends, ordered by the share of pages put on DRAM.
+    """
+    candidates = {(1, 0), (0, 1)}
+
+    for dram in range(1, max_weight + 1):
+        for cxl in range(1, max_weight + 1):
+            if gcd(dram, cxl) == 1:
+                candidates.add((dram, cxl))
+
+    return sorted(candidates, key=lambda r: r[0] / (r[0] + r[1]))
+
+
+def set_weights(dram_node: int, cxl_node: int, r: tuple[int, int]) -> None:
+    for node, weight in ((dram_node, r[0]), (cxl_node, r[1])):
+        (WEIGHTS_SYSFS / f"node{node}").write_text(str(weight))
+
+
+def read_weights(nodes: list[int]) -> dict[int, str]:
+    return {n: (WEIGHTS_SYSFS / f"node{n}").read_text().strip() for n in nodes}
+
+
+def memory_policy(dram_node: int, cxl_node: int, r: tuple[int, int]) -> str:
+    if r[1] == 0:
+        return f"--membind={dram_node}"
+    if r[0] == 0:
+        return f"--membind={cxl_node}"
+
+    set_weights(dram_node, cxl_node, r)
+    return f"--weighted-interleave={dram_node},{cxl_node}"
+
+
+def run_ratio(
+    args: argparse.Namespace, r: tuple[int, int], thread_count: int, array_size: int
+) -> pd.DataFrame:
+    cmd = (
+        f"export OMP_NUM_THREADS={thread_count} && "
+        f"numactl --cpunodebind={args.cpu} "
+        f"{memory_policy(args.dram_node, args.cxl_node, r)} "
+        f"./{args.binary_path} --ntimes {args.ntimes} "
+        f"--array-size {array_size} --malloc"
+    )
+
+    formatted = format_stream_output(run_cmd(cmd), thread_count, array_size)
+    out = "\n".join(",".join(str(y) for y in x) for x in formatted)
+
+    # --malloc runs report a 0->0 direction, the placement is the ratio instead
+    df = pd.read_csv(StringIO(out)).drop(columns=["Placement", "Direction"])
+    df.insert(2, "Ratio", format_ratio(r))
+    df.insert(3, "DRAMShare", r[0] / (r[0] + r[1]))
+
+    return df
+
+
+def objective(df: pd.DataFrame) -> float:
+    return float(df.loc[df["Function"] == OBJECTIVE, "BestRateMBs"].max())
+
+
+def search_ratio(
+    args: argparse.Namespace,
+    candidates: list[tuple[int, int]],
+    thread_count: int,
+    array_size: int,
+) -> list[pd.DataFrame]:
+    """
+    Ternary search over the candidates for the ratio with the highest Triad
+    bandwidth, assuming bandwidth rises then falls as pages move from DRAM
+    to CXL. Each ratio is run at most once.
+    """
+    runs: dict[int, pd.DataFrame] = {}
+
+    def measure(i: int) -> float:
+        if i not in runs:
+            runs[i] = run_ratio(args, candidates[i], thread_count, array_size)
+            print(
+                f"  {format_ratio(candidates[i])}: "
+                f"{objective(runs[i]):.1f} MB/s {OBJECTIVE}"
+            )
+        return objective(runs[i])
+
+    lo, hi = 0, len(candidates) - 1
+
+    while hi - lo > 2:
+        m1 = lo + (hi - lo) // 3
+        m2 = hi - (hi - lo) // 3
+
+        if measure(m1) < measure(m2):
+            lo = m1 + 1
+        else:
+            hi = m2 - 1
+
+    for i in range(lo, hi + 1):
+        measure(i)
+
+    return list(runs.values())
+
+
+def best_ratios(df: pd.DataFrame) -> pd.DataFrame:
+    triad = df[df["Function"] == OBJECTIVE]
+    rates = (
+        triad.groupby(["Threads", "ArraySize", "Ratio"], sort=False)["BestRateMBs"]
+        .mean()
+        .reset_index()
+    )
+    idx = rates.groupby(["Threads", "ArraySize"], sort=False)["BestRateMBs"].idxmax()
+
+    return rates.loc[idx].reset_index(drop=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Sweep DRAM:CXL weighted interleave ratios with STREAM and find the "
+            "ratio with the highest Triad bandwidth for every thread count"
+        )
+    )
+
+    parser.add_argument(
+        "-b",
+        "--binary-path",
+        type=str,
+        required=True,
+        help="Where the stream binary/executable is located",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=str,
+        required=True,
+        help="Where the output directory should be located",
+    )
+
+    parser.add_argument(
+        "-d", "--dram-node", type=int, required=True, help="The DRAM NUMA node"
+    )
+
+    parser.add_argument(
+        "-c", "--cxl-node", type=int, required=True, help="The CXL NUMA node"
+    )
+
+    parser.add_argument(
+        "-w",
+        "--ratios",
+        type=ratio,
+        required=False,
+        nargs="+",
+        default=RATIOS,
+        help="DRAM:CXL weights to sweep, e.g. 3:1 (1:0 and 0:1 bind to one node)",
+    )
+
+    parser.add_argument(
+        "-s",
+        "--search",
+        type=int,
+        required=False,
+        metavar="MAX_WEIGHT",
+        help=(
+            "Instead of the --ratios grid, search all ratios with weights up to "
+            "MAX_WEIGHT for the best Triad bandwidth of each thread count"
+        ),
+    )
+
+    parser.add_argument(
+        "-r",
+        "--ntimes",
+        type=int,
+        required=False,
+        default=100,
+        help="How many times each for loop should run for",
+    )
+
+    parser.add_argument(
+        "-a",
+        "--array-sizes",
+        type=int,
+        required=False,
+        nargs="+",
+        default=ARRAY_SIZES[-1:],
+        help="The arrays that should be ran",
+    )
+
+    parser.add_argument(
+        "-t",
+        "--threads",
+        type=int,
+        required=False,
+        nargs="+",
+        default=core_count_per_socket(),
+        help="The thread counts that the program should use",
+    )
+
+    parser.add_argument(
+        "-p",
+        "--prefix",
+        type=str,
+        required=False,
+        default="interleave",
+        help="The prefix for the output files",
+    )
+
+    parser.add_argument(
+        "--cpu",
+        type=int,
+        required=False,
+        help="The CPU socket which 'cpunodebind' is attached to, the DRAM node by default",
+    )
+
+    parser.add_argument(
+        "-e",
+        "--export",
+        type=str,
+        required=False,
+        nargs="+",
+        choices=EXPORT_FORMATS,
+        default=[],
+        help="Also export the results next to the Parquet file in these formats",
+    )
+
+    args = parser.parse_args()
+
+    if args.cpu is None:
+        args.cpu = args.dram_node
+
+    if not WEIGHTS_SYSFS.is_dir():
+        parser.error(
+            f"{WEIGHTS_SYSFS} does not exist, weighted interleave needs Linux 6.9 or newer"
+        )
+
+    if args.search is not None and args.search < 1:
+        parser.error("--search needs a MAX_WEIGHT of at least 1")
+
+    directory = args.output_dir
+    nodes = f"{args.dram_node}{args.cxl_node}"
+    relative_path = f"{directory}/{args.prefix}_{nodes}.parquet"
+    best_path = f"{directory}/{args.prefix}_{nodes}_best.csv"
+
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    print(f"Binary file: {args.binary_path}")
+    print(f"DRAM node: {args.dram_node}, CXL node: {args.cxl_node}")
+    print(f"CPU node bind: {args.cpu}")
+    print(f"Output file: {relative_path}")
+    print(f"Array sizes: {', '.join(str(x) for x in args.array_sizes)}")
+    print(f"Threads: {', '.join(str(x) for x in args.threads)}")
+
+    if args.search is not None:
+        candidates = candidate_ratios(args.search)
+        print(f"Searching {len(candidates)} ratios with weights up to {args.search}")
+    else:
+        print(f"Ratios: {', '.join(format_ratio(r) for r in args.ratios)}")
+    print()
+
+    # The weights are system wide, put them back once the sweep is over
+    previous_weights = read_weights([args.dram_node, args.cxl_node])
+
+    frames = []
+    very_start = time.time()
+
+    try:
+        for thread_count in args.threads:
+            for array_size in args.array_sizes:
+                start = time.time()
+                print(f"Started {thread_count} threads, {array_size} array size")
+
+                if args.search is not None:
+                    frames.extend(
+                        search_ratio(args, candidates, thread_count, array_size)
+                    )
+                else:
+                    for r in args.ratios:
+                        df = run_ratio(args, r, thread_count, array_size)
+                        print(
+                            f"  {format_ratio(r)}: {objective(df):.1f} MB/s {OBJECTIVE}"
+                        )
+                        frames.append(df)
+
+                print(f"Done in {round(time.time() - start, 3)}s")
+    finally:
+        for node, weight in previous_weights.items():
+            (WEIGHTS_SYSFS / f"node{node}").write_text(weight)
+
+    df = pd.concat(frames, ignore_index=True)
+
+    write_results(df, relative_path)
+
+    print(f"{round(time.time() - very_start, 3)}s: Results outputted to {relative_path}")
+
+    for fmt in args.export:
+        export_path = str(Path(relative_path).with_suffix(f".{fmt}"))
+        export_results(df, export_path)
+        print(f"Exported to {export_path}")
+
+    best = best_ratios(df)
+    export_results(best, best_path)
+
+    print(f"\nBest DRAM:CXL ratio for {OBJECTIVE} ({best_path}):")
+    print(best.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+
+import argparse
+from io import StringIO
+from itertools import combinations_with_replacement
+import os
+from pathlib import Path
+import time
+
+import pandas as pd
+
+from graph_scripts.utils import (
+    file_exists,
+    read_results,
+    write_results,
+    export_results,
+    EXPORT_FORMATS,
+    node_types_from_sysfs,
+    split_direction,
+    draw_heatmap,
+)
+from stream_generate_results import core_count_per_socket, format_stream_output, run_cmd
+
+# Large enough to be well past the caches, small enough for a CXL node
+ARRAY_SIZE = 100_000_000
+
+
+def node_pairs(nodes: list[int]) -> list[tuple[int, int]]:
+    """
+    Every unordered pair of memory nodes, including a node with itself.
+
+    STREAM measures both directions of a pair in one run, so 0,2 also
+    gives 2->0 and the reverse pair isn't run again.
+    """
+    return list(combinations_with_replacement(sorted(nodes), 2))
+
+
+def run_pair(
+    args: argparse.Namespace, cpu_node: int, src: int, dst: int
+) -> pd.DataFrame:
+    numa_nodes = f"{src}" if src == dst else f"{src},{dst}"
+
+    cmd = (
+        f"export OMP_NUM_THREADS={args.threads} && "
+        f"numactl --cpunodebind={cpu_node} "
+        f"./{args.binary_path} --ntimes {args.ntimes} "
+        f"--numa-nodes {numa_nodes} --array-size {args.array_size}"
+    )
+
+    formatted = format_stream_output(run_cmd(cmd), args.threads, args.array_size)
+    out = "\n".join(",".join(str(y) for y in x) for x in formatted)
+
+    df = pd.read_csv(StringIO(out)).drop(columns="Placement")
+    df.insert(0, "CpuNode", cpu_node)
+
+    return df
+
+
+def bandwidth_matrices(df: pd.DataFrame, function: str) -> dict[int, pd.DataFrame]:
+    """
+    One source x destination matrix of BestRateMBs per CPU node.
+    """
+    rows = df[df["Function"] == function]
+    rows = pd.concat([rows, split_direction(rows["Direction"])], axis=1)
+
+    return {
+        cpu_node: group.pivot_table(
+            index="SrcNode", columns="DstNode", values="BestRateMBs", aggfunc="max"
+        )
+        for cpu_node, group in rows.groupby("CpuNode")
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run STREAM for every CPU node and every pair of memory nodes and "
+            "write the bandwidth between them as a matrix and heatmap"
+        )
+    )
+
+    parser.add_argument(
+        "-b",
+        "--binary-path",
+        type=str,
+        required=True,
+        help="Where the stream binary/executable is located",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=str,
+        required=True,
+        help="Where the output directory should be located",
+    )
+
+    parser.add_argument(
+        "-c",
+        "--cpu-nodes",
+        type=int,
+        nargs="+",
+        required=False,
+        help="The nodes whose CPUs run STREAM, defaults to every node with CPUs",
+    )
+
+    parser.add_argument(
+        "-m",
+        "--memory-nodes",
+        type=int,
+        nargs="+",
+        required=False,
+        help="The nodes the arrays are allocated on, defaults to every node",
+    )
+
+    parser.add_argument(
+        "-t",
+        "--threads",
+        type=int,
+        required=False,
+        default=max(core_count_per_socket()),
+        help="The thread count of every run, defaults to the cores of one socket",
+    )
+
+    parser.add_argument(
+        "-a",
+        "--array-size",
+        type=int,
+        required=False,
+        default=ARRAY_SIZE,
+        help="The array size of every run",
+    )
+
+    parser.add_argument(
+        "-r",
+        "--ntimes",
+        type=int,
+        required=False,
+        default=20,
+        help="How many times each for loop should run for",
+    )
+
+    parser.add_argument(
+        "-f",
+        "--functions",
+        type=str,
+        nargs="+",
+        required=False,
+        default=["Triad"],
+        help="The functions to draw a matrix and heatmap for",
+    )
+
+    parser.add_argument(
+        "-i",
+        "--input",
+        type=file_exists,
+        required=False,
+        help="Draw the matrices of an earlier run's Parquet file instead of running STREAM",
+    )
+
+    parser.add_argument(
+        "-p",
+        "--prefix",
+        type=str,
+        required=False,
+        default="matrix",
+        help="The prefix for the output files",
+    )
+
+    parser.add_argument(
+        "-e",
+        "--export",
+        type=str,
+        required=False,
+        nargs="+",
+        choices=EXPORT_FORMATS,
+        default=[],
+        help="Also export the results next to the Parquet file in these formats",
+    )
+
+    args = parser.parse_args()
+
+    directory = args.output_dir
+
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    if args.input:
+        df = read_results(args.input, functions=args.functions)
+    else:
+        types = node_types_from_sysfs()
+        cpu_nodes = args.cpu_nodes or [n for n, t in types.items() if t == "DRAM"]
+        pairs = node_pairs(args.memory_nodes or list(types))
+
+        print(f"Binary file: {args.binary_path}")
+        print(f"CPU nodes: {', '.join(str(x) for x in cpu_nodes)}")
+        print(f"Memory node pairs: {', '.join(f'{s},{d}' for s, d in pairs)}")
+        print(f"Threads: {args.threads}")
+        print(f"Array size: {args.array_size}")
+        print()
+
+        runs = []
+        final_calculations = len(cpu_nodes) * len(pairs)
+        index = 1
+
+        very_start = time.time()
+
+        for cpu_node in cpu_nodes:
+            for src, dst in pairs:
+                start = time.time()
+                runs.append(run_pair(args, cpu_node, src, dst))
+                elapsed = round(time.time() - start, 3)
+
+                print(
+                    f"Done in {elapsed}s ({index}/{final_calculations}) : "
+                    f"CPU node {cpu_node}, memory nodes {src},{dst}"
+                )
+
+                index += 1
+
+        df = pd.concat(runs, ignore_index=True)
+
+        relative_path = f"{directory}/{args.prefix}.parquet"
+        write_results(df, relative_path, node_types=types)
+
+        print(f"{round(time.time() - very_start, 3)}s: Results outputted to {relative_path}")
+
+        for fmt in args.export:
+            export_path = str(Path(relative_path).with_suffix(f".{fmt}"))
+            export_results(df, export_path)
+            print(f"Exported to {export_path}")
+
+    for function in args.functions:
+        matrices = bandwidth_matrices(df, function)
+        tables = []
+
+        for cpu_node, matrix in matrices.items():
+            print(
+                f"\n{function} MB/s from CPU node {cpu_node} "
+                "(rows: source, columns: destination)"
+            )
+            print(matrix.round(1).to_string(na_rep="–"))
+
+            draw_heatmap(
+                matrix,
+                f"STREAM {function}, CPU node {cpu_node}",
+                f"{directory}/{args.prefix}_{function.lower()}_cpu{cpu_node}.png",
+            )
+
+            table = matrix.reset_index()
+            table.insert(0, "CpuNode", cpu_node)
+            tables.append(table)
+
+        matrix_path = f"{directory}/{args.prefix}_{function.lower()}.csv"
+        pd.concat(tables, ignore_index=True).to_csv(matrix_path, index=False)
+        print(f"Matrix written to {matrix_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,9 @@ Handles two modes:
 Usage:
     python3 parse_results.py <results_dir>
 
+    Outside the ocp-cms-base image, put src/container-runtime/utils on
+    PYTHONPATH first, see utils/README.md.
+
 JSON output:  results_stream.json  (single combined file)
 CSV output:   results_stream.csv and/or results_stream_scaling.csv
 """
@@ -25,6 +28,8 @@ import re
 import sys
 from datetime import datetime, timezone
 
+from cms_vmstat import load_vmstat_delta
+
 
 def log(msg):
     print(f"[PARSER] {msg}")
@@ -294,12 +299,13 @@ def main():
     # ----- Write JSON (primary output) -----
     json_output = {
         "benchmark": "stream",
-        "parser_version": "1.0.0",
+        "parser_version": "1.1.0",
         "timestamp_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
         "source_dir": os.path.basename(results_dir),
         "configuration": single_config,
         "single_run": single_data,
         "scaling": scaling_data,
+        "kernel_tiering": load_vmstat_delta(results_dir),
         "errors": all_errors if all_errors else None,
     }
 
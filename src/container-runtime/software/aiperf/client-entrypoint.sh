@@ -198,7 +198,11 @@ cd "${AIPERF_DIR}"
 
 export HF_TOKEN="${HF_TOKEN:-}"
 
+cms_start_vmstat_sampler "${RESULTS_MOUNT}" "${VMSTAT_INTERVAL:-5}"
+cms_start_telemetry "${RESULTS_MOUNT}" "${TELEMETRY_INTERVAL:-0.5}"
 aiperf "${AIPERF_ARGS[@]}" 2>&1 || BENCH_EXIT=$?
+cms_stop_telemetry
+cms_stop_vmstat_sampler
 
 if [ ${BENCH_EXIT} -ne 0 ]; then
     cms_log_error "AIPerf exited with code ${BENCH_EXIT}"
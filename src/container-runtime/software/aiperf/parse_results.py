@@ -18,6 +18,9 @@ Output:
 
 Usage:
     python3 parse_results.py <results_dir> <suite_name>
+
+    Outside the ocp-cms-base image, put src/container-runtime/utils on
+    PYTHONPATH first, see utils/README.md.
 """
 
 import csv
@@ -27,6 +30,8 @@ import os
 import sys
 from datetime import datetime, timezone
 
+from cms_vmstat import load_vmstat_delta
+
 
 def log(msg):
     print(f"[PARSER] {msg}")
@@ -221,7 +226,7 @@ def parse_aiperf_results(results_dir, suite_name):
     json_output = {
         "benchmark": "aiperf",
         "test": suite_name,
-        "parser_version": "1.0.0",
+        "parser_version": "1.1.0",
         "timestamp_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
     }
 
@@ -242,6 +247,7 @@ def parse_aiperf_results(results_dir, suite_name):
                 json_output[k] = v
 
     json_output["results"] = results if results else None
+    json_output["kernel_tiering"] = load_vmstat_delta(results_dir)
     json_output["errors"] = errors if errors else None
 
     json_path_out = os.path.join(results_dir, f"results_aiperf_{suite_name}.json")
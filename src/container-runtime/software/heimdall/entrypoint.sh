@@ -123,7 +123,15 @@ run_build() {
 
 run_run() {
     cms_log_info "Running ${BENCHMARK} / ${CONFIG}..."
-    uv run heimdall bench run "${BENCHMARK}" "${CONFIG}"
+    cms_start_vmstat_sampler "${RESULTS_MOUNT}" "${VMSTAT_INTERVAL:-5}"
+    cms_start_telemetry "${RESULTS_MOUNT}" "${TELEMETRY_INTERVAL:-0.5}"
+
+    local rc=0
+    uv run heimdall bench run "${BENCHMARK}" "${CONFIG}" || rc=$?
+
+    cms_stop_telemetry
+    cms_stop_vmstat_sampler
+    return ${rc}
 }
 
 BENCH_EXIT=0
@@ -10,6 +10,9 @@ it into:
 Usage:
     python3 parse_results.py <results_dir> <benchmark> <config>
 
+    Outside the ocp-cms-base image, put src/container-runtime/utils on
+    PYTHONPATH first, see utils/README.md.
+
 JSON output:  results_<benchmark>_<config>.json  (single combined file)
 CSV output:   results_<benchmark>_<config>.csv   (flat table, fallback)
 """
@@ -22,6 +25,8 @@ import re
 import sys
 from datetime import datetime, timezone
 
+from cms_vmstat import load_vmstat_delta
+
 
 def log(msg):
     print(f"[PARSER] {msg}")
@@ -76,9 +81,10 @@ def parse_bw_latency(results_dir):
     json_output = {
         "benchmark": "heimdall",
         "test": "bw_vs_latency",
-        "parser_version": "1.0.0",
+        "parser_version": "1.1.0",
         "timestamp_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
         "results": results if results else None,
+        "kernel_tiering": load_vmstat_delta(results_dir),
         "errors": errors if errors else None,
     }
     json_path = os.path.join(results_dir, "results_bw_latency.json")
@@ -268,10 +274,11 @@ def parse_llm(results_dir, config):
     json_output = {
         "benchmark": "heimdall",
         "test": f"llm_{config}",
-        "parser_version": "1.0.0",
+        "parser_version": "1.1.0",
         "timestamp_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
         "summary": summary_results if summary_results else None,
         "detail": detail_results if detail_results else None,
+        "kernel_tiering": load_vmstat_delta(results_dir),
         "errors": errors if errors else None,
     }
     json_path = os.path.join(results_dir, f"results_llm_{config}.json")
@@ -352,10 +359,11 @@ def parse_lockfree(results_dir):
     json_output = {
         "benchmark": "heimdall",
         "test": "lockfree",
-        "parser_version": "1.0.0",
+        "parser_version": "1.1.0",
         "timestamp_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
         "results": results if results else None,
         "raw_structure": raw_data,
+        "kernel_tiering": load_vmstat_delta(results_dir),
         "errors": errors if errors else None,
     }
     json_path = os.path.join(results_dir, "results_lockfree.json")
@@ -146,12 +146,16 @@ MODEL_ORG=$(echo "${LMBENCH_MODEL_URL:-meta-llama/Llama-3.1-8B-Instruct}" | cut
 mkdir -p "${LMBENCH_DIR}/4-latest-results/${MODEL_ORG}"
 cms_log_info "Pre-created results dir: 4-latest-results/${MODEL_ORG}"
 
+cms_start_vmstat_sampler "${RESULTS_MOUNT}" "${VMSTAT_INTERVAL:-5}"
+cms_start_telemetry "${RESULTS_MOUNT}" "${TELEMETRY_INTERVAL:-0.5}"
 python3 run-bench.py \
     --start-from 3 \
     --model-url "${LMBENCH_MODEL_URL:-meta-llama/Llama-3.1-8B-Instruct}" \
     --hf-token "${HF_TOKEN}" \
     --key "${MODEL_KEY}" \
     2>&1 || BENCH_EXIT=$?
+cms_stop_telemetry
+cms_stop_vmstat_sampler
 
 if [ ${BENCH_EXIT} -ne 0 ]; then
     cms_log_error "LMBench exited with code ${BENCH_EXIT}"
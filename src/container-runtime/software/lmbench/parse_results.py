@@ -18,6 +18,9 @@ Output:
 
 Usage:
     python3 parse_results.py <results_dir> <suite_name>
+
+    Outside the ocp-cms-base image, put src/container-runtime/utils on
+    PYTHONPATH first, see utils/README.md.
 """
 
 import csv
@@ -29,6 +32,8 @@ import sys
 from datetime import datetime, timezone
 from statistics import mean, median
 
+from cms_vmstat import load_vmstat_delta
+
 
 KNOWN_WORKLOADS = (
     "synthetic", "sharegpt", "agentic", "random", "strict",
@@ -222,7 +227,7 @@ def parse_lmbench_results(results_dir, suite_name):
     json_output = {
         "benchmark": "lmbench",
         "test": suite_name,
-        "parser_version": "2.0.0",
+        "parser_version": "2.1.0",
         "timestamp_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
     }
 
@@ -246,6 +251,7 @@ def parse_lmbench_results(results_dir, suite_name):
                 json_output[k] = v
 
     json_output["results"] = results if results else None
+    json_output["kernel_tiering"] = load_vmstat_delta(results_dir)
     json_output["errors"] = errors if errors else None
 
     json_path = os.path.join(results_dir, f"results_lmbench_{suite_name}.json")
@@ -39,9 +39,11 @@ bench_exit=$?
 
 # -------------------------------------------------------------------------
 # Parse results into standardized JSON + CSV
-# (run_memcached.sh already writes raw_results.txt and a basic results.csv)
+# (run_memcached.sh already writes raw_results.txt and a basic results.csv,
+#  with LOAD_GENERATOR=loadgen memcached_loadgen.py wrote the JSON + CSV itself
+#  and the parser only adds results.csv and the kernel tiering counters to them)
 # -------------------------------------------------------------------------
-if [ -f "${RESULTS_DIR}/raw_results.txt" ]; then
+if [ -f "${RESULTS_DIR}/raw_results.txt" ] || [ -f "${RESULTS_DIR}/results_memcached.json" ]; then
     echo "[INFO] Parsing memcached results into JSON..."
     python3 /opt/memcached-bench/parse_results.py "${RESULTS_DIR}" || \
         echo "[WARN] Results parser returned non-zero"
@@ -0,0 +1,971 @@
+#!/usr/bin/env python3
+"""
+OCP SRV CMS - Memcached asyncio Load Generator (memcached_loadgen.py)
+
+Drives one or more memcached servers over the text (get/set) or meta (mg/ms) protocol
+from one asyncio event loop per worker process and records the latency of
+every operation into HDR-style histograms:
+  - closed loop (default): every connection sends its next request as soon
+    as the previous one is answered, the throughput is whatever the server
+    sustains at that concurrency
+  - open loop (--rate): requests are sent on a fixed or Poisson schedule
+    whatever the server does, and their latency is measured from the time
+    they were due, so a stalled server shows up in the tail instead of
+    quietly lowering the request rate (coordinated omission)
+
+With several servers every key is placed on a weighted ketama consistent hash
+ring, each server owning a share of the keys in proportion to its weight, and
+every connection holds a socket to each server. Results are also reported per
+server, with its memcached `stats` counters, and for all of them together.
+
+Writes the same files as parse_results.py does for a memaslap run, with the
+latency percentiles and histograms added:
+  - results_memcached.json (primary)
+  - results_memcached.csv (summary) + results_memcached_stats.csv (periodic)
+  - results_memcached_latency.csv (percentiles per operation)
+  - results_memcached_instances.csv (one row per server, with several servers)
+and prints a memaslap-style report, ending in its "Run time:" summary line.
+
+Usage:
+    python3 memcached_loadgen.py [-s host:port[:weight],...] [-d 180s] [-r <ops/s>] [-o <results_dir>] ...
+
+    Outside the ocp-cms-base image, put src/container-runtime/utils on
+    PYTHONPATH first, see utils/README.md.
+"""
+
+import argparse
+import asyncio
+import bisect
+import collections
+import csv
+import glob
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from parse_results import (PARSER_VERSION, analyze_statistics, load_vmstat_delta, parse_instances,
+                           parse_run_metadata, promote_analysis, write_instances_csv, write_stats_csv,
+                           write_summary_csv)
+
+OPERATIONS = ("get", "set")
+
+# Percentiles reported in the summary and results_memcached_latency.csv
+PERCENTILES = (50, 90, 99, 99.9, 99.99)
+
+# Keys written per round trip while prefilling
+PREFILL_BATCH = 100
+
+# Seconds the workers get to start up before the common start time
+START_DELAY_S = 1.0
+
+# Seconds to wait for the responses still outstanding at the end of the run
+DRAIN_TIMEOUT_S = 5.0
+
+# The memcached protocol limits keys to 250 bytes
+KEY_FORMAT = "cms:{:012d}"
+
+# Points of a server on the consistent hash ring at the average weight, as libmemcached's ketama
+KETAMA_POINTS = 160
+
+# Key to server map entries are single bytes
+MAX_SERVERS = 255
+
+# memcached `stats` counters reported per instance
+SERVER_STATS = ("curr_items", "bytes", "limit_maxbytes", "evictions", "get_hits", "get_misses",
+                "curr_connections")
+
+
+def log(msg):
+    print(f"[LOADGEN] {msg}", flush=True)
+
+
+class ProtocolError(Exception):
+    pass
+
+
+# =============================================================================
+# HDR-style latency histogram
+# =============================================================================
+
+# Values below SUB_BUCKETS are counted exactly, every power of two above
+# is split into SUB_BUCKETS / 2 linear buckets, i.e. ~3 significant digits
+SUB_BUCKET_BITS = 11
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+HALF_BUCKETS = SUB_BUCKETS >> 1
+
+
+def bucket_index(value):
+    if value < SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return SUB_BUCKETS + (shift - 1) * HALF_BUCKETS + (value >> shift) - HALF_BUCKETS
+
+
+def bucket_upper(index):
+    """Highest value counted in a bucket, as HdrHistogram reports percentiles."""
+    if index < SUB_BUCKETS:
+        return index
+    shift, sub = divmod(index - SUB_BUCKETS, HALF_BUCKETS)
+    shift += 1
+    return ((sub + HALF_BUCKETS + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Latencies in nanoseconds, with their exact count, sum, min and max."""
+
+    __slots__ = ("counts", "total", "sum_ns", "sum_sq", "min_ns", "max_ns", "bytes", "misses")
+
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+        self.sum_ns = 0
+        self.sum_sq = 0.0
+        self.min_ns = 0
+        self.max_ns = 0
+        # Bytes sent and received, and get misses, of the operations recorded
+        self.bytes = 0
+        self.misses = 0
+
+    def record(self, value_ns, nbytes, miss=False):
+        index = bucket_index(value_ns)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        if not self.total or value_ns < self.min_ns:
+            self.min_ns = value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+        self.total += 1
+        self.sum_ns += value_ns
+        self.sum_sq += value_ns * value_ns
+        self.bytes += nbytes
+        self.misses += miss
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        if other.total and (not self.total or other.min_ns < self.min_ns):
+            self.min_ns = other.min_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        self.total += other.total
+        self.sum_ns += other.sum_ns
+        self.sum_sq += other.sum_sq
+        self.bytes += other.bytes
+        self.misses += other.misses
+        return self
+
+    def percentile(self, p):
+        """Latency in ns at percentile p (0-100), None without any operation."""
+        if not self.total:
+            return None
+        target = max(1, math.ceil(self.total * p / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(bucket_upper(index), self.max_ns)
+        return self.max_ns
+
+    def mean(self):
+        return self.sum_ns / self.total if self.total else None
+
+    def std_dev(self):
+        if not self.total:
+            return None
+        mean = self.sum_ns / self.total
+        return math.sqrt(max(0.0, self.sum_sq / self.total - mean * mean))
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        for name in cls.__slots__:
+            setattr(histogram, name, data[name])
+        return histogram
+
+
+# =============================================================================
+# Workload: keys, values and the get/set mix
+# =============================================================================
+
+class ZipfKeys:
+    """
+    Zipfian key indexes, 0 the most popular, with the method of Gray et al.
+    ("Quickly generating billion-record synthetic databases") YCSB uses. The
+    zeta constant is O(keys), so it is computed once and shared by the workers.
+    """
+
+    def __init__(self, keys, exponent, zetan=None):
+        self.keys = keys
+        self.theta = exponent
+        self.zetan = zetan if zetan is not None else self.zeta(keys, exponent)
+        zeta2 = 1 + 0.5 ** exponent
+        self.alpha = 1 / (1 - exponent)
+        self.eta = (1 - (2 / keys) ** (1 - exponent)) / (1 - zeta2 / self.zetan)
+        self.half_pow = 0.5 ** exponent
+
+    @staticmethod
+    def zeta(keys, exponent):
+        return math.fsum(i ** -exponent for i in range(1, keys + 1))
+
+    def __call__(self, rng):
+        u = rng.random()
+        uz = u * self.zetan
+        if uz < 1:
+            return 0
+        if uz < 1 + self.half_pow:
+            return 1
+        return min(self.keys - 1, int(self.keys * (self.eta * u - self.eta + 1) ** self.alpha))
+
+
+def key_chooser(config, offset):
+    """A function of the random generator returning the next key index."""
+    keys = config["keys"]
+    distribution = config["key_distribution"]
+
+    if distribution == "uniform":
+        return lambda rng: rng.randrange(keys)
+    if distribution == "gaussian":
+        stddev = config["key_stddev"] or keys / 6
+        return lambda rng: min(keys - 1, max(0, int(rng.gauss(keys / 2, stddev))))
+    if distribution == "zipf":
+        return ZipfKeys(keys, config["zipf_exponent"], config["zipf_zetan"])
+
+    # sequential, every connection starting at its own offset
+    counter = iter(range(offset, sys.maxsize))
+    return lambda rng: next(counter) % keys
+
+
+def value_size_chooser(config):
+    low, high = config["value_size"]
+    if low == high:
+        return lambda rng: low
+    return lambda rng: rng.randint(low, high)
+
+
+def ketama_ring(servers):
+    """
+    Sorted (point, server index) pairs of a weighted ketama continuum: every md5
+    of "<host>:<port>-<n>" gives four points, and a server gets points in
+    proportion to its weight, so it owns that share of the keys.
+    """
+    total = sum(weight for _, _, weight in servers)
+    ring = []
+    for index, (host, port, weight) in enumerate(servers):
+        points = max(4, round(KETAMA_POINTS * len(servers) * weight / total))
+        for n in range(math.ceil(points / 4)):
+            digest = hashlib.md5(f"{host}:{port}-{n}".encode()).digest()
+            ring.extend((int.from_bytes(digest[4 * h:4 * h + 4], "little"), index) for h in range(4))
+    ring.sort()
+    return ring
+
+
+def key_server_map(servers, keys):
+    """
+    Server index of every key index, the first ring point at or after the md5 of
+    the key. Computed once, so the workers only look it up.
+    """
+    ring = ketama_ring(servers)
+    points = [point for point, _ in ring]
+    mapping = bytearray(keys)
+    for key in range(keys):
+        digest = hashlib.md5(KEY_FORMAT.format(key).encode()).digest()
+        mapping[key] = ring[bisect.bisect_left(points, int.from_bytes(digest[:4], "little")) % len(ring)][1]
+    return bytes(mapping)
+
+
+class Protocol:
+    """Request encoding and response decoding of the text or meta protocol."""
+
+    def __init__(self, name):
+        self.meta = name == "meta"
+
+    def get(self, key):
+        return f"mg {key} v\r\n".encode() if self.meta else f"get {key}\r\n".encode()
+
+    def set(self, key, value, noreply=False):
+        if self.meta:
+            header = f"ms {key} {len(value)}{' q' if noreply else ''}\r\n"
+        else:
+            header = f"set {key} 0 0 {len(value)}{' noreply' if noreply else ''}\r\n"
+        return header.encode() + value + b"\r\n"
+
+    async def read_get(self, reader):
+        """Bytes read and whether the key was missing."""
+        line = await reader.readline()
+        nbytes = len(line)
+        # EN (meta) or END (text)
+        if line.startswith(b"EN"):
+            return nbytes, True
+
+        parts = line.split()
+        if self.meta and parts[:1] == [b"VA"]:
+            size = int(parts[1])
+        elif not self.meta and parts[:1] == [b"VALUE"]:
+            size = int(parts[3])
+        else:
+            raise ProtocolError(f"unexpected get response: {line!r}")
+
+        await reader.readexactly(size + 2)
+        nbytes += size + 2
+        if not self.meta:
+            nbytes += len(await reader.readline())
+        return nbytes, False
+
+    async def read_set(self, reader):
+        line = await reader.readline()
+        if line not in (b"STORED\r\n", b"HD\r\n"):
+            raise ProtocolError(f"unexpected set response: {line!r}")
+        return len(line), False
+
+
+# =============================================================================
+# Worker: one event loop driving its share of the connections
+# =============================================================================
+
+class Recorder:
+    """Histograms of one worker, overall, per server and per report interval."""
+
+    def __init__(self, start_ns, warmup_ns, interval_ns, servers):
+        self.start_ns = start_ns
+        self.measure_ns = start_ns + warmup_ns
+        self.interval_ns = interval_ns
+        self.total = {op: LatencyHistogram() for op in OPERATIONS}
+        self.servers = [{op: LatencyHistogram() for op in OPERATIONS} for _ in range(servers)]
+        self.intervals = {op: {} for op in OPERATIONS}
+        self.errors = collections.Counter()
+
+    def record(self, op, server, sent_ns, done_ns, nbytes, miss):
+        if sent_ns < self.measure_ns:
+            return
+        latency = done_ns - sent_ns
+        self.total[op].record(latency, nbytes, miss)
+        self.servers[server][op].record(latency, nbytes, miss)
+        period = (sent_ns - self.measure_ns) // self.interval_ns
+        histogram = self.intervals[op].get(period)
+        if histogram is None:
+            histogram = self.intervals[op][period] = LatencyHistogram()
+        histogram.record(latency, nbytes, miss)
+
+    def to_dict(self):
+        return {
+            "total": {op: h.to_dict() for op, h in self.total.items()},
+            "servers": [{op: h.to_dict() for op, h in ops.items()} for ops in self.servers],
+            "intervals": {op: {p: h.to_dict() for p, h in periods.items()}
+                          for op, periods in self.intervals.items()},
+            "errors": dict(self.errors),
+        }
+
+
+class Connection:
+    """One client, with a socket to every server as libmemcached clients have."""
+
+    def __init__(self, config, offset, seed):
+        self.config = config
+        self.protocol = Protocol(config["protocol"])
+        self.rng = random.Random(seed)
+        self.next_key = key_chooser(config, offset)
+        self.next_size = value_size_chooser(config)
+        self.value = config["value"]
+        self.key_servers = config["key_servers"]
+        self.readers = []
+        self.writers = []
+
+    async def open(self):
+        for host, port, _ in self.config["servers"]:
+            reader, writer = await asyncio.open_connection(host, port)
+            self.readers.append(reader)
+            self.writers.append(writer)
+
+    def close(self):
+        for writer in self.writers:
+            writer.close()
+
+    def request(self):
+        """The next operation, the server its key hashes to and its encoded request."""
+        index = self.next_key(self.rng)
+        key = KEY_FORMAT.format(index)
+        server = self.key_servers[index] if self.key_servers else 0
+        if self.rng.random() < self.config["set_ratio"]:
+            return "set", server, self.protocol.set(key, self.value[:self.next_size(self.rng)])
+        return "get", server, self.protocol.get(key)
+
+    async def response(self, op, server):
+        if op == "get":
+            return await self.protocol.read_get(self.readers[server])
+        return await self.protocol.read_set(self.readers[server])
+
+    async def closed_loop(self, recorder, end_ns):
+        while time.perf_counter_ns() < end_ns:
+            op, server, request = self.request()
+            sent = time.perf_counter_ns()
+            self.writers[server].write(request)
+            nbytes, miss = await self.response(op, server)
+            recorder.record(op, server, sent, time.perf_counter_ns(), nbytes + len(request), miss)
+
+    async def open_loop(self, recorder, end_ns, rate):
+        """
+        Send on schedule however far behind the responses are, pipelining the
+        requests on every socket, up to max_outstanding of them in total.
+        """
+        poisson = self.config["arrival"] == "poisson"
+        mean_gap = 1e9 / rate
+        outstanding = asyncio.Semaphore(self.config["max_outstanding"])
+        servers = range(len(self.writers))
+        pending = [collections.deque() for _ in servers]
+        wakeups = [asyncio.Event() for _ in servers]
+        sending = True
+
+        async def receive(server):
+            while pending[server] or sending:
+                if not pending[server]:
+                    wakeups[server].clear()
+                    await wakeups[server].wait()
+                    continue
+                op, due, request_bytes = pending[server].popleft()
+                nbytes, miss = await self.response(op, server)
+                outstanding.release()
+                recorder.record(op, server, due, time.perf_counter_ns(), nbytes + request_bytes, miss)
+
+        receivers = [asyncio.create_task(receive(server)) for server in servers]
+        # Start every connection at a random phase of its schedule
+        due = time.perf_counter_ns() + int(self.rng.random() * mean_gap)
+
+        while due < end_ns and not any(receiver.done() for receiver in receivers):
+            now = time.perf_counter_ns()
+            if due > now:
+                await asyncio.sleep((due - now) / 1e9)
+                now = time.perf_counter_ns()
+
+            # Everything due by now goes out in one write per server
+            batches = [[] for _ in servers]
+            queued = 0
+            while due <= now and due < end_ns:
+                if outstanding.locked() and queued:
+                    break
+                await outstanding.acquire()
+                op, server, request = self.request()
+                batches[server].append(request)
+                pending[server].append((op, due, len(request)))
+                queued += 1
+                due += int(self.rng.expovariate(1 / mean_gap) if poisson else mean_gap)
+
+            for server, batch in enumerate(batches):
+                if batch:
+                    self.writers[server].write(b"".join(batch))
+                    wakeups[server].set()
+            for server, batch in enumerate(batches):
+                if batch:
+                    await self.writers[server].drain()
+
+        sending = False
+        for wakeup in wakeups:
+            wakeup.set()
+        done, still_pending = await asyncio.wait(receivers, timeout=DRAIN_TIMEOUT_S)
+        if still_pending:
+            for receiver in still_pending:
+                receiver.cancel()
+            recorder.errors["responses outstanding at the end of the run"] += sum(len(p) for p in pending)
+        for receiver in done:
+            if receiver.exception():
+                raise receiver.exception()
+
+
+async def run_worker(config, worker, start_time):
+    # Index of the worker's first connection among all of them
+    first = sum(config["connections"][:worker])
+    conns = [Connection(config, offset=(first + i) * config["keys"] // config["total_connections"],
+                        seed=config["seed"] * 1000003 + first + i)
+             for i in range(config["connections"][worker])]
+    await asyncio.gather(*(conn.open() for conn in conns))
+
+    # All workers start together, at the same wall clock time
+    await asyncio.sleep(max(0.0, start_time - time.time()))
+    start_ns = time.perf_counter_ns()
+    end_ns = start_ns + int((config["warmup"] + config["duration"]) * 1e9)
+    recorder = Recorder(start_ns, int(config["warmup"] * 1e9), int(config["report_interval"] * 1e9),
+                        len(config["servers"]))
+
+    if config["rate"]:
+        rate = config["rate"] / config["total_connections"]
+        tasks = [conn.open_loop(recorder, end_ns, rate) for conn in conns]
+    else:
+        tasks = [conn.closed_loop(recorder, end_ns) for conn in conns]
+
+    for result in await asyncio.gather(*tasks, return_exceptions=True):
+        if isinstance(result, Exception):
+            recorder.errors[f"{type(result).__name__}: {result}"] += 1
+
+    for conn in conns:
+        conn.close()
+    return recorder.to_dict()
+
+
+def worker_main(config, worker, start_time):
+    return asyncio.run(run_worker(config, worker, start_time))
+
+
+# =============================================================================
+# Prefill: store every key once so gets hit from the first second
+# =============================================================================
+
+async def prefill(config):
+    protocol = Protocol(config["protocol"])
+    next_size = value_size_chooser(config)
+    rng = random.Random(config["seed"])
+    servers = config["servers"]
+    # Up to 16 connections, spread over the servers
+    per_server = max(1, min(config["total_connections"], 16) // len(servers))
+
+    keys = [[] for _ in servers]
+    for key in range(config["keys"]):
+        keys[config["key_servers"][key] if config["key_servers"] else 0].append(key)
+
+    async def fill(server, server_keys):
+        host, port, _ = servers[server]
+        reader, writer = await asyncio.open_connection(host, port)
+        for start in range(0, len(server_keys), PREFILL_BATCH):
+            writer.writelines(
+                protocol.set(KEY_FORMAT.format(key), config["value"][:next_size(rng)], noreply=True)
+                for key in server_keys[start:start + PREFILL_BATCH]
+            )
+            # A round trip per batch, so the server is never more than a batch behind
+            writer.write(b"version\r\n")
+            line = await reader.readline()
+            if not line.startswith(b"VERSION"):
+                raise ProtocolError(f"prefill failed: {line!r}")
+        writer.close()
+
+    await asyncio.gather(*(fill(server, keys[server][n::per_server])
+                           for server in range(len(servers)) for n in range(per_server)))
+
+
+async def fetch_server_stats(host, port):
+    """The SERVER_STATS counters of a memcached, None when it can't be asked."""
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        return None
+
+    writer.write(b"stats\r\n")
+    stats = {}
+    while (line := await reader.readline()) and not line.startswith(b"END"):
+        parts = line.decode(errors="replace").split()
+        if len(parts) == 3 and parts[0] == "STAT" and parts[1] in SERVER_STATS:
+            stats[parts[1]] = int(parts[2]) if parts[2].isdigit() else parts[2]
+    writer.close()
+    return stats
+
+
+async def fetch_all_server_stats(servers):
+    return await asyncio.gather(*(fetch_server_stats(host, port) for host, port, _ in servers))
+
+
+# =============================================================================
+# Results
+# =============================================================================
+
+def _us(value_ns):
+    return round(value_ns / 1000, 2) if value_ns is not None else None
+
+
+def stat_entry(kind, time_s, histogram, seconds):
+    """A periodic_stats entry, as parse_results.py reads it from memaslap."""
+    return {
+        "type": kind,
+        "time_s": time_s,
+        "ops": histogram.total,
+        "tps": round(histogram.total / seconds, 2),
+        "net_m_s": round(histogram.bytes / seconds / 1024 / 1024, 2),
+        "get_miss": histogram.misses,
+        "min_us": _us(histogram.min_ns),
+        "max_us": _us(histogram.max_ns),
+        "avg_us": _us(histogram.mean()),
+        "std_dev": _us(histogram.std_dev()),
+    }
+
+
+def merge_results(results, config):
+    totals = {op: LatencyHistogram() for op in OPERATIONS}
+    servers = [{op: LatencyHistogram() for op in OPERATIONS} for _ in config["servers"]]
+    intervals = {op: {} for op in OPERATIONS}
+    errors = collections.Counter()
+
+    for result in results:
+        errors.update(result["errors"])
+        for op in OPERATIONS:
+            totals[op].merge(LatencyHistogram.from_dict(result["total"][op]))
+            for index, server in enumerate(result["servers"]):
+                servers[index][op].merge(LatencyHistogram.from_dict(server[op]))
+            for period, data in result["intervals"][op].items():
+                intervals[op].setdefault(period, LatencyHistogram()).merge(LatencyHistogram.from_dict(data))
+
+    interval = config["report_interval"]
+    periods = math.ceil(config["duration"] / interval)
+    stats = {}
+    for op in OPERATIONS:
+        entries = []
+        cumulative = LatencyHistogram()
+        for period in range(periods):
+            histogram = intervals[op].get(period, LatencyHistogram())
+            cumulative.merge(histogram)
+            elapsed = min((period + 1) * interval, config["duration"])
+            length = elapsed - period * interval
+            # Like memaslap, the Period time is its length and the Global time the elapsed one
+            entries.append(stat_entry("Period", length, histogram, length))
+            entries.append(stat_entry("Global", elapsed, cumulative, elapsed))
+        stats[op] = entries
+
+    return totals, servers, stats, [{"error": error, "count": count} for error, count in errors.items()]
+
+
+def latency_percentiles(histogram):
+    percentiles = {"avg": _us(histogram.mean())}
+    percentiles.update((f"p{p:g}", _us(histogram.percentile(p))) for p in PERCENTILES)
+    percentiles["max"] = _us(histogram.max_ns) if histogram.total else None
+    return percentiles
+
+
+def instance_results(config, server_totals, server_stats, instances, summary):
+    """
+    Results per memcached instance, matched by port to the instances.csv of
+    run_memcached.sh, and the aggregate of them all.
+    """
+    key_share = collections.Counter(config["key_servers"]) if config["key_servers"] else {0: config["keys"]}
+    per_instance = []
+    for index, (host, port, weight) in enumerate(config["servers"]):
+        info = next((i for i in instances or [] if i["port"] == port), {})
+        total = LatencyHistogram()
+        for op in OPERATIONS:
+            total.merge(server_totals[index][op])
+        per_instance.append({
+            "instance": info.get("instance", index),
+            "server": f"{host}:{port}",
+            "port": port,
+            "cpu_node": info.get("cpu_node"),
+            "mem_node": info.get("mem_node"),
+            "memory_mb": info.get("memory_mb"),
+            "weight": weight,
+            "key_share": round(key_share.get(index, 0) / config["keys"], 4),
+            "total_ops": total.total,
+            "tps": round(total.total / config["duration"]),
+            "get_miss": server_totals[index]["get"].misses,
+            "latency_us": {op: latency_percentiles(server_totals[index][op]) for op in OPERATIONS},
+            "server_stats": server_stats[index],
+        })
+
+    aggregate = {
+        "instances": len(per_instance),
+        "total_ops": summary["total_ops"],
+        "tps": summary["tps"],
+        "steady_tps": summary.get("steady_tps"),
+        "latency_us": summary["latency_us"],
+    }
+    return {"aggregate": aggregate, "per_instance": per_instance}
+
+
+def format_net_rate(bytes_per_s):
+    for unit, scale in (("G", 1024 ** 3), ("M", 1024 ** 2), ("K", 1024)):
+        if bytes_per_s >= scale:
+            return round(bytes_per_s / scale, 1), unit
+    return round(bytes_per_s, 1), ""
+
+
+def print_report(config, totals, stats, summary, instances):
+    """The statistics and summary line the way memaslap prints them."""
+    print(f"servers : {','.join(f'{host}:{port}' for host, port, _ in config['servers'])}")
+    print(f"threads count: {config['workers']}")
+    print(f"concurrency: {config['total_connections']}")
+    print(f"run time: {config['duration']:g}s")
+    print(f"set proportion: set_prop={config['set_ratio']:.2f}")
+    print(f"get proportion: get_prop={1 - config['set_ratio']:.2f}")
+    print()
+
+    for op in OPERATIONS:
+        if not totals[op].total:
+            continue
+        final = stats[op][-1]
+        print(f"{op.capitalize()} Statistics")
+        print(f"{'Type':<9}{'Time(s)':<9}{'Ops':<12}{'TPS(ops/s)':<12}{'Net(M/s)':<10}"
+              f"{'Get_miss':<10}{'Min(us)':<9}{'Max(us)':<11}{'Avg(us)':<9}{'Std_dev':<9}")
+        print(f"{'Global':<9}{final['time_s']:<9g}{final['ops']:<12}{final['tps']:<12.2f}{final['net_m_s']:<10.2f}"
+              f"{final['get_miss']:<10}{final['min_us']:<9g}{final['max_us']:<11g}{final['avg_us']:<9.2f}"
+              f"{final['std_dev']:<9.2f}")
+        print("Percentiles(us): " + " ".join(
+            f"{name}={value:g}" for name, value in latency_percentiles(totals[op]).items()))
+        print()
+
+    if len(instances["per_instance"]) > 1:
+        print("Instance Statistics")
+        print(f"{'Server':<22}{'Keys':<8}{'Ops':<12}{'TPS(ops/s)':<12}{'Get_avg(us)':<13}{'Get_p99(us)':<13}"
+              f"{'Evictions':<10}")
+        for instance in instances["per_instance"]:
+            latency = instance["latency_us"]["get"]
+            evictions = (instance["server_stats"] or {}).get("evictions", "-")
+            print(f"{instance['server']:<22}{instance['key_share']:<8.2%}{instance['total_ops']:<12}"
+                  f"{instance['tps']:<12}{latency['avg'] or 0:<13g}{latency['p99'] or 0:<13g}{evictions:<10}")
+        print()
+
+    print(f"Run time: {summary['run_time_s']:.1f}s Ops: {summary['total_ops']} "
+          f"TPS: {summary['tps']} Net_rate: {summary['net_rate']}")
+
+
+def write_latency_csv(results_dir, latency):
+    dst = os.path.join(results_dir, "results_memcached_latency.csv")
+    with open(dst, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Operation", "Percentile", "Latency (us)"])
+        for op, percentiles in latency.items():
+            for name, value in percentiles.items():
+                writer.writerow([op.upper(), name, value if value is not None else ""])
+    log(f"Wrote CSV: {dst}")
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def parse_duration(value):
+    """Seconds of a memaslap style duration: 180, 180s, 5m or 1h."""
+    scale = {"s": 1, "m": 60, "h": 3600}.get(value[-1:].lower())
+    try:
+        seconds = float(value[:-1]) * scale if scale else float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid duration: {value}")
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError(f"duration must be positive: {value}")
+    return seconds
+
+
+def parse_value_size(value):
+    """A fixed size or a min-max range in bytes."""
+    try:
+        low, _, high = value.partition("-")
+        low, high = int(low), int(high or low)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid value size: {value}")
+    if not 0 < low <= high:
+        raise argparse.ArgumentTypeError(f"invalid value size range: {value}")
+    return low, high
+
+
+def parse_servers(value):
+    """host:port[:weight] entries, comma separated, the weight 1 by default."""
+    servers = []
+    for entry in value.split(","):
+        parts = entry.strip().split(":")
+        try:
+            host, port, weight = parts[0], int(parts[1]), float(parts[2]) if len(parts) > 2 else 1.0
+        except (IndexError, ValueError):
+            raise argparse.ArgumentTypeError(f"invalid server: {entry}")
+        if not host or len(parts) > 3 or weight <= 0:
+            raise argparse.ArgumentTypeError(f"invalid server: {entry}")
+        servers.append((host, port, weight))
+    if len(servers) > MAX_SERVERS:
+        raise argparse.ArgumentTypeError(f"at most {MAX_SERVERS} servers")
+    return servers
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Closed or open loop memcached load generator with HDR-style latency histograms"
+    )
+    parser.add_argument("-s", "--servers", type=parse_servers, default="127.0.0.1:11211",
+                        help="memcached servers as host:port[:weight],..., keys placed on a consistent "
+                             "hash ring in proportion to the weights: Default 127.0.0.1:11211")
+    parser.add_argument("-P", "--protocol", choices=("text", "meta"), default="text",
+                        help="get/set or mg/ms (memcached >= 1.6) requests: Default text")
+    parser.add_argument("-T", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes, each running its own event loop: Default the CPU count")
+    parser.add_argument("-c", "--connections", type=int, default=256,
+                        help="Connections in total, spread across the workers: Default 256")
+    parser.add_argument("-d", "--duration", type=parse_duration, default=180.0,
+                        help="Measured run time, e.g. 180s or 5m: Default 180s")
+    parser.add_argument("-w", "--warmup", type=parse_duration, default=None,
+                        help="Unmeasured run time before the measurement, e.g. 30s: Default none")
+    parser.add_argument("-r", "--rate", type=float, default=0,
+                        help="Target ops/s of the whole run, switching to an open loop: Default closed loop")
+    parser.add_argument("-a", "--arrival", choices=("poisson", "fixed"), default="poisson",
+                        help="Open loop spacing of the requests: Default poisson")
+    parser.add_argument("--max-outstanding", type=int, default=1024,
+                        help="Open loop requests a connection may have unanswered: Default 1024")
+    parser.add_argument("-k", "--keys", type=int, default=1000000,
+                        help="Number of distinct keys: Default 1000000")
+    parser.add_argument("-K", "--key-distribution", choices=("uniform", "zipf", "gaussian", "sequential"),
+                        default="uniform", help="How keys are picked: Default uniform")
+    parser.add_argument("-Z", "--zipf-exponent", type=float, default=0.99,
+                        help="Exponent of the zipf distribution, between 0 and 1: Default 0.99")
+    parser.add_argument("-D", "--key-stddev", type=float, default=None,
+                        help="Standard deviation of the gaussian distribution: Default keys / 6")
+    parser.add_argument("-v", "--value-size", type=parse_value_size, default=(1024, 1024),
+                        help="Value size in bytes, fixed or a min-max range: Default 1024")
+    parser.add_argument("-g", "--set-ratio", type=float, default=0.1,
+                        help="Fraction of the operations that are sets: Default 0.1")
+    parser.add_argument("--no-prefill", dest="prefill", action="store_false",
+                        help="Don't store every key before the run, so early gets miss")
+    parser.add_argument("-i", "--report-interval", type=parse_duration, default=5.0,
+                        help="Seconds per periodic statistics entry: Default 5")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed: Default 0")
+    parser.add_argument("-o", "--output-dir", default=".",
+                        help="Where to write results_memcached.json/.csv: Default the current directory")
+    args = parser.parse_args()
+
+    if args.workers < 1 or args.connections < args.workers:
+        parser.error("there must be at least one worker and one connection per worker")
+    if not 0 <= args.set_ratio <= 1:
+        parser.error("the set ratio must be between 0 and 1")
+    if args.rate < 0:
+        parser.error("the rate can't be negative")
+    if args.key_distribution == "zipf" and not 0 < args.zipf_exponent < 1:
+        parser.error("the zipf exponent must be between 0 and 1")
+    if args.keys < 2:
+        parser.error("there must be at least two keys")
+
+    errors = []
+    config = {
+        "servers": args.servers,
+        "key_servers": key_server_map(args.servers, args.keys) if len(args.servers) > 1 else None,
+        "protocol": args.protocol,
+        "workers": args.workers,
+        "total_connections": args.connections,
+        # Connections of every worker, the first ones taking the remainder
+        "connections": [args.connections // args.workers + (w < args.connections % args.workers)
+                        for w in range(args.workers)],
+        "duration": args.duration,
+        "warmup": args.warmup or 0.0,
+        "rate": args.rate,
+        "arrival": args.arrival,
+        "max_outstanding": args.max_outstanding,
+        "keys": args.keys,
+        "key_distribution": args.key_distribution,
+        "zipf_exponent": args.zipf_exponent,
+        "zipf_zetan": ZipfKeys.zeta(args.keys, args.zipf_exponent) if args.key_distribution == "zipf" else None,
+        "key_stddev": args.key_stddev,
+        "value_size": args.value_size,
+        "value": os.urandom(args.value_size[1]),
+        "set_ratio": args.set_ratio,
+        "report_interval": min(args.report_interval, args.duration),
+        "seed": args.seed,
+    }
+
+    servers = ",".join(f"{host}:{port}" for host, port, _ in args.servers)
+    mode = f"open loop at {args.rate:g} ops/s" if args.rate else "closed loop"
+    log(f"{mode}, {args.workers} worker(s), {args.connections} connection(s) to {servers}, "
+        f"{args.keys} {args.key_distribution} keys, {args.set_ratio:g} sets")
+
+    if args.prefill:
+        log(f"Prefilling {args.keys} keys...")
+        try:
+            asyncio.run(prefill(config))
+        except (OSError, ProtocolError) as e:
+            log(f"WARNING: prefill failed: {e}")
+            errors.append({"error": f"prefill failed: {e}"})
+
+    start_time = time.time() + START_DELAY_S
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(worker_main, config, w, start_time) for w in range(args.workers)]
+        try:
+            results = [future.result() for future in futures]
+        except OSError as e:
+            log(f"ERROR: can't connect to {servers}: {e}")
+            sys.exit(1)
+
+    totals, server_totals, stats, run_errors = merge_results(results, config)
+    errors.extend(run_errors)
+    for error in run_errors:
+        log(f"WARNING: {error['count']}x {error['error']}")
+
+    total = LatencyHistogram()
+    for op in OPERATIONS:
+        total.merge(totals[op])
+    net_value, net_unit = format_net_rate(total.bytes / config["duration"])
+    summary = {
+        "run_time_s": config["duration"],
+        "total_ops": total.total,
+        "tps": round(total.total / config["duration"]),
+        "net_rate": f"{net_value}{net_unit}/s",
+        "net_rate_value": net_value,
+        "net_rate_unit": f"{net_unit}/s",
+        "latency_us": {op: latency_percentiles(totals[op]) for op in OPERATIONS},
+    }
+
+    analysis = analyze_statistics(stats)
+    promote_analysis(summary, analysis)
+
+    results_dir = args.output_dir
+    os.makedirs(results_dir, exist_ok=True)
+    instances = instance_results(config, server_totals, asyncio.run(fetch_all_server_stats(args.servers)),
+                                 parse_instances(results_dir), summary)
+
+    print_report(config, totals, stats, summary, instances)
+
+    configuration = {
+        "servers": servers,
+        "threads_count": args.workers,
+        "concurrency": args.connections,
+        "run_time": f"{config['duration']:g}s",
+        "set_proportion": args.set_ratio,
+        "get_proportion": round(1 - args.set_ratio, 6),
+        "load_generator": "memcached_loadgen",
+        "protocol": args.protocol,
+        "mode": "open" if args.rate else "closed",
+        "target_rate": args.rate or None,
+        "arrival": args.arrival if args.rate else None,
+        "warmup_s": config["warmup"],
+        "keys": args.keys,
+        "key_distribution": args.key_distribution,
+        "zipf_exponent": args.zipf_exponent if args.key_distribution == "zipf" else None,
+        "value_size": list(args.value_size),
+        "prefill": args.prefill,
+    }
+    metadata = parse_run_metadata(results_dir)
+
+    # ----- Write JSON (primary output), parse_results.py's schema -----
+    json_output = {
+        "benchmark": "memcached",
+        "parser_version": PARSER_VERSION,
+        "timestamp_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "source_dir": os.path.basename(os.path.abspath(results_dir)),
+        "configuration": configuration,
+        "summary": summary,
+        "periodic_stats": stats,
+        "analysis": analysis,
+        "instances": instances,
+        "latency_histograms": {
+            op: {"unit": "us", "buckets": [[_us(min(bucket_upper(i), totals[op].max_ns)), count]
+                                           for i, count in sorted(totals[op].counts.items())]}
+            for op in OPERATIONS
+        },
+        "run_metadata": metadata,
+        "kernel_tiering": load_vmstat_delta(results_dir),
+        "errors": errors if errors else None,
+    }
+
+    json_path = os.path.join(results_dir, "results_memcached.json")
+    with open(json_path, "w") as f:
+        json.dump(json_output, f, indent=2)
+    log(f"Wrote JSON: {json_path}")
+
+    # ----- Write CSVs (for generate_report.sh) -----
+    write_summary_csv(results_dir, summary, configuration, metadata)
+    write_stats_csv(results_dir, stats)
+    write_latency_csv(results_dir, summary["latency_us"])
+    write_instances_csv(results_dir, instances)
+
+    jsons = sorted(glob.glob(os.path.join(results_dir, "results_*.json")))
+    csvs = sorted(glob.glob(os.path.join(results_dir, "results_*.csv")))
+    log(f"Produced: {len(jsons)} JSON + {len(csvs)} CSV file(s)")
+
+    if not total.total:
+        log("ERROR: no operation completed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,9 @@
 """
 OCP SRV CMS - Memcached/Memaslap Results Parser (parse_results.py)
 
-Parses memaslap benchmark output and normalizes into:
+Parses memaslap benchmark output in a single streaming pass over the file,
+so hour-long runs with 1s --stat_freq need no more memory than their parsed
+rows, and normalizes it into:
   - JSON (primary) — structured data with config, periodic stats, summary, errors
   - CSV (secondary) — for generate_report.sh HTML table rendering
 
@@ -12,11 +14,19 @@ Memaslap output format:
      Type, Time(s), Ops, TPS, Net, Get_miss, Min(us), Max(us), Avg(us), ...
   3. Final summary:  "Run time: 180.0s Ops: 17632652 TPS: 97959 Net_rate: 8.4M/s"
 
+The periodic stats are analyzed for warmup, steady-state TPS with a 95%
+confidence interval, throughput dips and latency spikes, and the steady-state
+numbers promoted into the summary next to memaslap's whole-run TPS.
+
 Usage:
     python3 parse_results.py <results_dir>
 
+    Outside the ocp-cms-base image, put src/container-runtime/utils on
+    PYTHONPATH first, see utils/README.md.
+
 JSON output:  results_memcached.json
 CSV output:   results_memcached.csv (summary) + results_memcached_stats.csv (periodic)
+              + results_memcached_instances.csv (with several memcached instances)
 """
 
 import csv
@@ -27,6 +37,12 @@ import re
 import sys
 from datetime import datetime, timezone
 
+from cms_vmstat import load_vmstat_delta
+
+
+# Version of the results_memcached.json schema, memcached_loadgen.py writes it too
+PARSER_VERSION = "1.2.0"
+
 
 def log(msg):
     print(f"[PARSER] {msg}")
@@ -50,22 +66,23 @@ def _safe_int(val, default=None):
 # Parse memaslap configuration header
 # =============================================================================
 
-def parse_config(text):
-    """Extract configuration from memaslap output header."""
-    config = {}
-
-    patterns = {
-        "servers": r"servers\s*:\s*(.+)",
-        "threads_count": r"threads count:\s*(\d+)",
-        "concurrency": r"concurrency:\s*(\d+)",
-        "run_time": r"run time:\s*(\S+)",
-        "windows_size": r"windows size:\s*(\S+)",
-        "set_proportion": r"set proportion:\s*set_prop=([\d.]+)",
-        "get_proportion": r"get proportion:\s*get_prop=([\d.]+)",
-    }
-
-    for key, pattern in patterns.items():
-        m = re.search(pattern, text, re.IGNORECASE)
+CONFIG_PATTERNS = {
+    "servers": re.compile(r"servers\s*:\s*(.+)", re.IGNORECASE),
+    "threads_count": re.compile(r"threads count:\s*(\d+)", re.IGNORECASE),
+    "concurrency": re.compile(r"concurrency:\s*(\d+)", re.IGNORECASE),
+    "run_time": re.compile(r"run time:\s*(\S+)", re.IGNORECASE),
+    "windows_size": re.compile(r"windows size:\s*(\S+)", re.IGNORECASE),
+    "set_proportion": re.compile(r"set proportion:\s*set_prop=([\d.]+)", re.IGNORECASE),
+    "get_proportion": re.compile(r"get proportion:\s*get_prop=([\d.]+)", re.IGNORECASE),
+}
+
+
+def parse_config_line(line, config):
+    """Add the configuration value of a memaslap header line, the first one of a key wins."""
+    for key, pattern in CONFIG_PATTERNS.items():
+        if key in config:
+            continue
+        m = pattern.search(line)
         if m:
             val = m.group(1).strip()
             int_val = _safe_int(val)
@@ -77,16 +94,14 @@ def parse_config(text):
             else:
                 config[key] = val
 
-    return config if config else None
-
 
 # =============================================================================
 # Parse periodic statistics tables
 # =============================================================================
 
-def parse_statistics(text):
+def parse_stat_row(stripped):
     """
-    Extract Get/Set statistics blocks from memaslap output.
+    One Period/Global row of a Get/Set statistics block, None when it is cut short.
 
     Format:
         Get Statistics (or Set Statistics)
@@ -94,23 +109,97 @@ def parse_statistics(text):
         Period    5       48870     9774.00     0.84      0         27       2198     326.57   ...
         Global    5       48870     9774.00     0.84      0         27       2198     326.57   ...
     """
+    parts = stripped.split()
+    if len(parts) < 9:
+        return None
+
+    entry = {
+        "type": parts[0],  # Period or Global
+        "time_s": _safe_float(parts[1]),
+        "ops": _safe_int(parts[2]),
+        "tps": _safe_float(parts[3]),
+        "net_m_s": _safe_float(parts[4]),
+        "get_miss": _safe_int(parts[5]),
+        "min_us": _safe_float(parts[6]),
+        "max_us": _safe_float(parts[7]),
+        "avg_us": _safe_float(parts[8]),
+    }
+    if len(parts) >= 10:
+        entry["std_dev"] = _safe_float(parts[9])
+    if len(parts) >= 11:
+        entry["geo_dist"] = _safe_float(parts[10])
+    return entry
+
+
+# =============================================================================
+# Parse final summary line
+# =============================================================================
+
+SUMMARY_PATTERN = re.compile(
+    r"Run time:\s*([\d.]+)s\s+"
+    r"Ops:\s*(\d+)\s+"
+    r"TPS:\s*(\d+)\s+"
+    r"Net_rate:\s*([\d.]+)(\S*)/s"
+)
+
+
+def parse_summary_line(line):
+    """
+    The final summary line, None for any other line:
+        Run time: 180.0s Ops: 17632652 TPS: 97959 Net_rate: 8.4M/s
+    """
+    m = SUMMARY_PATTERN.search(line)
+    if not m:
+        return None
+
+    summary = {
+        "run_time_s": _safe_float(m.group(1)),
+        "total_ops": _safe_int(m.group(2)),
+        "tps": _safe_int(m.group(3)),
+    }
+    net_val = _safe_float(m.group(4))
+    net_unit = m.group(5)
+    if net_val is not None:
+        summary["net_rate"] = f"{net_val}{net_unit}/s"
+        summary["net_rate_value"] = net_val
+        summary["net_rate_unit"] = f"{net_unit}/s"
+    return summary
+
+
+# =============================================================================
+# Single pass over raw_results.txt
+# =============================================================================
+
+def parse_raw_results(lines):
+    """
+    Configuration, periodic stats, summary and errors of memaslap output, read in
+    one pass over an iterable of lines such as the open file. Only the parsed
+    values are kept, never the text, so the memory used doesn't grow with the
+    size of the file, only with the number of Period/Global rows.
+    """
+    config = {}
     stats = {"get": [], "set": []}
+    summary = None
     errors = []
 
-    # Split into lines and walk through looking for stat blocks
-    lines = text.split("\n")
     current_op = None  # "get" or "set"
     in_header = False
 
-    for line in lines:
+    for line_number, line in enumerate(lines, start=1):
         stripped = line.strip()
 
+        # Reset current_op on blank lines or new sections
+        if not stripped:
+            current_op = None
+            in_header = False
+            continue
+
         # Detect stat block headers
-        if re.match(r"Get Statistics", stripped, re.IGNORECASE):
+        if stripped[:14].lower() == "get statistics":
             current_op = "get"
             in_header = True
             continue
-        elif re.match(r"Set Statistics", stripped, re.IGNORECASE):
+        if stripped[:14].lower() == "set statistics":
             current_op = "set"
             in_header = True
             continue
@@ -125,72 +214,237 @@ def parse_statistics(text):
             continue
 
         # Parse data lines (Period/Global)
-        if current_op and stripped and (stripped.startswith("Period") or stripped.startswith("Global")):
-            parts = stripped.split()
-            if len(parts) >= 9:
-                entry = {
-                    "type": parts[0],  # Period or Global
-                    "time_s": _safe_float(parts[1]),
-                    "ops": _safe_int(parts[2]),
-                    "tps": _safe_float(parts[3]),
-                    "net_m_s": _safe_float(parts[4]),
-                    "get_miss": _safe_int(parts[5]),
-                    "min_us": _safe_float(parts[6]),
-                    "max_us": _safe_float(parts[7]),
-                    "avg_us": _safe_float(parts[8]),
-                }
-                if len(parts) >= 10:
-                    entry["std_dev"] = _safe_float(parts[9])
-                if len(parts) >= 11:
-                    entry["geo_dist"] = _safe_float(parts[10])
+        if current_op and (stripped.startswith("Period") or stripped.startswith("Global")):
+            entry = parse_stat_row(stripped)
+            if entry:
                 stats[current_op].append(entry)
+            else:
+                errors.append({"line": line_number, "error": f"incomplete {current_op} row: {stripped}"})
             continue
 
-        # Reset current_op on blank lines or new sections
-        if not stripped:
-            current_op = None
-            in_header = False
+        # memaslap prints one summary line, at the very end
+        line_summary = parse_summary_line(stripped)
+        if line_summary:
+            summary = line_summary
+            continue
 
-    get_count = len(stats["get"])
-    set_count = len(stats["set"])
-    log(f"Periodic stats: {get_count} get entries, {set_count} set entries")
+        parse_config_line(stripped, config)
 
-    return stats if (get_count > 0 or set_count > 0) else None, errors
+    log(f"Periodic stats: {len(stats['get'])} get entries, {len(stats['set'])} set entries")
+    if summary:
+        log(f"Summary: {summary['total_ops']} ops, {summary['tps']} TPS, {summary['run_time_s']}s")
+    else:
+        log("WARNING: Could not parse final summary line")
 
+    return config or None, stats if stats["get"] or stats["set"] else None, summary, errors
 
 # =============================================================================
-# Parse final summary line
+# Steady-state analysis of the periodic statistics
 # =============================================================================
 
-def parse_summary(text):
+# Fewer periods than this are too few to tell warmup from steady state
+MIN_PERIODS = 6
+
+# A steady period is a throughput dip when its TPS is this many scaled MADs
+# and this fraction below the median, both, so tiny jitter on a flat run isn't flagged
+DIP_MADS = 3.0
+DIP_MIN_DROP = 0.10
+
+# Max(us) and Std_dev spikes: this many scaled MADs and this ratio above the median
+SPIKE_MADS = 3.0
+SPIKE_MIN_RATIO = 2.0
+
+# Two-sided 95% Student t quantiles by degrees of freedom, 1.96 beyond the table
+T_95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+
+
+def _periods(entries):
     """
-    Extract the final summary line:
-        Run time: 180.0s Ops: 17632652 TPS: 97959 Net_rate: 8.4M/s
+    The Period rows of one operation with the run time at their end. memaslap
+    prints each Period row followed by a Global row holding the time elapsed,
+    so that is used, else the Period lengths are added up.
     """
-    summary = {}
-
-    m = re.search(
-        r"Run time:\s*([\d.]+)s\s+"
-        r"Ops:\s*(\d+)\s+"
-        r"TPS:\s*(\d+)\s+"
-        r"Net_rate:\s*([\d.]+)(\S*)/s",
-        text,
-    )
-    if m:
-        summary["run_time_s"] = _safe_float(m.group(1))
-        summary["total_ops"] = _safe_int(m.group(2))
-        summary["tps"] = _safe_int(m.group(3))
-        net_val = _safe_float(m.group(4))
-        net_unit = m.group(5)
-        if net_val is not None:
-            summary["net_rate"] = f"{net_val}{net_unit}/s"
-            summary["net_rate_value"] = net_val
-            summary["net_rate_unit"] = f"{net_unit}/s"
-        log(f"Summary: {summary['total_ops']} ops, {summary['tps']} TPS, {summary['run_time_s']}s")
-        return summary
+    periods = []
+    elapsed = 0.0
+    for entry in entries:
+        if entry.get("type") == "Period":
+            elapsed += entry.get("time_s") or 0
+            periods.append(dict(entry, end_s=elapsed))
+        elif entry.get("type") == "Global" and periods and entry.get("time_s") is not None:
+            elapsed = entry["time_s"]
+            periods[-1]["end_s"] = elapsed
+    return periods
 
-    log("WARNING: Could not parse final summary line")
-    return None
+
+def _median(values):
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def _scaled_mad(values, median):
+    """Median absolute deviation, scaled to estimate the standard deviation."""
+    return 1.4826 * _median([abs(v - median) for v in values])
+
+
+def mser_truncation(values):
+    """
+    Number of leading values to discard as warmup, by the Marginal Standard Error
+    Rule: the cut that minimizes the standard error of the remaining mean, looked
+    for in the first half only so a late drift can't discard most of the run.
+
+    On a flat steady state every later cut ties, so the sums are kept exact
+    (floats are integers over a power of two) and the earliest cut wins ties.
+
+    >>> mser_truncation([1999] + [2000] * 59)
+    1
+    >>> mser_truncation([5000, 8000] + [10000] * 58)
+    2
+    """
+    n = len(values)
+    ratios = [float(v).as_integer_ratio() for v in values]
+    scale = max(den for _, den in ratios)
+    scaled = [num * (scale // den) for num, den in ratios]
+
+    # Sums of the values and their squares from every cut to the end, built
+    # backwards so each cut is O(1) and long 1s runs stay linear
+    total, total_sq = 0, 0
+    suffix = [None] * n
+    for i in range(n - 1, -1, -1):
+        total += scaled[i]
+        total_sq += scaled[i] * scaled[i]
+        suffix[i] = (total, total_sq)
+
+    # MSER of a cut is (rest * sum_sq - sum ** 2) / rest ** 3, compared as
+    # fractions by cross-multiplying
+    best, best_rest, best_cut = None, 1, 0
+    for cut in range(n // 2 + 1):
+        total, total_sq = suffix[cut]
+        rest = n - cut
+        mser = rest * total_sq - total * total
+        if best is None or mser * best_rest ** 3 < best * rest ** 3:
+            best, best_rest, best_cut = mser, rest, cut
+    return best_cut
+
+
+def _mean_ci95(values):
+    """Mean, sample standard deviation and 95% confidence interval half width."""
+    n = len(values)
+    mean = sum(values) / n
+    stddev = (sum((v - mean) ** 2 for v in values) / (n - 1)) ** 0.5 if n > 1 else 0.0
+    t = T_95[n - 2] if 2 <= n <= len(T_95) + 1 else 1.96
+    return mean, stddev, t * stddev / n ** 0.5
+
+
+def _high_outliers(periods, key, op):
+    values = [p[key] for p in periods if p.get(key) is not None]
+    if not values:
+        return []
+    median = _median(values)
+    limit = max(median + SPIKE_MADS * _scaled_mad(values, median), median * SPIKE_MIN_RATIO)
+    return [
+        {"operation": op, "time_s": p["end_s"], key: p[key], f"median_{key}": round(median, 2)}
+        for p in periods if p.get(key) is not None and p[key] > limit
+    ]
+
+
+def analyze_statistics(stats):
+    """
+    Warmup, steady-state throughput and anomalies from the Period rows.
+
+    The TPS of every period is the get and set TPS added up. The warmup is cut
+    with MSER, and the steady TPS is the mean of the remaining periods with a
+    95% confidence interval that treats each period as one batch mean. Dips,
+    Max(us) spikes and Std_dev jumps are flagged within the steady state
+    against its median, so one outlier doesn't hide another.
+    """
+    if not stats:
+        return None
+
+    periods = {op: _periods(stats.get(op, [])) for op in ("get", "set")}
+
+    # Total TPS per period, lined up by end time
+    totals = {}
+    for op_periods in periods.values():
+        for p in op_periods:
+            key = round(p["end_s"], 3)
+            totals[key] = totals.get(key, 0.0) + (p.get("tps") or 0.0)
+    times = sorted(totals)
+    tps = [totals[t] for t in times]
+
+    if len(tps) < MIN_PERIODS:
+        log(f"WARNING: {len(tps)} periods, at least {MIN_PERIODS} are needed for the steady-state analysis"
+            " (memaslap -S sets the period)")
+        return None
+
+    cut = mser_truncation(tps)
+    warmup_s = times[cut - 1] if cut else 0.0
+    steady_times, steady_tps = times[cut:], tps[cut:]
+    mean, stddev, half_width = _mean_ci95(steady_tps)
+
+    median = _median(steady_tps)
+    dip_limit = min(median - DIP_MADS * _scaled_mad(steady_tps, median), median * (1 - DIP_MIN_DROP))
+    dips = [
+        {"time_s": t, "tps": round(v, 2), "drop_pct": round(100 * (1 - v / median), 1) if median else None}
+        for t, v in zip(steady_times, steady_tps) if v < dip_limit
+    ]
+
+    per_op = {}
+    spikes, jumps = [], []
+    for op, op_periods in periods.items():
+        steady = [p for p in op_periods if p["end_s"] > warmup_s]
+        if not steady:
+            continue
+        op_mean, op_stddev, op_half_width = _mean_ci95([p.get("tps") or 0.0 for p in steady])
+        ops = sum(p.get("ops") or 0 for p in steady)
+        per_op[op] = {
+            "tps_mean": round(op_mean, 2),
+            "tps_ci95": [round(op_mean - op_half_width, 2), round(op_mean + op_half_width, 2)],
+            # Weighted by the operations of every period
+            "avg_us": round(sum((p.get("avg_us") or 0) * (p.get("ops") or 0) for p in steady) / ops, 2)
+            if ops else None,
+            "max_us": max((p["max_us"] for p in steady if p.get("max_us") is not None), default=None),
+        }
+        spikes.extend(_high_outliers(steady, "max_us", op))
+        jumps.extend(_high_outliers(steady, "std_dev", op))
+
+    analysis = {
+        "periods": len(tps),
+        "warmup": {"method": "MSER", "periods": cut, "warmup_s": warmup_s},
+        "steady_state": {
+            "periods": len(steady_tps),
+            "start_s": warmup_s,
+            "end_s": steady_times[-1],
+            "tps_mean": round(mean, 2),
+            "tps_stddev": round(stddev, 2),
+            "tps_cv": round(stddev / mean, 4) if mean else None,
+            "tps_ci95": [round(mean - half_width, 2), round(mean + half_width, 2)],
+            "tps_ci95_pct": round(100 * half_width / mean, 2) if mean else None,
+            "operations": per_op,
+        },
+        "throughput_dips": dips,
+        "latency_spikes": sorted(spikes, key=lambda s: s["time_s"]),
+        "stddev_jumps": sorted(jumps, key=lambda s: s["time_s"]),
+    }
+
+    log(f"Steady state: {warmup_s:g}s warmup ({cut} periods), "
+        f"{mean:.0f} TPS ±{analysis['steady_state']['tps_ci95_pct']}% (95% CI), "
+        f"{len(dips)} dip(s), {len(spikes)} latency spike(s), {len(jumps)} std_dev jump(s)")
+    return analysis
+
+
+def promote_analysis(summary, analysis):
+    """Put the steady-state headline numbers next to memaslap's whole-run ones."""
+    if summary is None or analysis is None:
+        return
+    steady = analysis["steady_state"]
+    summary["warmup_s"] = analysis["warmup"]["warmup_s"]
+    summary["steady_tps"] = steady["tps_mean"]
+    summary["steady_tps_ci95"] = steady["tps_ci95"]
+    summary["throughput_dips"] = len(analysis["throughput_dips"])
+    summary["latency_spikes"] = len(analysis["latency_spikes"])
 
 
 # =============================================================================
@@ -223,6 +477,53 @@ def parse_run_metadata(results_dir):
     return metadata if metadata else None
 
 
+# =============================================================================
+# Parse the run_memcached.sh instances.csv (memcached instances)
+# =============================================================================
+
+def parse_instances(results_dir):
+    """
+    The memcached instances run_memcached.sh started, with the port, CPU node,
+    memory node(s) and memory size of each.
+    """
+    csv_file = os.path.join(results_dir, "instances.csv")
+    if not os.path.isfile(csv_file):
+        return None
+
+    instances = []
+    with open(csv_file) as f:
+        for row in csv.DictReader(f):
+            instances.append({
+                "instance": _safe_int(row.get("instance")),
+                "port": _safe_int(row.get("port")),
+                "cpu_node": (row.get("cpu_node") or "").strip() or None,
+                "mem_node": (row.get("mem_node") or "").strip() or None,
+                "memory_mb": _safe_int(row.get("memory_mb")),
+            })
+
+    return instances if instances else None
+
+
+def memaslap_instances(instances, summary, stats):
+    """
+    The instances block of a memaslap run. memaslap spreads the keys over the
+    server list itself and only reports the instances together, so only the
+    aggregate has results.
+    """
+    if not instances:
+        return None
+
+    finals = {op: [e for e in (stats or {}).get(op, []) if e.get("type") == "Global"] for op in ("get", "set")}
+    aggregate = {
+        "instances": len(instances),
+        "total_ops": summary.get("total_ops") if summary else None,
+        "tps": summary.get("tps") if summary else None,
+        "steady_tps": summary.get("steady_tps") if summary else None,
+        "avg_us": {op: rows[-1].get("avg_us") for op, rows in finals.items() if rows},
+    }
+    return {"aggregate": aggregate, "per_instance": instances}
+
+
 # =============================================================================
 # CSV writers
 # =============================================================================
@@ -230,12 +531,17 @@ def parse_run_metadata(results_dir):
 def write_summary_csv(results_dir, summary, config, metadata):
     """Write a summary CSV with the key metrics."""
     dst = os.path.join(results_dir, "results_memcached.csv")
-    fieldnames = ["Run Time (s)", "Total Ops", "TPS (ops/s)", "Net Rate", "Threads", "Concurrency", "Test Note"]
+    fieldnames = ["Run Time (s)", "Total Ops", "TPS (ops/s)", "Warmup (s)", "Steady TPS (ops/s)",
+                  "Steady TPS 95% CI", "Net Rate", "Threads", "Concurrency", "Test Note"]
+    ci95 = summary.get("steady_tps_ci95") if summary else None
 
     row = {
         "Run Time (s)": summary.get("run_time_s", "") if summary else "",
         "Total Ops": summary.get("total_ops", "") if summary else "",
         "TPS (ops/s)": summary.get("tps", "") if summary else "",
+        "Warmup (s)": summary.get("warmup_s", "") if summary else "",
+        "Steady TPS (ops/s)": summary.get("steady_tps", "") if summary else "",
+        "Steady TPS 95% CI": f"{ci95[0]} - {ci95[1]}" if ci95 else "",
         "Net Rate": summary.get("net_rate", "") if summary else "",
         "Threads": config.get("threads_count", "") if config else "",
         "Concurrency": config.get("concurrency", "") if config else "",
@@ -282,6 +588,77 @@ def write_stats_csv(results_dir, stats):
         log(f"Wrote CSV: {dst} ({len(rows)} rows)")
 
 
+def write_instances_csv(results_dir, instances):
+    """Write one row per memcached instance, with its results when there are any."""
+    if not instances or len(instances["per_instance"]) < 2:
+        return
+
+    dst = os.path.join(results_dir, "results_memcached_instances.csv")
+    fieldnames = ["Instance", "Port", "CPU Node", "Memory Node", "Memory (MB)", "Key Share",
+                  "Total Ops", "TPS (ops/s)", "Get Avg (us)", "Get P99 (us)", "Set Avg (us)", "Set P99 (us)",
+                  "Items", "Evictions"]
+
+    with open(dst, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, restval="")
+        writer.writeheader()
+        for instance in instances["per_instance"]:
+            latency = instance.get("latency_us") or {}
+            server_stats = instance.get("server_stats") or {}
+            writer.writerow({
+                "Instance": instance.get("instance", ""),
+                "Port": instance.get("port", ""),
+                "CPU Node": instance.get("cpu_node") or "",
+                "Memory Node": instance.get("mem_node") or "",
+                "Memory (MB)": instance.get("memory_mb") or "",
+                "Key Share": instance.get("key_share", ""),
+                "Total Ops": instance.get("total_ops", ""),
+                "TPS (ops/s)": instance.get("tps", ""),
+                "Get Avg (us)": (latency.get("get") or {}).get("avg", ""),
+                "Get P99 (us)": (latency.get("get") or {}).get("p99", ""),
+                "Set Avg (us)": (latency.get("set") or {}).get("avg", ""),
+                "Set P99 (us)": (latency.get("set") or {}).get("p99", ""),
+                "Items": server_stats.get("curr_items", ""),
+                "Evictions": server_stats.get("evictions", ""),
+            })
+    log(f"Wrote CSV: {dst}")
+
+
+# =============================================================================
+# Complete a memcached_loadgen.py run
+# =============================================================================
+
+def complete_loadgen_results(results_dir, json_path):
+    """
+    memcached_loadgen.py writes results_memcached.json as the measured client,
+    before run_memcached.sh records the test note and elapsed time in
+    results.csv and stops the vmstat sampler. Add both to its JSON and
+    summary CSV afterwards.
+    """
+    with open(json_path) as f:
+        json_output = json.load(f)
+
+    metadata = parse_run_metadata(results_dir)
+    json_output["run_metadata"] = metadata
+    json_output["kernel_tiering"] = load_vmstat_delta(results_dir)
+
+    with open(json_path, "w") as f:
+        json.dump(json_output, f, indent=2)
+    log(f"Updated JSON: {json_path}")
+
+    write_summary_csv(results_dir, json_output.get("summary"), json_output.get("configuration"), metadata)
+
+
+def loadgen_results(results_dir):
+    """The results_memcached.json of a memcached_loadgen.py run, None for anything else."""
+    json_path = os.path.join(results_dir, "results_memcached.json")
+    try:
+        with open(json_path) as f:
+            configuration = json.load(f).get("configuration") or {}
+    except (OSError, ValueError):
+        return None
+    return json_path if configuration.get("load_generator") == "memcached_loadgen" else None
+
+
 # =============================================================================
 # Main
 # =============================================================================
@@ -296,33 +673,39 @@ def main():
 
     errors = []
 
-    # Find raw_results.txt
+    # Find raw_results.txt and parse it line by line, however long the run
     raw_file = os.path.join(results_dir, "raw_results.txt")
+    if not os.path.isfile(raw_file) and (json_path := loadgen_results(results_dir)):
+        log("Run by memcached_loadgen.py, adding the run metadata and kernel tiering counters")
+        complete_loadgen_results(results_dir, json_path)
+        return
     if not os.path.isfile(raw_file):
         log("WARNING: raw_results.txt not found")
         errors.append({"error": "raw_results.txt not found"})
-        raw_content = ""
+        config, stats, summary = None, None, None
     else:
-        with open(raw_file) as f:
-            raw_content = f.read()
-
-    # Parse each section
-    config = parse_config(raw_content) if raw_content else None
-    stats, stat_errors = parse_statistics(raw_content) if raw_content else (None, [])
-    errors.extend(stat_errors)
-    summary = parse_summary(raw_content) if raw_content else None
+        with open(raw_file, errors="replace") as f:
+            config, stats, summary, parse_errors = parse_raw_results(f)
+        errors.extend(parse_errors)
+
+    analysis = analyze_statistics(stats)
+    promote_analysis(summary, analysis)
     metadata = parse_run_metadata(results_dir)
+    instances = memaslap_instances(parse_instances(results_dir), summary, stats)
 
     # ----- Write JSON (primary output) -----
     json_output = {
         "benchmark": "memcached",
-        "parser_version": "1.0.0",
+        "parser_version": PARSER_VERSION,
         "timestamp_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
         "source_dir": os.path.basename(results_dir),
         "configuration": config,
         "summary": summary,
         "periodic_stats": stats,
+        "analysis": analysis,
+        "instances": instances,
         "run_metadata": metadata,
+        "kernel_tiering": load_vmstat_delta(results_dir),
         "errors": errors if errors else None,
     }
 
@@ -335,6 +718,7 @@ def main():
     if summary or config or metadata:
         write_summary_csv(results_dir, summary, config, metadata)
     write_stats_csv(results_dir, stats)
+    write_instances_csv(results_dir, instances)
 
     # Summary
     jsons = sorted(glob.glob(os.path.join(results_dir, "results_*.json")))
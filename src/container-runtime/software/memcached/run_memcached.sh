@@ -6,8 +6,8 @@
 # This script runs inside the container. It:
 #   1. Sources the CMS common library for logging, topology, etc.
 #   2. Collects comprehensive system hardware and software BOM
-#   3. Starts a memcached server with NUMA bindings from environment variables
-#   4. Runs memaslap load generator against the local memcached instance
+#   3. Starts a memcached server, or one per NUMA node, with NUMA bindings from environment variables
+#   4. Runs memaslap, or the asyncio memcached_loadgen.py, against the local memcached instance
 #   5. Collects and formats results
 #   6. Generates an HTML report and results tarball
 #################################################################################################
@@ -33,15 +33,39 @@ _NUMA_POLICY="${NUMA_POLICY:-}"
 _MEMCACHED_MEMORY_MB="${MEMCACHED_MEMORY_MB:-262144}"
 _MEMCACHED_THREADS="${MEMCACHED_THREADS:-}"
 _MEMCACHED_EXTRA_ARGS="${MEMCACHED_EXTRA_ARGS:-}"
+_MEMCACHED_INSTANCES="${MEMCACHED_INSTANCES:-}"
+_MEMCACHED_BASE_PORT="${MEMCACHED_BASE_PORT:-11211}"
 _MEMASLAP_THREADS="${MEMASLAP_THREADS:-16}"
 _MEMASLAP_CONCURRENCY="${MEMASLAP_CONCURRENCY:-256}"
 _MEMASLAP_DURATION="${MEMASLAP_DURATION:-180s}"
 _MEMASLAP_WINDOW_SIZE="${MEMASLAP_WINDOW_SIZE:-131072}"
+_MEMASLAP_STAT_FREQ="${MEMASLAP_STAT_FREQ:-5s}"
 _MEMASLAP_EXTRA_ARGS="${MEMASLAP_EXTRA_ARGS:-}"
+# Several instances default to memcached_loadgen.py, the only one that places the keys on a
+# consistent hash ring and reports every instance
+if [ -n "$_MEMCACHED_INSTANCES" ]; then
+    _LOAD_GENERATOR="${LOAD_GENERATOR:-loadgen}"
+else
+    _LOAD_GENERATOR="${LOAD_GENERATOR:-memaslap}"
+fi
+# memcached_loadgen.py settings, the thread, connection and duration ones default to memaslap's
+_LOADGEN_WORKERS="${LOADGEN_WORKERS:-${_MEMASLAP_THREADS}}"
+_LOADGEN_CONNECTIONS="${LOADGEN_CONNECTIONS:-${_MEMASLAP_CONCURRENCY}}"
+_LOADGEN_DURATION="${LOADGEN_DURATION:-${_MEMASLAP_DURATION}}"
+_LOADGEN_RATE="${LOADGEN_RATE:-}"
+_LOADGEN_PROTOCOL="${LOADGEN_PROTOCOL:-text}"
+_LOADGEN_KEYS="${LOADGEN_KEYS:-1000000}"
+_LOADGEN_KEY_DISTRIBUTION="${LOADGEN_KEY_DISTRIBUTION:-uniform}"
+_LOADGEN_VALUE_SIZE="${LOADGEN_VALUE_SIZE:-1024}"
+_LOADGEN_SET_RATIO="${LOADGEN_SET_RATIO:-0.1}"
+_LOADGEN_EXTRA_ARGS="${LOADGEN_EXTRA_ARGS:-}"
 _TEST_NOTE="${TEST_NOTE:-Default Settings}"
 
 RESULTS_FILE="results.csv"
 RAW_RESULTS="raw_results.txt"
+# memcached_loadgen.py writes the results_memcached.* files itself, its output
+# must not be named raw_results.txt or entrypoint.sh parses it over them
+LOADGEN_RESULTS="loadgen_results.txt"
 
 #################################################################################################
 # Start
@@ -56,10 +80,24 @@ cms_log_info "  Memory NUMA Nodes:  ${_MEM_NUMA_NODES}"
 cms_log_info "  NUMA Policy:        ${_NUMA_POLICY:-<none>}"
 cms_log_info "  Memcached Memory:   ${_MEMCACHED_MEMORY_MB} MB"
 cms_log_info "  Memcached Threads:  ${_MEMCACHED_THREADS:-<auto>}"
-cms_log_info "  Memaslap Threads:   ${_MEMASLAP_THREADS}"
-cms_log_info "  Memaslap Conns:     ${_MEMASLAP_CONCURRENCY}"
-cms_log_info "  Memaslap Duration:  ${_MEMASLAP_DURATION}"
-cms_log_info "  Memaslap Window:    ${_MEMASLAP_WINDOW_SIZE}"
+cms_log_info "  Memcached Instances: ${_MEMCACHED_INSTANCES:-<single>}"
+cms_log_info "  Load Generator:     ${_LOAD_GENERATOR}"
+if [ "$_LOAD_GENERATOR" = "loadgen" ]; then
+    cms_log_info "  Loadgen Workers:    ${_LOADGEN_WORKERS}"
+    cms_log_info "  Loadgen Conns:      ${_LOADGEN_CONNECTIONS}"
+    cms_log_info "  Loadgen Duration:   ${_LOADGEN_DURATION}"
+    cms_log_info "  Loadgen Rate:       ${_LOADGEN_RATE:-<closed loop>}"
+    cms_log_info "  Loadgen Protocol:   ${_LOADGEN_PROTOCOL}"
+    cms_log_info "  Loadgen Keys:       ${_LOADGEN_KEYS} (${_LOADGEN_KEY_DISTRIBUTION})"
+    cms_log_info "  Loadgen Value Size: ${_LOADGEN_VALUE_SIZE}"
+    cms_log_info "  Loadgen Set Ratio:  ${_LOADGEN_SET_RATIO}"
+else
+    cms_log_info "  Memaslap Threads:   ${_MEMASLAP_THREADS}"
+    cms_log_info "  Memaslap Conns:     ${_MEMASLAP_CONCURRENCY}"
+    cms_log_info "  Memaslap Duration:  ${_MEMASLAP_DURATION}"
+    cms_log_info "  Memaslap Window:    ${_MEMASLAP_WINDOW_SIZE}"
+    cms_log_info "  Memaslap Stat Freq: ${_MEMASLAP_STAT_FREQ}"
+fi
 
 #################################################################################################
 # 1. Verify required tools
@@ -67,10 +105,21 @@ cms_log_info "  Memaslap Window:    ${_MEMASLAP_WINDOW_SIZE}"
 
 cms_verify_cmds numactl memcached bc
 
-if ! command -v memaslap &>/dev/null; then
-    cms_log_error "memaslap not found. The libmemcached build may have failed."
-    exit 1
-fi
+case "$_LOAD_GENERATOR" in
+    memaslap)
+        if ! command -v memaslap &>/dev/null; then
+            cms_log_error "memaslap not found. The libmemcached build may have failed."
+            exit 1
+        fi
+        ;;
+    loadgen)
+        cms_verify_cmds python3
+        ;;
+    *)
+        cms_log_error "Unknown LOAD_GENERATOR '${_LOAD_GENERATOR}', use memaslap or loadgen"
+        exit 1
+        ;;
+esac
 
 #################################################################################################
 # 2. Collect system BOM
@@ -85,58 +134,128 @@ cms_collect_sysinfo ./sysinfo
 cms_query_topology
 
 #################################################################################################
-# 4. Start memcached server
+# 4. Start memcached servers
 #################################################################################################
 
-# Build numactl arguments for the memcached server using arrays.
+# Either one memcached per entry of MEMCACHED_INSTANCES, "<cpu node>:<mem node>[:<memory MB>]"
+# space separated, each bound to its own nodes (CXL memory nodes included) and listening on
+# its own port from MEMCACHED_BASE_PORT, or a single one bound by CPU_NUMA_NODE, MEM_NUMA_NODES
+# and NUMA_POLICY.
+INSTANCE_CPU_NODES=()
+INSTANCE_MEM_NODES=()
+INSTANCE_MEMORY_MB=()
+if [ -n "$_MEMCACHED_INSTANCES" ]; then
+    read -ra _instance_specs <<< "$_MEMCACHED_INSTANCES"
+    for _spec in "${_instance_specs[@]}"; do
+        IFS=: read -r _cpu_node _mem_node _memory_mb _rest <<< "$_spec"
+        _memory_mb="${_memory_mb:-${_MEMCACHED_MEMORY_MB}}"
+        if ! [[ "$_cpu_node" =~ ^[0-9]+$ && "$_mem_node" =~ ^[0-9]+$ && "$_memory_mb" =~ ^[0-9]+$ ]] || [ -n "$_rest" ]; then
+            cms_log_error "Invalid MEMCACHED_INSTANCES entry '${_spec}', expected <cpu node>:<mem node>[:<memory MB>]"
+            exit 1
+        fi
+        INSTANCE_CPU_NODES+=("$_cpu_node")
+        INSTANCE_MEM_NODES+=("$_mem_node")
+        INSTANCE_MEMORY_MB+=("$_memory_mb")
+    done
+    if [ -n "$_NUMA_POLICY" ]; then
+        cms_log_info "NUMA_POLICY is ignored, every instance is bound to its own memory node"
+    fi
+    if [ "$_LOAD_GENERATOR" = "memaslap" ]; then
+        cms_log_warn "memaslap spreads the keys over the instances with libmemcached's default distribution and only reports them together, use LOAD_GENERATOR=loadgen for consistent hashing and per-instance results"
+    fi
+else
+    INSTANCE_CPU_NODES+=("$_CPU_NUMA_NODE")
+    INSTANCE_MEM_NODES+=("$_MEM_NUMA_NODES")
+    INSTANCE_MEMORY_MB+=("$_MEMCACHED_MEMORY_MB")
+fi
+
+# Build numactl arguments for one memcached server using arrays.
 # Arrays preserve argument boundaries so spaces in user-provided values
 # (e.g. NUMA_POLICY="--interleave 0,2") don't cause word-splitting problems.
-NUMACTL_SERVER_ARGS=()
-if [ -n "$_CPU_NUMA_NODE" ]; then
-    NUMACTL_SERVER_ARGS+=("--cpunodebind=${_CPU_NUMA_NODE}")
-fi
-if [ -n "$_MEM_NUMA_NODES" ]; then
-    if [ -z "$_NUMA_POLICY" ]; then
-        NUMACTL_SERVER_ARGS+=("--membind=${_MEM_NUMA_NODES}")
+# args: instance index
+# return: NUMACTL_SERVER_ARGS
+server_numactl_args() {
+    local k=$1
+    NUMACTL_SERVER_ARGS=()
+
+    if [ -n "$_MEMCACHED_INSTANCES" ]; then
+        NUMACTL_SERVER_ARGS+=("--cpunodebind=${INSTANCE_CPU_NODES[$k]}" "--membind=${INSTANCE_MEM_NODES[$k]}")
+        return
     fi
-fi
-if [ -n "$_NUMA_POLICY" ]; then
-    read -ra _policy_parts <<< "$_NUMA_POLICY"
-    NUMACTL_SERVER_ARGS+=("${_policy_parts[@]}")
-fi
 
-# Build memcached server arguments
-MEMCACHED_ARGS=(-m "${_MEMCACHED_MEMORY_MB}" -u root -l 127.0.0.1 -p 11211)
-if [ -n "$_MEMCACHED_THREADS" ]; then
-    MEMCACHED_ARGS+=(-t "${_MEMCACHED_THREADS}")
-fi
-if [ -n "$_MEMCACHED_EXTRA_ARGS" ]; then
-    read -ra _extra_parts <<< "$_MEMCACHED_EXTRA_ARGS"
-    MEMCACHED_ARGS+=("${_extra_parts[@]}")
-fi
+    if [ -n "$_CPU_NUMA_NODE" ]; then
+        NUMACTL_SERVER_ARGS+=("--cpunodebind=${_CPU_NUMA_NODE}")
+    fi
+    if [ -n "$_MEM_NUMA_NODES" ]; then
+        if [ -z "$_NUMA_POLICY" ]; then
+            NUMACTL_SERVER_ARGS+=("--membind=${_MEM_NUMA_NODES}")
+        fi
+    fi
+    if [ -n "$_NUMA_POLICY" ]; then
+        read -ra _policy_parts <<< "$_NUMA_POLICY"
+        NUMACTL_SERVER_ARGS+=("${_policy_parts[@]}")
+    fi
+}
+
+MEMCACHED_PIDS=()
+INSTANCE_PORTS=()
+# Servers for memaslap (host:port,...) and memcached_loadgen.py, weighted by memory size
+MEMASLAP_SERVERS=""
+LOADGEN_SERVERS=""
+echo "instance,port,cpu_node,mem_node,memory_mb" > instances.csv
+
+for k in "${!INSTANCE_CPU_NODES[@]}"; do
+    port=$((_MEMCACHED_BASE_PORT + k))
+    server_numactl_args "$k"
+
+    # Build memcached server arguments
+    MEMCACHED_ARGS=(-m "${INSTANCE_MEMORY_MB[$k]}" -u root -l 127.0.0.1 -p "${port}")
+    if [ -n "$_MEMCACHED_THREADS" ]; then
+        MEMCACHED_ARGS+=(-t "${_MEMCACHED_THREADS}")
+    fi
+    if [ -n "$_MEMCACHED_EXTRA_ARGS" ]; then
+        read -ra _extra_parts <<< "$_MEMCACHED_EXTRA_ARGS"
+        MEMCACHED_ARGS+=("${_extra_parts[@]}")
+    fi
 
-cms_log_info "Starting memcached server..."
-cms_log_info "  numactl ${NUMACTL_SERVER_ARGS[*]} memcached ${MEMCACHED_ARGS[*]}"
-numactl "${NUMACTL_SERVER_ARGS[@]}" memcached "${MEMCACHED_ARGS[@]}" &
-MEMCACHED_PID=$!
+    cms_log_info "Starting memcached server ${k}..."
+    cms_log_info "  numactl ${NUMACTL_SERVER_ARGS[*]} memcached ${MEMCACHED_ARGS[*]}"
+    numactl "${NUMACTL_SERVER_ARGS[@]}" memcached "${MEMCACHED_ARGS[@]}" &
+    MEMCACHED_PIDS+=($!)
+    INSTANCE_PORTS+=("$port")
+
+    MEMASLAP_SERVERS+="${MEMASLAP_SERVERS:+,}127.0.0.1:${port}"
+    LOADGEN_SERVERS+="${LOADGEN_SERVERS:+,}127.0.0.1:${port}:${INSTANCE_MEMORY_MB[$k]}"
+    echo "${k},${port},${INSTANCE_CPU_NODES[$k]},\"${INSTANCE_MEM_NODES[$k]}\",${INSTANCE_MEMORY_MB[$k]}" >> instances.csv
+done
 
 sleep 2
 
-if ! kill -0 $MEMCACHED_PID 2>/dev/null; then
-    cms_log_error "Memcached failed to start. Exiting."
-    exit 1
-fi
-cms_log_info "Memcached running with PID ${MEMCACHED_PID}"
+for k in "${!MEMCACHED_PIDS[@]}"; do
+    if ! kill -0 "${MEMCACHED_PIDS[$k]}" 2>/dev/null; then
+        cms_log_error "Memcached ${k} on port ${INSTANCE_PORTS[$k]} failed to start. Exiting."
+        kill "${MEMCACHED_PIDS[@]}" 2>/dev/null
+        exit 1
+    fi
+    cms_log_info "Memcached ${k} running with PID ${MEMCACHED_PIDS[$k]} on port ${INSTANCE_PORTS[$k]}"
+done
 
 #################################################################################################
-# 5. Run memaslap benchmark
+# 5. Run the load generator
 #################################################################################################
 
-MEMASLAP_ARGS=(-s 127.0.0.1:11211)
+# With several instances memaslap spreads the keys over them itself and only reports
+# them together, memcached_loadgen.py places them on a consistent hash ring and
+# reports every instance
+MEMASLAP_ARGS=(-s "${MEMASLAP_SERVERS}")
 MEMASLAP_ARGS+=(-T "${_MEMASLAP_THREADS}")
 MEMASLAP_ARGS+=(-c "${_MEMASLAP_CONCURRENCY}")
 MEMASLAP_ARGS+=(-t "${_MEMASLAP_DURATION}")
 MEMASLAP_ARGS+=(-X "${_MEMASLAP_WINDOW_SIZE}")
+# Periodic Get/Set statistics, the input of the steady-state analysis
+if [ -n "$_MEMASLAP_STAT_FREQ" ]; then
+    MEMASLAP_ARGS+=(-S "${_MEMASLAP_STAT_FREQ}")
+fi
 if [ -n "$_MEMASLAP_EXTRA_ARGS" ]; then
     read -ra _extra_parts <<< "$_MEMASLAP_EXTRA_ARGS"
     MEMASLAP_ARGS+=("${_extra_parts[@]}")
@@ -148,17 +267,46 @@ if [ -n "$_CPU_NUMA_NODE" ]; then
     NUMACTL_CLIENT_ARGS+=("--cpunodebind=${_CPU_NUMA_NODE}")
 fi
 
-cms_log_info "Starting memaslap benchmark..."
-cms_log_info "  numactl ${NUMACTL_CLIENT_ARGS[*]} memaslap ${MEMASLAP_ARGS[*]}"
+LOADGEN_ARGS=(-s "${LOADGEN_SERVERS}")
+LOADGEN_ARGS+=(-T "${_LOADGEN_WORKERS}")
+LOADGEN_ARGS+=(-c "${_LOADGEN_CONNECTIONS}")
+LOADGEN_ARGS+=(-d "${_LOADGEN_DURATION}")
+LOADGEN_ARGS+=(-P "${_LOADGEN_PROTOCOL}")
+LOADGEN_ARGS+=(-k "${_LOADGEN_KEYS}")
+LOADGEN_ARGS+=(-K "${_LOADGEN_KEY_DISTRIBUTION}")
+LOADGEN_ARGS+=(-v "${_LOADGEN_VALUE_SIZE}")
+LOADGEN_ARGS+=(-g "${_LOADGEN_SET_RATIO}")
+if [ -n "$_LOADGEN_RATE" ]; then
+    LOADGEN_ARGS+=(-r "${_LOADGEN_RATE}")
+fi
+if [ -n "$_LOADGEN_EXTRA_ARGS" ]; then
+    read -ra _extra_parts <<< "$_LOADGEN_EXTRA_ARGS"
+    LOADGEN_ARGS+=("${_extra_parts[@]}")
+fi
+
+if [ "$_LOAD_GENERATOR" = "loadgen" ]; then
+    CLIENT_CMD=(python3 /opt/memcached-bench/memcached_loadgen.py "${LOADGEN_ARGS[@]}" -o .)
+    CLIENT_OUTPUT="${LOADGEN_RESULTS}"
+else
+    CLIENT_CMD=(memaslap "${MEMASLAP_ARGS[@]}")
+    CLIENT_OUTPUT="${RAW_RESULTS}"
+fi
+
+cms_log_info "Starting ${_LOAD_GENERATOR} benchmark..."
+cms_log_info "  numactl ${NUMACTL_CLIENT_ARGS[*]} ${CLIENT_CMD[*]}"
 
+cms_start_vmstat_sampler . "${VMSTAT_INTERVAL:-5}"
+cms_start_telemetry . "${TELEMETRY_INTERVAL:-0.5}"
 start_time=$(date +%s%N)
-numactl "${NUMACTL_CLIENT_ARGS[@]}" memaslap "${MEMASLAP_ARGS[@]}" > "${RAW_RESULTS}" 2>&1
-memaslap_exit=$?
+numactl "${NUMACTL_CLIENT_ARGS[@]}" "${CLIENT_CMD[@]}" > "${CLIENT_OUTPUT}" 2>&1
+client_exit=$?
 end_time=$(date +%s%N)
+cms_stop_telemetry
+cms_stop_vmstat_sampler
 time_taken=$(echo "scale=9; ($end_time - $start_time)/1000000000" | bc)
 
-if [ $memaslap_exit -ne 0 ]; then
-    cms_log_error "Memaslap exited with code ${memaslap_exit}. Check ${RAW_RESULTS} for details."
+if [ $client_exit -ne 0 ]; then
+    cms_log_error "${_LOAD_GENERATOR} exited with code ${client_exit}. Check ${CLIENT_OUTPUT} for details."
 fi
 
 #################################################################################################
@@ -166,8 +314,8 @@ fi
 #################################################################################################
 
 cms_log_info "Stopping memcached..."
-kill $MEMCACHED_PID 2>/dev/null
-wait $MEMCACHED_PID 2>/dev/null
+kill "${MEMCACHED_PIDS[@]}" 2>/dev/null
+wait "${MEMCACHED_PIDS[@]}" 2>/dev/null
 
 #################################################################################################
 # 7. Write results
@@ -181,8 +329,8 @@ fi
 
 echo "memcached,\"${_TEST_NOTE}\",${time_taken}" >> "${RESULTS_FILE}"
 
-if grep -q "Run time" "${RAW_RESULTS}" 2>/dev/null; then
-    grep "Run time" "${RAW_RESULTS}" >> "${RESULTS_FILE}"
+if grep -q "Run time" "${CLIENT_OUTPUT}" 2>/dev/null; then
+    grep "Run time" "${CLIENT_OUTPUT}" >> "${RESULTS_FILE}"
 fi
 
 #################################################################################################
@@ -199,10 +347,10 @@ cms_log_info "===== Benchmark Complete ====="
 cms_log_info "Test Note:    ${_TEST_NOTE}"
 cms_log_info "Elapsed Time: ${time_taken} seconds"
 cms_log_info "Results:      ${RESULTS_FILE}"
-cms_log_info "Raw output:   ${RAW_RESULTS}"
+cms_log_info "Raw output:   ${CLIENT_OUTPUT}"
 cms_log_info "System BOM:   sysinfo/"
 cms_log_info "HTML Report:  memcached_report.html"
 
-cat "${RAW_RESULTS}"
+cat "${CLIENT_OUTPUT}"
 
 cms_display_end_info
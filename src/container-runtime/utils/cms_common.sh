@@ -16,6 +16,7 @@
 #   - Start/end banners with elapsed time
 #   - System topology queries (sockets, cores, NUMA, CXL, hyperthreading)
 #   - System info collection (calls collect_sysinfo.sh)
+#   - Kernel memory-tiering counter recording (calls cms_vmstat.py)
 #   - Utility functions (convert units, verify commands, page cache, etc.)
 #################################################################################################
 
@@ -384,6 +385,88 @@ cms_generate_report() {
     fi
 }
 
+#################################################################################################
+# 7c. Kernel Memory-Tiering Counters
+#################################################################################################
+
+_CMS_VMSTAT_PID=""
+
+# Start recording the numa_*/pgpromote_*/pgdemote_*/pgmigrate_* counters of /proc/vmstat
+# and every node's vmstat in the background. The deltas end up in <results_dir>/vmstat_delta.json,
+# which the parsers add to their JSON.
+# Usage: cms_start_vmstat_sampler <results_dir> [interval_s]
+cms_start_vmstat_sampler() {
+    local results_dir="${1:-.}"
+    local interval="${2:-5}"
+    local script="/opt/cms-utils/cms_vmstat.py"
+
+    # Also look next to this library file
+    if [ ! -f "${script}" ]; then
+        local lib_dir
+        lib_dir="$(cd -- "$(dirname -- "${BASH_SOURCE[0]}")" &>/dev/null && pwd 2>/dev/null)"
+        script="${lib_dir}/cms_vmstat.py"
+    fi
+
+    if [ ! -f "${script}" ]; then
+        cms_log_warn "Tiering counter sampler not found at ${script}"
+        return 0
+    fi
+
+    python3 "${script}" record "${results_dir}" "${interval}" &
+    _CMS_VMSTAT_PID=$!
+    cms_log_info "Recording kernel tiering counters every ${interval}s (pid ${_CMS_VMSTAT_PID})"
+}
+
+# Stop the sampler started by cms_start_vmstat_sampler and wait for it to write its deltas
+cms_stop_vmstat_sampler() {
+    if [ -n "${_CMS_VMSTAT_PID}" ]; then
+        kill -TERM "${_CMS_VMSTAT_PID}" 2>/dev/null
+        wait "${_CMS_VMSTAT_PID}" 2>/dev/null
+        _CMS_VMSTAT_PID=""
+    fi
+}
+
+#################################################################################################
+# 7d. System Telemetry Timeline
+#################################################################################################
+
+_CMS_TELEMETRY_PID=""
+
+# Start sampling CPU utilisation, memory (system wide and per node), CPU frequency and
+# paging/migration rates in the background. Writes <results_dir>/telemetry.csv, which
+# generate_report.sh charts.
+# Usage: cms_start_telemetry <results_dir> [interval_s]
+cms_start_telemetry() {
+    local results_dir="${1:-.}"
+    local interval="${2:-0.5}"
+    local script="/opt/cms-utils/cms_telemetry.py"
+
+    # Also look next to this library file
+    if [ ! -f "${script}" ]; then
+        local lib_dir
+        lib_dir="$(cd -- "$(dirname -- "${BASH_SOURCE[0]}")" &>/dev/null && pwd 2>/dev/null)"
+        script="${lib_dir}/cms_telemetry.py"
+    fi
+
+    if [ ! -f "${script}" ]; then
+        cms_log_warn "Telemetry sampler not found at ${script}"
+        return 0
+    fi
+
+    python3 "${script}" record "${results_dir}" "${interval}" &
+    _CMS_TELEMETRY_PID=$!
+    cms_log_info "Sampling system telemetry every ${interval}s (pid ${_CMS_TELEMETRY_PID})"
+}
+
+# Stop the sampler started by cms_start_telemetry and wait for it to close its timeline
+cms_stop_telemetry() {
+    if [ -n "${_CMS_TELEMETRY_PID}" ]; then
+        kill -TERM "${_CMS_TELEMETRY_PID}" 2>/dev/null
+        wait "${_CMS_TELEMETRY_PID}" 2>/dev/null
+        _CMS_TELEMETRY_PID=""
+    fi
+}
+
 #################################################################################################
 # 8. CPU Frequency Governor
 #################################################################################################
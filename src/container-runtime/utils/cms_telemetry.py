@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+OCP SRV CMS - System Telemetry Timeline Sampler (cms_telemetry.py)
+
+Samples CPU utilisation, memory use (system wide and per NUMA node), CPU
+frequency and paging/migration rates at sub-second intervals while a benchmark
+runs, so throughput dips can be lined up with what the system was doing.
+
+Every source file is opened once and re-read with os.pread at each sample,
+no process is forked while recording:
+    /proc/stat                                        cpu_busy_pct, cpu_iowait_pct, ctxt_per_s
+    /proc/meminfo                                     mem_used_mb, anon_mb, anon_huge_mb, cached_mb
+    /sys/devices/system/node/node*/meminfo            node<N>_used_mb
+    /sys/devices/system/cpu/cpu*/cpufreq/scaling_cur_freq   cpu_mhz_avg/min/max
+    /proc/vmstat                                      pgfault, pgmajfault, numa_hint_faults,
+                                                      pgpromote_success, pgdemote, pgmigrate_success per s
+
+Usage:
+    python3 cms_telemetry.py record <results_dir> [interval_s]   # until SIGTERM/SIGINT
+    python3 cms_telemetry.py html <telemetry.csv>               # SVG charts for the HTML report
+
+Files written to <results_dir>:
+    telemetry.csv    one row per sample, one column per metric
+
+cms_common.sh wraps this as cms_start_telemetry / cms_stop_telemetry, and
+generate_report.sh charts every telemetry.csv it finds in the results.
+"""
+
+import csv
+import glob
+import html
+import os
+import re
+import signal
+import sys
+import threading
+import time
+
+TELEMETRY_FILE = "telemetry.csv"
+
+NODE_MEMINFO_GLOB = "/sys/devices/system/node/node*/meminfo"
+CPUFREQ_GLOB = "/sys/devices/system/cpu/cpu[0-9]*/cpufreq/scaling_cur_freq"
+
+# /proc/vmstat counters reported as a rate, pgdemote_* are summed up
+VMSTAT_RATES = {
+    "pgfault": "pgfault_per_s",
+    "pgmajfault": "pgmajfault_per_s",
+    "numa_hint_faults": "numa_hint_faults_per_s",
+    "pgpromote_success": "pgpromote_per_s",
+    "pgdemote_": "pgdemote_per_s",
+    "pgmigrate_success": "pgmigrate_per_s",
+}
+
+# Charts drawn by the report, a title and the column (prefixes) on it
+CHARTS = [
+    ("CPU utilisation (%)", ["cpu_busy_pct", "cpu_iowait_pct"]),
+    ("CPU frequency (MHz)", ["cpu_mhz_avg", "cpu_mhz_min", "cpu_mhz_max"]),
+    ("Memory (MB)", ["mem_used_mb", "anon_mb", "anon_huge_mb", "cached_mb"]),
+    ("Memory used per NUMA node (MB)", ["node"]),
+    ("Paging and migration (pages/s)", list(VMSTAT_RATES.values())),
+]
+
+COLORS = ["#8DC141", "#5F6062", "#2563EB", "#DC2626", "#D97706", "#7C3AED", "#0891B2", "#DB2777"]
+
+
+def log(msg):
+    print(f"[TELEMETRY] {msg}")
+
+
+# =============================================================================
+# Readers
+# =============================================================================
+
+class _OpenFile:
+    """A file kept open and re-read from the start with pread."""
+
+    def __init__(self, path):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY)
+        self.size = 16384
+
+    def read(self):
+        # /proc/stat grows with the CPU and interrupt count, read until it fits
+        while True:
+            data = os.pread(self.fd, self.size, 0)
+            if len(data) < self.size:
+                return data.decode("ascii", "replace")
+            self.size *= 2
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _open_all(paths):
+    files = []
+    for path in paths:
+        try:
+            files.append(_OpenFile(path))
+        except OSError:
+            pass
+    return files
+
+
+def _open_one(path):
+    files = _open_all([path])
+    return files[0] if files else None
+
+
+def _meminfo_mb(text, key):
+    match = re.search(rf"{key}:\s+(\d+) kB", text)
+    return int(match.group(1)) / 1024 if match else 0.0
+
+
+class Sampler:
+    """Reads every metric, rates and percentages are relative to the previous sample."""
+
+    def __init__(self):
+        self.stat = _open_one("/proc/stat")
+        self.meminfo = _open_one("/proc/meminfo")
+        self.vmstat = _open_one("/proc/vmstat")
+
+        self.nodes = {}
+        for f in _open_all(sorted(glob.glob(NODE_MEMINFO_GLOB))):
+            self.nodes[int(re.search(r"node(\d+)", f.path).group(1))] = f
+        self.nodes = dict(sorted(self.nodes.items()))
+
+        self.cpufreq = _open_all(glob.glob(CPUFREQ_GLOB))
+
+        self._last_time = None
+        self._last_cpu = None
+        self._last_ctxt = None
+        self._last_vmstat = None
+
+    def columns(self):
+        return [
+            "elapsed_s",
+            "cpu_busy_pct",
+            "cpu_iowait_pct",
+            "ctxt_per_s",
+            "mem_used_mb",
+            "anon_mb",
+            "anon_huge_mb",
+            "cached_mb",
+            *[f"node{n}_used_mb" for n in self.nodes],
+            "cpu_mhz_avg",
+            "cpu_mhz_min",
+            "cpu_mhz_max",
+            *VMSTAT_RATES.values(),
+        ]
+
+    def _stat(self, row, dt):
+        if self.stat is None:
+            return
+
+        text = self.stat.read()
+        # user nice system idle iowait irq softirq steal, guest time is already in user
+        cpu = [int(x) for x in text.split("\n", 1)[0].split()[1:9]]
+        ctxt = int(re.search(r"^ctxt (\d+)", text, re.M).group(1))
+
+        if self._last_cpu is not None:
+            delta = [a - b for a, b in zip(cpu, self._last_cpu)]
+            total = sum(delta) or 1
+            row["cpu_busy_pct"] = round(100 * (total - delta[3] - delta[4]) / total, 1)
+            row["cpu_iowait_pct"] = round(100 * delta[4] / total, 1)
+            row["ctxt_per_s"] = round((ctxt - self._last_ctxt) / dt)
+
+        self._last_cpu, self._last_ctxt = cpu, ctxt
+
+    def _memory(self, row):
+        if self.meminfo is not None:
+            text = self.meminfo.read()
+            row["mem_used_mb"] = round(
+                _meminfo_mb(text, "MemTotal") - _meminfo_mb(text, "MemAvailable"), 1
+            )
+            row["anon_mb"] = round(_meminfo_mb(text, "AnonPages"), 1)
+            row["anon_huge_mb"] = round(_meminfo_mb(text, "AnonHugePages"), 1)
+            row["cached_mb"] = round(_meminfo_mb(text, "Cached"), 1)
+
+        for node, f in self.nodes.items():
+            row[f"node{node}_used_mb"] = round(_meminfo_mb(f.read(), f"Node {node} MemUsed"), 1)
+
+    def _cpufreq(self, row):
+        mhz = []
+        for f in self.cpufreq:
+            try:
+                mhz.append(int(f.read()) / 1000)
+            except (OSError, ValueError):
+                pass
+
+        if mhz:
+            row["cpu_mhz_avg"] = round(sum(mhz) / len(mhz))
+            row["cpu_mhz_min"] = round(min(mhz))
+            row["cpu_mhz_max"] = round(max(mhz))
+
+    def _vmstat(self, row, dt):
+        if self.vmstat is None:
+            return
+
+        counters = dict.fromkeys(VMSTAT_RATES, 0)
+        for line in self.vmstat.read().splitlines():
+            name, _, value = line.partition(" ")
+            for key in VMSTAT_RATES:
+                if name == key or (key.endswith("_") and name.startswith(key)):
+                    counters[key] += int(value)
+
+        if self._last_vmstat is not None:
+            for key, column in VMSTAT_RATES.items():
+                row[column] = round((counters[key] - self._last_vmstat[key]) / dt)
+
+        self._last_vmstat = counters
+
+    def sample(self, elapsed):
+        now = time.monotonic()
+        dt = now - self._last_time if self._last_time is not None else 0.0
+        self._last_time = now
+
+        row = {"elapsed_s": round(elapsed, 2)}
+        self._stat(row, dt or 1.0)
+        self._memory(row)
+        self._cpufreq(row)
+        self._vmstat(row, dt or 1.0)
+
+        return row
+
+    def close(self):
+        for f in [self.stat, self.meminfo, self.vmstat, *self.nodes.values(), *self.cpufreq]:
+            if f is not None:
+                f.close()
+
+
+# =============================================================================
+# Recording
+# =============================================================================
+
+def record(results_dir, interval):
+    """Sample every interval until SIGTERM or SIGINT."""
+    os.makedirs(results_dir, exist_ok=True)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    sampler = Sampler()
+    path = os.path.join(results_dir, TELEMETRY_FILE)
+    log(f"Sampling system telemetry every {interval}s to {path}")
+
+    samples = 0
+    started = time.monotonic()
+
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=sampler.columns(), extrasaction="ignore")
+        writer.writeheader()
+
+        # The first sample only primes the rate counters
+        sampler.sample(0.0)
+        next_sample = started + interval
+
+        while not stop.wait(max(0.0, next_sample - time.monotonic())):
+            writer.writerow(sampler.sample(time.monotonic() - started))
+            samples += 1
+            next_sample += interval
+
+            # Flush about once a second, not on every sub-second sample
+            if samples % max(1, round(1 / interval)) == 0:
+                f.flush()
+
+    sampler.close()
+    log(f"Wrote {samples} samples to {path}")
+
+
+# =============================================================================
+# Report charts
+# =============================================================================
+
+def load_timeline(path):
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    columns = {}
+    for row in rows:
+        for key, value in row.items():
+            try:
+                columns.setdefault(key, []).append(float(value) if value != "" else None)
+            except ValueError:
+                pass
+    return columns
+
+
+def svg_chart(title, elapsed, series, width=860, height=220):
+    """One line chart as inline SVG, series maps a label to its values."""
+    left, right, top, bottom = 60, 170, 24, 28
+    plot_w, plot_h = width - left - right, height - top - bottom
+
+    values = [v for ys in series.values() for v in ys if v is not None]
+    if not values or len(elapsed) < 2:
+        return ""
+
+    y_max = max(values) or 1.0
+    x_max = elapsed[-1] or 1.0
+
+    def x(t):
+        return left + plot_w * t / x_max
+
+    def y(v):
+        return top + plot_h * (1 - v / y_max)
+
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'style="font-family:Inter,sans-serif;font-size:11px;background:#fff">',
+        f'<text x="{left}" y="15" font-weight="600">{html.escape(title)}</text>',
+        f'<rect x="{left}" y="{top}" width="{plot_w}" height="{plot_h}" fill="none" stroke="#E2E8F0"/>',
+        f'<text x="{left - 6}" y="{top + 4}" text-anchor="end">{y_max:,.0f}</text>',
+        f'<text x="{left - 6}" y="{top + plot_h}" text-anchor="end">0</text>',
+        f'<text x="{left + plot_w}" y="{height - 8}" text-anchor="end">{x_max:.0f} s</text>',
+    ]
+
+    for i, (label, ys) in enumerate(series.items()):
+        color = COLORS[i % len(COLORS)]
+        points = " ".join(
+            f"{x(t):.1f},{y(v):.1f}" for t, v in zip(elapsed, ys) if t is not None and v is not None
+        )
+        out.append(f'<polyline fill="none" stroke="{color}" stroke-width="1.5" points="{points}"/>')
+        out.append(
+            f'<text x="{left + plot_w + 10}" y="{top + 12 + 14 * i}" fill="{color}">'
+            f"{html.escape(label)}</text>"
+        )
+
+    out.append("</svg>")
+    return "".join(out)
+
+
+def render_html(path):
+    """The charts of a telemetry.csv as an HTML fragment, empty without samples."""
+    columns = load_timeline(path)
+    elapsed = columns.pop("elapsed_s", [])
+
+    charts = []
+    for title, prefixes in CHARTS:
+        series = {
+            name: ys for name, ys in columns.items()
+            if any(name == p or (p == "node" and re.fullmatch(r"node\d+_used_mb", name)) for p in prefixes)
+            and any(v is not None for v in ys)
+        }
+        if series:
+            charts.append(svg_chart(title, elapsed, series))
+
+    return "\n".join(c for c in charts if c)
+
+
+def main():
+    if len(sys.argv) >= 3 and sys.argv[1] == "record":
+        interval = float(sys.argv[3]) if len(sys.argv) > 3 else 0.5
+        record(sys.argv[2], interval)
+    elif len(sys.argv) == 3 and sys.argv[1] == "html":
+        print(render_html(sys.argv[2]))
+    else:
+        print(f"Usage: {sys.argv[0]} record <results_dir> [interval_s]")
+        print(f"       {sys.argv[0]} html <telemetry.csv>")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+OCP SRV CMS - Kernel Memory-Tiering Counter Sampler (cms_vmstat.py)
+
+Snapshots the NUMA balancing / tiering counters of /proc/vmstat and of every
+/sys/devices/system/node/node*/vmstat at the start and end of a benchmark run,
+plus at a fixed interval in between, so throughput can be linked to page
+promotion, demotion and migration traffic.
+
+Counters kept: numa_*, pgpromote_*, pgdemote_*, pgmigrate_*
+
+Usage:
+    python3 cms_vmstat.py record <results_dir> [interval_s]   # until SIGTERM/SIGINT
+
+Files written to <results_dir>:
+    vmstat_start.json    counters when recording started
+    vmstat_end.json      counters when recording stopped
+    vmstat_delta.json    end - start, read by every parse_results.py
+    vmstat_samples.csv   system wide counters at every interval, as deltas from the start
+
+Parsers add the deltas to their JSON with (/opt/cms-utils is on PYTHONPATH in
+ocp-cms-base):
+    from cms_vmstat import load_vmstat_delta
+    json_output["kernel_tiering"] = load_vmstat_delta(results_dir)
+
+cms_common.sh wraps this as cms_start_vmstat_sampler / cms_stop_vmstat_sampler.
+"""
+
+import csv
+import glob
+import json
+import os
+import re
+import signal
+import sys
+import threading
+from datetime import datetime, timezone
+
+VMSTAT_PATH = "/proc/vmstat"
+NODE_VMSTAT_GLOB = "/sys/devices/system/node/node*/vmstat"
+
+COUNTER_PREFIXES = ("numa_", "pgpromote_", "pgdemote_", "pgmigrate_")
+
+DELTA_FILE = "vmstat_delta.json"
+SAMPLES_FILE = "vmstat_samples.csv"
+
+
+def log(msg):
+    print(f"[VMSTAT] {msg}")
+
+
+# =============================================================================
+# Snapshots
+# =============================================================================
+
+def read_vmstat(path):
+    """Read the tiering counters of a vmstat file, empty if it doesn't exist."""
+    counters = {}
+
+    try:
+        with open(path) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2 and parts[0].startswith(COUNTER_PREFIXES):
+                    counters[parts[0]] = int(parts[1])
+    except (OSError, ValueError):
+        pass
+
+    return counters
+
+
+def snapshot():
+    """System wide and per node counters at this instant."""
+    nodes = {}
+    for path in sorted(glob.glob(NODE_VMSTAT_GLOB)):
+        node = re.search(r"node(\d+)", path).group(1)
+        nodes[f"node{node}"] = read_vmstat(path)
+
+    return {
+        "timestamp_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        "system": read_vmstat(VMSTAT_PATH),
+        "nodes": nodes,
+    }
+
+
+def _diff(start, end):
+    return {k: end[k] - start.get(k, 0) for k in end}
+
+
+def diff_snapshots(start, end):
+    """end - start for every counter, system wide and per node."""
+    return {
+        "start_utc": start["timestamp_utc"],
+        "end_utc": end["timestamp_utc"],
+        "system": _diff(start["system"], end["system"]),
+        "nodes": {
+            node: _diff(start["nodes"].get(node, {}), counters)
+            for node, counters in end["nodes"].items()
+        },
+    }
+
+
+def load_vmstat_delta(results_dir):
+    """The deltas of a recorded run, None if the sampler didn't run."""
+    path = os.path.join(results_dir, DELTA_FILE)
+    if not os.path.isfile(path):
+        return None
+
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+# =============================================================================
+# Recording
+# =============================================================================
+
+def _write_json(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def record(results_dir, interval):
+    """Sample until SIGTERM or SIGINT, then write the end snapshot and deltas."""
+    os.makedirs(results_dir, exist_ok=True)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    start = snapshot()
+    _write_json(os.path.join(results_dir, "vmstat_start.json"), start)
+    log(f"Recording tiering counters every {interval}s to {results_dir}")
+
+    fieldnames = ["elapsed_s", *sorted(start["system"])]
+    started = datetime.now(timezone.utc)
+
+    with open(os.path.join(results_dir, SAMPLES_FILE), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+
+        while not stop.wait(interval):
+            current = snapshot()
+            row = _diff(start["system"], current["system"])
+            row["elapsed_s"] = round((datetime.now(timezone.utc) - started).total_seconds(), 1)
+            writer.writerow(row)
+            f.flush()
+
+    end = snapshot()
+    _write_json(os.path.join(results_dir, "vmstat_end.json"), end)
+
+    delta = diff_snapshots(start, end)
+    _write_json(os.path.join(results_dir, DELTA_FILE), delta)
+
+    moved = {
+        k: v for k, v in delta["system"].items()
+        if v and k.startswith(("pgpromote_success", "pgdemote_", "pgmigrate_success"))
+    }
+    log(f"Wrote {DELTA_FILE}: {moved if moved else 'no pages promoted, demoted or migrated'}")
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] != "record":
+        print(f"Usage: {sys.argv[0]} record <results_dir> [interval_s]")
+        sys.exit(1)
+
+    interval = float(sys.argv[3]) if len(sys.argv) > 3 else 5.0
+    record(sys.argv[2], interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@
 # to produce the deliverables described in the container-runtime README:
 #   - CSV summary
 #   - HTML report (with ALL collected sysinfo data, organized by collapsible category)
+#   - Charts of the run's system telemetry timeline (telemetry.csv from cms_telemetry.py)
 #   - Tarball of all raw output
 #
 # Usage:
@@ -27,7 +28,7 @@
 #   6. Network                        12. Power / Thermal
 #################################################################################################
 
-REPORT_VERSION="0.4.0"
+REPORT_VERSION="0.5.0"
 
 #################################################################################################
 # Argument parsing
@@ -783,6 +784,29 @@ if [ ${#_DISCOVERED_CSVS[@]} -gt 0 ] && ! ${_has_any_results}; then
     done
 fi
 
+# ----- System Telemetry -----
+# Chart every timeline written by cms_telemetry.py (one per run)
+_TELEMETRY_SCRIPT="/opt/cms-utils/cms_telemetry.py"
+[ -f "${_TELEMETRY_SCRIPT}" ] || _TELEMETRY_SCRIPT="$(cd -- "$(dirname -- "$0")" &>/dev/null && pwd)/cms_telemetry.py"
+
+if ! ${DRY_RUN} && ${_HAS_PYTHON} && [ -f "${_TELEMETRY_SCRIPT}" ]; then
+    _telemetry_header=false
+    while IFS= read -r _tf; do
+        _charts=$(python3 "${_TELEMETRY_SCRIPT}" html "${_tf}" 2>/dev/null)
+        [ -z "${_charts}" ] && continue
+
+        if ! ${_telemetry_header}; then
+            echo "    <h2>System Telemetry</h2>" >> "${HTML_FILE}"
+            _telemetry_header=true
+        fi
+
+        _title=$(_html_escape "${_tf#${RESULTS_DIR_ABS}/}")
+        echo "    <details class=\"category\" open><summary>${_title}</summary><div class=\"category-content\">" >> "${HTML_FILE}"
+        echo "${_charts}" >> "${HTML_FILE}"
+        echo "    </div></details>" >> "${HTML_FILE}"
+    done < <(find "${RESULTS_DIR_ABS}" -maxdepth 3 -name "telemetry.csv" -type f 2>/dev/null | sort)
+fi
+
 # ----- System Information -----
 if [ -d "${SYSINFO_DIR}" ]; then
     cat >> "${HTML_FILE}" << 'EOF'